@@ -0,0 +1,116 @@
+"""
+Serviço de números aleatórios com fluxos nomeados e reprodutíveis.
+
+Uma FonteAleatoria parte de uma semente e entrega um gerador independente
+para cada uso: o embaralhamento do baralho, as escolhas da IA e os efeitos
+visuais. Cada fluxo é semeado por (semente, nome), então sortear mais ou
+menos partículas não altera o embaralhamento nem a IA.
+
+O Mersenne Twister do módulo random não tem salto (jump-ahead); para uso
+em paralelo, derivar() cria uma fonte filha com semente derivada de
+(semente, chave), o mesmo esquema dos blocos da simulação de Monte Carlo.
+Os geradores NumPy usam SeedSequence com spawn_key, o equivalente do NumPy.
+"""
+
+import random
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # NumPy não instalado: só fluxos do módulo random
+    np = None
+
+# Fluxos usados pelo jogo
+EMBARALHAR = "embaralhar"
+IA = "ia"
+EFEITOS = "efeitos"
+PARTIDAS = "partidas"  # Sementes das partidas de uma sessão
+
+
+def derivar_semente(semente, chave):
+    """Semente derivada de (semente, chave); a mesma para os mesmos argumentos"""
+    return random.Random(f"{semente}:{chave}").getrandbits(63)
+
+
+def nova_semente():
+    """Semente aleatória do sistema (para sessões não reprodutíveis)"""
+    return random.SystemRandom().getrandbits(63)
+
+
+def obter_fluxo(rng, nome):
+    """
+    Gerador a usar para o fluxo `nome`
+
+    Args:
+        rng: FonteAleatoria, um gerador (random.Random, módulo random) ou None
+
+    Returns:
+        O fluxo `nome` se `rng` for uma FonteAleatoria; senão o próprio `rng`
+    """
+    if isinstance(rng, FonteAleatoria):
+        return rng.fluxo(nome)
+    return rng
+
+
+class FonteAleatoria:
+    """Fluxos aleatórios nomeados e independentes derivados de uma semente"""
+
+    def __init__(self, semente=None):
+        """
+        Args:
+            semente: Semente inteira (padrão: aleatória, ver nova_semente)
+        """
+        self.semente = semente if semente is not None else nova_semente()
+        self._fluxos = {}
+        self._fluxos_numpy = {}
+
+    def fluxo(self, nome):
+        """random.Random do fluxo `nome` (criado no primeiro uso)"""
+        gerador = self._fluxos.get(nome)
+        if gerador is None:
+            gerador = random.Random(f"{self.semente}:{nome}")
+            self._fluxos[nome] = gerador
+        return gerador
+
+    def fluxo_numpy(self, nome):
+        """
+        np.random.Generator do fluxo `nome`, ou o random.Random do fluxo sem NumPy
+
+        Independente de fluxo(nome): os dois podem ser usados juntos.
+        """
+        if np is None:
+            return self.fluxo(nome)
+        gerador = self._fluxos_numpy.get(nome)
+        if gerador is None:
+            sequencia = np.random.SeedSequence(
+                self.semente, spawn_key=(zlib.crc32(nome.encode()),))
+            gerador = np.random.default_rng(sequencia)
+            self._fluxos_numpy[nome] = gerador
+        return gerador
+
+    @property
+    def embaralhar(self):
+        return self.fluxo(EMBARALHAR)
+
+    @property
+    def ia(self):
+        return self.fluxo(IA)
+
+    @property
+    def efeitos(self):
+        return self.fluxo(EFEITOS)
+
+    def derivar(self, chave):
+        """
+        Fonte filha independente (para uma partida, um bloco ou um processo)
+
+        A filha depende só de (semente, chave), não de quanto os fluxos
+        desta fonte já foram usados.
+        """
+        return FonteAleatoria(derivar_semente(self.semente, chave))
+
+    def __str__(self):
+        return f"FonteAleatoria(semente={self.semente}, fluxos={sorted(self._fluxos)})"
+
+    def __repr__(self):
+        return self.__str__()
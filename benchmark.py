@@ -0,0 +1,296 @@
+"""
+Benchmarks do baralho, da simulação e da renderização (sem janela).
+
+Roda com o driver de vídeo "dummy" do SDL, então funciona em servidores e
+CI. Cada medição é a mediana de várias repetições; os resultados são
+gravados em JSON e podem ser comparados com uma linha de base salva:
+
+    python benchmark.py --saida atual.json --base linha_base.json --limite 0.15
+
+O código de saída é 1 se alguma medição piorou mais que o limite.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Piora relativa tolerada antes de acusar regressão (15%)
+LIMITE_REGRESSAO = 0.15
+
+# Repetições de cada medição (o valor registrado é a mediana)
+REPETICOES = 5
+
+
+def cronometrar(funcao, repeticoes=REPETICOES):
+    """
+    Executa `funcao` várias vezes e retorna a mediana do tempo (segundos)
+
+    Args:
+        funcao: Função sem argumentos a medir
+        repeticoes: Quantidade de execuções
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def resultado(valor, unidade, maior_melhor):
+    """Monta o registro de uma medição"""
+    return {"valor": valor, "unidade": unidade, "maior_melhor": maior_melhor}
+
+
+def bench_baralho(compras):
+    """Compras por segundo (com reciclagem do descarte) e cálculo de frequência"""
+    from baralho import Deck
+
+    deck = Deck(rng=random.Random(42))
+    deck_cheio = Deck(rng=random.Random(42))
+
+    def comprar_e_descartar():
+        for _ in range(compras):
+            deck.adicionar_ao_descarte(deck.comprar_carta())
+
+    def embaralhar():
+        for _ in range(compras // 20):
+            deck_cheio.embaralhar()
+
+    def frequencia():
+        for _ in range(compras // 20):
+            deck.calcular_frequencia_empirica()
+
+    return {
+        "compras_por_segundo": resultado(
+            compras / cronometrar(comprar_e_descartar), "compras/s", True),
+        "embaralhamentos_por_segundo": resultado(
+            (compras // 20) / cronometrar(embaralhar), "embaralhamentos/s", True),
+        "frequencia_empirica_por_segundo": resultado(
+            (compras // 20) / cronometrar(frequencia), "chamadas/s", True),
+    }
+
+
+def bench_simulacao(simulacoes):
+    """Simulações de Monte Carlo por segundo, em cada motor disponível"""
+    import simulacao_monte_carlo
+
+    motores = [("python", False)]
+    if simulacao_monte_carlo.motor_monte_carlo is not None:
+        motores.append(("numpy", True))
+
+    resultados = {}
+    for nome, vetorizado in motores:
+        # O motor em Python é ordens de grandeza mais lento
+        n = simulacoes if vetorizado else max(1, simulacoes // 100)
+
+        def simular():
+            with contextlib.redirect_stdout(io.StringIO()):
+                simulacao_monte_carlo.run_simulation(n, vetorizado, 1, semente=42)
+
+        resultados[f"simulacoes_por_segundo_{nome}"] = resultado(
+            n / cronometrar(simular, 3), "simulações/s", True)
+    return resultados
+
+
+def preparar_jogo():
+    """Cria um JogoDuelo sem janela visível, com o log silenciado e os sprites prontos"""
+    import main
+
+    logging.getLogger().setLevel(logging.WARNING)
+    jogo = main.JogoDuelo(arquivo_replay=None, arquivo_historico=None)
+    jogo.carregador_sprites.aguardar()
+    jogo.verificar_sprites()
+    return jogo
+
+
+def assentar_cartas(jogo):
+    """Posiciona as cartas das mãos no destino (sem animação pendente)"""
+    jogo.renderizar()
+    for jogador in (jogo.ia, jogo.jogador):
+        for carta in jogador.mao:
+            visual = carta.visual
+            visual.x, visual.y = visual.target_x, visual.target_y
+            visual.rect.topleft = (int(visual.x), int(visual.y))
+
+
+def bench_renderizacao(quadros):
+    """Tempo de um quadro completo em estados fixos do jogo"""
+    jogo = preparar_jogo()
+
+    def estado_inicial():
+        pass
+
+    def maos_cheias():
+        for jogador in (jogo.ia, jogo.jogador):
+            while len(jogador.mao) < jogador.TAMANHO_MAO:
+                jogador.adicionar_carta(jogo.deck.comprar_carta())
+
+    def muitas_particulas():
+        maos_cheias()
+        for i in range(20):
+            jogo.particulas.emitir(100 + 30 * i, 300, (255, 50, 50), 50)
+
+    def game_over():
+        maos_cheias()
+        jogo.jogador.hp = 0
+        jogo.atualizar()
+
+    estados = [("inicial", estado_inicial), ("maos_cheias", maos_cheias),
+               ("particulas", muitas_particulas), ("game_over", game_over)]
+
+    resultados = {}
+    for nome, preparar in estados:
+        jogo.reiniciar_jogo()
+        jogo.particulas.limpar()
+        preparar()
+        assentar_cartas(jogo)
+
+        def renderizar():
+            for _ in range(quadros):
+                jogo.forcar_quadro_completo = True  # Sempre o caminho completo
+                jogo.renderizar()
+
+        resultados[f"quadro_{nome}_ms"] = resultado(
+            cronometrar(renderizar) / quadros * 1000, "ms", False)
+    return resultados
+
+
+def bench_inicializacao():
+    """Tempo até o primeiro quadro do jogo (novo processo)"""
+    codigo = ("import logging, main; "
+              "logging.getLogger().setLevel(logging.WARNING); "
+              "main.JogoDuelo(arquivo_replay=None, arquivo_historico=None).renderizar()")
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+
+    def iniciar():
+        subprocess.run([sys.executable, "-c", codigo], cwd=diretorio, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    return {"inicializacao_ms": resultado(cronometrar(iniciar, 3) * 1000, "ms", False)}
+
+
+def executar_benchmarks(rapido=False):
+    """
+    Roda todos os benchmarks
+
+    Args:
+        rapido: Usa cargas menores (para checagens rápidas)
+
+    Returns:
+        dict: {nome: {"valor", "unidade", "maior_melhor"}}
+    """
+    escala = 10 if rapido else 1
+    resultados = {}
+    resultados.update(bench_baralho(200_000 // escala))
+    resultados.update(bench_simulacao(1_000_000 // escala))
+    resultados.update(bench_renderizacao(60 // escala))
+    resultados.update(bench_inicializacao())
+    return resultados
+
+
+def comparar(resultados, base, limite=LIMITE_REGRESSAO):
+    """
+    Compara os resultados com a linha de base
+
+    Args:
+        resultados: Medições atuais
+        base: Medições da linha de base (mesmo formato)
+        limite: Piora relativa tolerada (0.15 = 15%)
+
+    Returns:
+        list: Tuplas (nome, base, atual, variação relativa, regrediu);
+              a variação é positiva quando a medição melhorou
+    """
+    comparacoes = []
+    for nome, atual in resultados.items():
+        anterior = base.get(nome)
+        if anterior is None or not anterior["valor"]:
+            continue
+        variacao = atual["valor"] / anterior["valor"] - 1
+        if not atual["maior_melhor"]:
+            variacao = anterior["valor"] / atual["valor"] - 1 if atual["valor"] else 0.0
+        comparacoes.append((nome, anterior["valor"], atual["valor"], variacao,
+                            variacao < -limite))
+    return comparacoes
+
+
+def imprimir_resultados(resultados, comparacoes=None):
+    """Imprime a tabela de resultados (e a comparação, se houver)"""
+    por_nome = {c[0]: c for c in comparacoes or []}
+    print("-" * 82)
+    print(f"{'BENCHMARK':<36} | {'VALOR':>14} | {'UNIDADE':<18} | {'VS. BASE':>8}")
+    print("-" * 82)
+    for nome, medida in resultados.items():
+        linha = f"{nome:<36} | {medida['valor']:>14.2f} | {medida['unidade']:<18} |"
+        comparacao = por_nome.get(nome)
+        if comparacao is not None:
+            linha += f" {comparacao[3] * 100:>+7.1f}%"
+            if comparacao[4]:
+                linha += "  <-- REGRESSÃO"
+        print(linha)
+    print("-" * 82)
+
+
+def main():
+    """Lê as opções de linha de comando, roda os benchmarks e compara com a base"""
+    parser = argparse.ArgumentParser(
+        description="Benchmarks do baralho, da simulação e da renderização.")
+    parser.add_argument("--saida", default="benchmark_resultados.json",
+                        help="arquivo JSON com os resultados (padrão: %(default)s)")
+    parser.add_argument("--base", default=None,
+                        help="JSON de uma execução anterior usado como linha de base")
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO,
+                        help="piora relativa tolerada (padrão: %(default)s)")
+    parser.add_argument("--rapido", action="store_true",
+                        help="cargas 10x menores, para uma checagem rápida")
+    args = parser.parse_args()
+    saida = os.path.abspath(args.saida)
+    caminho_base = os.path.abspath(args.base) if args.base else None
+
+    # O jogo carrega os assets relativos ao diretório do projeto
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    import pygame
+
+    resultados = executar_benchmarks(args.rapido)
+    dados = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "plataforma": platform.platform(),
+        "data": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "rapido": args.rapido,
+        "resultados": resultados,
+    }
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(dados, arquivo, indent=2, ensure_ascii=False)
+
+    comparacoes = None
+    if caminho_base:
+        with open(caminho_base, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        if base.get("rapido") != args.rapido:
+            print("[AVISO] A linha de base foi medida com outra carga (--rapido).")
+        comparacoes = comparar(resultados, base["resultados"], args.limite)
+
+    imprimir_resultados(resultados, comparacoes)
+    print(f"Resultados gravados em {saida}")
+
+    if comparacoes and any(c[4] for c in comparacoes):
+        print(f"\n[ALERTA] ⚠️  Regressão maior que {args.limite * 100:.0f}% detectada!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
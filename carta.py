@@ -1,13 +1,51 @@
+from collections import namedtuple
 import pygame
+import regras
+import textos
+
+# Dados imutáveis de um tipo de carta, compartilhados por todas as cartas do tipo
+DadosTipo = namedtuple("DadosTipo", ["nome", "codigo", "valor", "cor_fundo", "simbolo"])
+
+
+def _criar_dados_tipo(cores, simbolos):
+    """Monta a tupla de DadosTipo indexada pelo código de cada tipo"""
+    return tuple(
+        DadosTipo(tipo, regras.CODIGOS[tipo], regras.VALORES[tipo], cores[tipo], simbolos[tipo])
+        for tipo in regras.TIPOS)
+
+
+class EstadoVisual:
+    """Posição e animação de uma carta (só existe enquanto ela está na tela)"""
+
+    __slots__ = ("x", "y", "anterior_x", "anterior_y", "target_x", "target_y", "rect")
+
+    def __init__(self, x, y, largura, altura):
+        self.x = x
+        self.y = y
+        # Posição no passo de lógica anterior (para interpolar o desenho)
+        self.anterior_x = x
+        self.anterior_y = y
+        self.target_x = x
+        self.target_y = y
+        self.rect = pygame.Rect(x, y, largura, altura)
 
 
 class Card:
-    """Representa uma carta do jogo"""
+    """
+    Representa uma carta do jogo
+
+    A carta guarda apenas o código do tipo e o destaque; valor, cores e
+    rótulos vêm de DADOS_TIPO (compartilhados). O estado de posição e
+    animação (EstadoVisual) é criado na primeira vez que a carta é
+    posicionada ou desenhada e liberado quando ela vai para o descarte.
+    """
+
+    __slots__ = ("codigo", "destacada", "_visual")
 
     # Tipos de carta
-    ATAQUE = "Ataque"
-    DEFESA = "Defesa"
-    CURA = "Cura"
+    ATAQUE = regras.ATAQUE
+    DEFESA = regras.DEFESA
+    CURA = regras.CURA
 
     # Dimensões da carta
     LARGURA = 100
@@ -20,97 +58,208 @@ class Card:
         CURA: (50, 200, 80)      # Verde
     }
 
-    # Fontes (Carregadas sob demanda)
-    fonte_nome = None
-    fonte_valor = None
+    # Símbolo ASCII por tipo de carta
+    SIMBOLOS = {
+        ATAQUE: "ATK",
+        DEFESA: "DEF",
+        CURA: "HP+"
+    }
+
+    # Valores das cartas (compartilhados com o núcleo de regras)
+    valores = regras.VALORES
 
-    def __init__(self, tipo, x=0, y=0):
+    # Dados por código de tipo (regras.CODIGOS)
+    DADOS_TIPO = _criar_dados_tipo(CORES, SIMBOLOS)
+
+    cor_borda = (255, 255, 255)
+    cor_texto = (255, 255, 255)
+
+    # Faces pré-renderizadas: (codigo, destacada, id do sprite, largura, altura)
+    # -> (sprite, Surface). Ver Card.face
+    _faces = {}
+
+    def __init__(self, tipo, x=None, y=None):
         """
         Inicializa uma carta
 
         Args:
             tipo: Tipo da carta (ATAQUE, DEFESA ou CURA)
-            x: Posição X inicial
-            y: Posição Y inicial
+            x: Posição X inicial (opcional; cria o estado visual)
+            y: Posição Y inicial (opcional; cria o estado visual)
         """
-        self.tipo = tipo
-        self.x = x
-        self.y = y
-        self.target_x = x
-        self.target_y = y
-        self.rect = pygame.Rect(x, y, self.LARGURA, self.ALTURA)
-
-        # Inicializa fontes da classe se necessário
-        if Card.fonte_nome is None:
-            Card.fonte_nome = pygame.font.Font(None, 24)
-        if Card.fonte_valor is None:
-            Card.fonte_valor = pygame.font.Font(None, 48)
-
-        # Cores
-        self.cor_fundo = self.CORES.get(tipo, (100, 100, 100))
-        self.cor_borda = (255, 255, 255)
-        self.cor_texto = (255, 255, 255)
-
-        # Valores das cartas
-        self.valores = {
-            self.ATAQUE: 5,
-            self.DEFESA: 5,
-            self.CURA: 3
-        }
-
-        # Estado visual
+        self.codigo = regras.CODIGOS[tipo]
         self.destacada = False  # Para quando passar o mouse
+        self._visual = None
+        if x is not None or y is not None:
+            self._visual = EstadoVisual(x or 0, y or 0, self.LARGURA, self.ALTURA)
+
+    @property
+    def tipo(self):
+        return regras.TIPOS[self.codigo]
+
+    @property
+    def dados(self):
+        return self.DADOS_TIPO[self.codigo]
+
+    @property
+    def cor_fundo(self):
+        return self.DADOS_TIPO[self.codigo].cor_fundo
+
+    @property
+    def visual(self):
+        """Estado de posição/animação, criado na primeira vez que é usado"""
+        if self._visual is None:
+            self._visual = EstadoVisual(0, 0, self.LARGURA, self.ALTURA)
+        return self._visual
+
+    def liberar_visual(self):
+        """Descarta o estado de posição/animação (carta fora da tela)"""
+        self._visual = None
+        self.destacada = False
+
+    @property
+    def x(self):
+        return self.visual.x
+
+    @property
+    def y(self):
+        return self.visual.y
+
+    @property
+    def target_x(self):
+        return self.visual.target_x
+
+    @property
+    def target_y(self):
+        return self.visual.target_y
+
+    @property
+    def rect(self):
+        return self.visual.rect
 
     def definir_posicao(self, x, y):
         """Define a posição alvo da carta"""
-        self.target_x = x
-        self.target_y = y
+        visual = self.visual
+        visual.target_x = x
+        visual.target_y = y
+
+    def posicionar(self, x, y):
+        """Coloca a carta direto em (x, y), sem animação"""
+        visual = self.visual
+        visual.x = visual.anterior_x = visual.target_x = x
+        visual.y = visual.anterior_y = visual.target_y = y
+        visual.rect.topleft = (int(x), int(y))
 
     def contem_ponto(self, x, y):
         """Verifica se um ponto (x, y) está dentro da carta"""
         return self.rect.collidepoint(x, y)
 
-    def desenhar(self, tela, imagem_sprite=None):
-        """Desenha a carta na tela"""
+    @classmethod
+    def face(cls, codigo, destacada, imagem_sprite=None):
+        """
+        Retorna a face pré-renderizada (fundo, sprite ou texto, borda) de um tipo
+
+        As faces ficam em cache por (tipo, destaque, sprite, dimensões): há
+        apenas 3 tipos x 2 estados, então cada combinação é composta uma vez.
+        Trocar o sprite ou LARGURA/ALTURA gera uma nova face automaticamente.
+        """
+        chave = (codigo, destacada, id(imagem_sprite), cls.LARGURA, cls.ALTURA)
+        item = cls._faces.get(chave)
+        # Guarda o próprio sprite para não confundir com outro de mesmo id
+        if item is None or item[0] is not imagem_sprite:
+            item = (imagem_sprite, cls._compor_face(codigo, destacada, imagem_sprite))
+            cls._faces[chave] = item
+        return item[1]
+
+    @classmethod
+    def preparar_faces(cls, assets=None):
+        """
+        Compõe as faces de todos os tipos e estados (chamado ao carregar os assets)
+
+        Args:
+            assets: Dicionário {tipo: Surface ou None} com os sprites das cartas
+
+        Returns:
+            dict: {(codigo, destacada): Surface}, as chaves usadas por
+                  item_desenho para procurar a face em um atlas
+        """
+        cls._faces.clear()
+        faces = {}
+        for dados in cls.DADOS_TIPO:
+            sprite = assets.get(dados.nome) if assets else None
+            for destacada in (False, True):
+                faces[(dados.codigo, destacada)] = cls.face(dados.codigo, destacada, sprite)
+        return faces
+
+    @classmethod
+    def _compor_face(cls, codigo, destacada, imagem_sprite):
+        """Desenha uma face de carta em uma nova superfície transparente"""
+        dados = cls.DADOS_TIPO[codigo]
+        tela = pygame.Surface((cls.LARGURA, cls.ALTURA), pygame.SRCALPHA)
+        rect = tela.get_rect()
+
         # Fundo da carta
-        pygame.draw.rect(tela, self.cor_fundo, self.rect, border_radius=10)
+        pygame.draw.rect(tela, dados.cor_fundo, rect, border_radius=10)
 
         # Imagem (Sprite)
         if imagem_sprite:
-            tela.blit(imagem_sprite, (self.rect.x, self.rect.y))
+            tela.blit(imagem_sprite, (rect.x, rect.y))
         else:
             # Fallback: Desenha textos apenas se não houver imagem
             # Nome do tipo (topo)
-            texto_nome = Card.fonte_nome.render(
-                self.tipo, True, self.cor_texto)
+            texto_nome = textos.renderizar(
+                textos.fonte(24), dados.nome, cls.cor_texto)
             nome_rect = texto_nome.get_rect(
-                center=(self.rect.centerx, self.rect.y + 25))
+                center=(rect.centerx, rect.y + 25))
             tela.blit(texto_nome, nome_rect)
 
             # Valor (centro)
-            valor = self.valores.get(self.tipo, 0)
-            texto_valor = Card.fonte_valor.render(
-                str(valor), True, self.cor_texto)
-            valor_rect = texto_valor.get_rect(center=self.rect.center)
+            texto_valor = textos.renderizar(
+                textos.fonte(48), str(dados.valor), cls.cor_texto)
+            valor_rect = texto_valor.get_rect(center=rect.center)
             tela.blit(texto_valor, valor_rect)
 
             # Símbolo ASCII (abaixo do valor)
-            simbolos = {
-                self.ATAQUE: "ATK",
-                self.DEFESA: "DEF",
-                self.CURA: "HP+"
-            }
-            simbolo = simbolos.get(self.tipo, "?")
-            fonte_simbolo = pygame.font.Font(None, 28)
-            texto_simbolo = fonte_simbolo.render(simbolo, True, self.cor_texto)
+            texto_simbolo = textos.renderizar(
+                textos.fonte(28), dados.simbolo, cls.cor_texto)
             simbolo_rect = texto_simbolo.get_rect(
-                center=(self.rect.centerx, self.rect.bottom - 30))
+                center=(rect.centerx, rect.bottom - 30))
             tela.blit(texto_simbolo, simbolo_rect)
 
         # Borda (mais grossa se destacada)
-        espessura_borda = 4 if self.destacada else 2
-        pygame.draw.rect(tela, self.cor_borda, self.rect,
+        espessura_borda = 4 if destacada else 2
+        pygame.draw.rect(tela, cls.cor_borda, rect,
                          espessura_borda, border_radius=10)
+        return tela
+
+    def rect_interpolado(self, alfa=1.0):
+        """
+        Retângulo de desenho entre o passo de lógica anterior e o atual
+
+        Args:
+            alfa: Fração do passo de lógica já decorrida (0 a 1)
+        """
+        visual = self.visual
+        if alfa >= 1.0:
+            return visual.rect
+        x = visual.anterior_x + (visual.x - visual.anterior_x) * alfa
+        y = visual.anterior_y + (visual.y - visual.anterior_y) * alfa
+        return pygame.Rect(int(x), int(y), self.LARGURA, self.ALTURA)
+
+    def item_desenho(self, atlas=None, alfa=1.0):
+        """
+        Tupla (superfície, destino[, área]) da carta para Surface.blits
+
+        Args:
+            atlas: AtlasSprites com as faces de preparar_faces (None: face sem sprite)
+            alfa: Fração do passo de lógica decorrida (interpolação do movimento)
+        """
+        destino = self.rect_interpolado(alfa)
+        if atlas is not None:
+            area = atlas.areas.get((self.codigo, self.destacada))
+            if area is not None:
+                return atlas.superficie, destino, area
+        return self.face(self.codigo, self.destacada), destino
 
     def __str__(self):
         """Representação em string da carta"""
@@ -120,16 +269,20 @@ class Card:
         return self.__str__()
 
     def atualizar(self):
-        """Atualiza a posição da carta com animação suave (Lerp)"""
+        """Atualiza a posição da carta com animação suave (Lerp), um passo de lógica"""
+        visual = self.visual
+        visual.anterior_x = visual.x
+        visual.anterior_y = visual.y
+
         # Interpolação linear para X
-        self.x += (self.target_x - self.x) * 0.1
-        if abs(self.target_x - self.x) < 1:
-            self.x = self.target_x
+        visual.x += (visual.target_x - visual.x) * 0.1
+        if abs(visual.target_x - visual.x) < 1:
+            visual.x = visual.target_x
 
         # Interpolação linear para Y
-        self.y += (self.target_y - self.y) * 0.1
-        if abs(self.target_y - self.y) < 1:
-            self.y = self.target_y
+        visual.y += (visual.target_y - visual.y) * 0.1
+        if abs(visual.target_y - visual.y) < 1:
+            visual.y = visual.target_y
 
         # Atualiza o rect para colisão e desenho
-        self.rect.topleft = (int(self.x), int(self.y))
+        visual.rect.topleft = (int(visual.x), int(visual.y))
@@ -0,0 +1,209 @@
+"""
+Medição do tempo de cada fase do frame e captura de perfis (cProfile).
+
+O MedidorQuadros guarda, em buffers circulares de tamanho fixo, quanto
+tempo cada fase do loop (eventos, lógica, partes da renderização, espera
+do relógio) levou nos últimos quadros. Os tempos são exclusivos: uma fase
+aberta dentro de outra é descontada da fase de fora.
+
+O tempo bloqueado esperando eventos com o jogo parado (fase "ocioso") é
+guardado à parte: não entra no total do quadro nem nos percentis.
+"""
+
+import cProfile
+import csv
+import io
+import logging
+import pstats
+import time
+from array import array
+from contextlib import contextmanager
+
+# Quadros guardados por fase (10 segundos a 60 FPS)
+CAPACIDADE_PADRAO = 600
+
+# Fases medidas mas fora do tempo de quadro (podem durar segundos)
+FASES_FORA_DO_QUADRO = frozenset({"ocioso"})
+
+
+class BufferCircular:
+    """Últimos `capacidade` valores (float), sobrescrevendo os mais antigos"""
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO):
+        self.valores_brutos = array("d", bytes(8 * capacidade))
+        self.capacidade = capacidade
+        self.proximo = 0
+        self.total = 0  # Valores já adicionados (inclusive os sobrescritos)
+
+    def adicionar(self, valor):
+        self.valores_brutos[self.proximo] = valor
+        self.proximo = (self.proximo + 1) % self.capacidade
+        self.total += 1
+
+    def __len__(self):
+        return min(self.total, self.capacidade)
+
+    def valores(self):
+        """Valores guardados, do mais antigo para o mais recente"""
+        if self.total < self.capacidade:
+            return self.valores_brutos[:self.total].tolist()
+        return (self.valores_brutos[self.proximo:].tolist()
+                + self.valores_brutos[:self.proximo].tolist())
+
+
+def percentis(valores, qs=(0.5, 0.95, 0.99)):
+    """
+    Percentis pelo método do posto mais próximo
+
+    Returns:
+        tuple: Um valor por q (0.0 se não houver valores)
+    """
+    if not valores:
+        return tuple(0.0 for _ in qs)
+    ordenados = sorted(valores)
+    ultimo = len(ordenados) - 1
+    return tuple(ordenados[min(ultimo, int(q * len(ordenados)))] for q in qs)
+
+
+class MedidorQuadros:
+    """Tempo (ms) de cada fase nos últimos quadros"""
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO, fora_do_quadro=FASES_FORA_DO_QUADRO):
+        """
+        Args:
+            capacidade: Quantos quadros ficam guardados por fase
+            fora_do_quadro: Fases descontadas do total do quadro e fora de resumo()
+        """
+        self.capacidade = capacidade
+        self.fora_do_quadro = fora_do_quadro
+        self.fases = {}  # nome -> BufferCircular, na ordem da primeira medição
+        self.totais = BufferCircular(capacidade)
+        self.quadros = 0
+        self._atual = {}
+        self._pilha = []
+        self._inicio_quadro = None
+
+    def iniciar_quadro(self):
+        """Marca o início de um quadro"""
+        self._atual = {}
+        self._inicio_quadro = time.perf_counter()
+
+    @contextmanager
+    def fase(self, nome):
+        """Mede o bloco `with` como a fase `nome` do quadro atual"""
+        agora = time.perf_counter()
+        if self._pilha:
+            # Pausa a fase de fora (tempos exclusivos)
+            externa, inicio = self._pilha[-1]
+            self._atual[externa] = self._atual.get(externa, 0.0) + agora - inicio
+        self._pilha.append((nome, agora))
+        try:
+            yield
+        finally:
+            nome, inicio = self._pilha.pop()
+            agora = time.perf_counter()
+            self._atual[nome] = self._atual.get(nome, 0.0) + agora - inicio
+            if self._pilha:
+                externa, _ = self._pilha[-1]
+                self._pilha[-1] = (externa, agora)
+
+    def finalizar_quadro(self):
+        """Grava os tempos do quadro (fases que não rodaram contam 0 ms)"""
+        if self._inicio_quadro is None:
+            return
+        for nome in self._atual:
+            if nome not in self.fases:
+                buffer = BufferCircular(self.capacidade)
+                # Alinha com os quadros anteriores, em que a fase não existia
+                for _ in range(min(self.quadros, self.capacidade)):
+                    buffer.adicionar(0.0)
+                self.fases[nome] = buffer
+        for nome, buffer in self.fases.items():
+            buffer.adicionar(self._atual.get(nome, 0.0) * 1000)
+        fora = sum(self._atual.get(nome, 0.0) for nome in self.fora_do_quadro)
+        self.totais.adicionar((time.perf_counter() - self._inicio_quadro - fora) * 1000)
+        self.quadros += 1
+        self._inicio_quadro = None
+
+    def resumo(self):
+        """
+        Percentis de cada fase e do quadro inteiro
+
+        Returns:
+            dict: {nome: (p50, p95, p99)} em ms; a chave "quadro" é o total.
+                  As fases de fora_do_quadro não aparecem
+        """
+        resultado = {nome: percentis(buffer.valores())
+                     for nome, buffer in self.fases.items()
+                     if nome not in self.fora_do_quadro}
+        resultado["quadro"] = percentis(self.totais.valores())
+        return resultado
+
+    def exportar_csv(self, caminho):
+        """
+        Grava os quadros guardados em CSV (uma linha por quadro, tempos em ms)
+
+        Returns:
+            int: Quantidade de quadros exportados
+        """
+        nomes = list(self.fases)
+        colunas = [self.fases[nome].valores() for nome in nomes]
+        totais = self.totais.valores()
+        primeiro = self.quadros - len(totais)
+        with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(["quadro"] + nomes + ["total"])
+            for i, total in enumerate(totais):
+                escritor.writerow([primeiro + i]
+                                  + [f"{coluna[i]:.4f}" for coluna in colunas]
+                                  + [f"{total:.4f}"])
+        return len(totais)
+
+
+class CapturaPerfil:
+    """Liga e desliga o cProfile sob demanda e grava o resultado em .prof"""
+
+    def __init__(self, prefixo="perfil"):
+        """
+        Args:
+            prefixo: Início do nome dos arquivos .prof gravados
+        """
+        self.prefixo = prefixo
+        self.perfil = None
+
+    @property
+    def ativa(self):
+        return self.perfil is not None
+
+    def alternar(self):
+        """
+        Inicia a captura, ou encerra a captura em andamento e grava o arquivo
+
+        Returns:
+            str ou None: Caminho do arquivo gravado ao encerrar
+        """
+        if self.perfil is None:
+            perfil = cProfile.Profile()
+            try:
+                perfil.enable()
+            except ValueError as e:  # Outro profiler já está ativo
+                logging.warning(f"Não foi possível iniciar o cProfile: {e}")
+                return None
+            self.perfil = perfil
+            logging.info("Captura de perfil iniciada")
+            return None
+        return self.encerrar()
+
+    def encerrar(self, linhas=20):
+        """Encerra a captura (se houver), grava o .prof e registra as funções mais caras"""
+        if self.perfil is None:
+            return None
+        perfil, self.perfil = self.perfil, None
+        perfil.disable()
+        caminho = f"{self.prefixo}_{time.strftime('%Y%m%d_%H%M%S')}.prof"
+        perfil.dump_stats(caminho)
+
+        saida = io.StringIO()
+        pstats.Stats(perfil, stream=saida).sort_stats("cumulative").print_stats(linhas)
+        logging.info(f"Perfil gravado em {caminho}\n{saida.getvalue()}")
+        return caminho
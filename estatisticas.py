@@ -0,0 +1,300 @@
+"""
+Estimadores estatísticos online (memória constante) e combináveis.
+
+Usados pela simulação de Monte Carlo (um estimador por tipo de carta,
+combinando os resultados parciais de cada bloco/worker). Inclui também os
+testes qui-quadrado do detector de viés do embaralhamento (AnaliseVies).
+"""
+
+import math
+
+
+class EstatisticaOnline:
+    """
+    Acumula média, variância, mínimo, máximo e um histograma de faixas fixas.
+
+    A média e a variância usam o algoritmo de Welford (e a fórmula de Chan
+    para combinar dois estimadores). O histograma tem contagens inteiras,
+    então a combinação é exata e os quantis têm precisão de uma faixa.
+    """
+
+    def __init__(self, minimo=0.0, maximo=100.0, num_faixas=1000):
+        """
+        Args:
+            minimo: Limite inferior do histograma
+            maximo: Limite superior do histograma
+            num_faixas: Quantidade de faixas do histograma (esboço de quantis)
+        """
+        self.limite_inferior = minimo
+        self.limite_superior = maximo
+        self.largura_faixa = (maximo - minimo) / num_faixas
+        self.histograma = [0] * num_faixas
+
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0  # Soma dos quadrados dos desvios em relação à média
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def faixa(self, valor):
+        """Retorna o índice da faixa do histograma onde o valor cai"""
+        indice = int((valor - self.limite_inferior) / self.largura_faixa)
+        return min(max(indice, 0), len(self.histograma) - 1)
+
+    def adicionar(self, valor):
+        """Adiciona uma observação"""
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        self.histograma[self.faixa(valor)] += 1
+
+    def combinar(self, outra):
+        """
+        Incorpora as observações de outro estimador com os mesmos limites
+
+        Args:
+            outra: EstatisticaOnline com o mesmo histograma (limites e faixas)
+        """
+        if len(outra.histograma) != len(self.histograma) or \
+                outra.limite_inferior != self.limite_inferior or \
+                outra.limite_superior != self.limite_superior:
+            raise ValueError("Estimadores com histogramas incompatíveis")
+
+        if outra.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.media, self.m2 = outra.n, outra.media, outra.m2
+        else:
+            n = self.n + outra.n
+            delta = outra.media - self.media
+            self.media += delta * outra.n / n
+            self.m2 += outra.m2 + delta * delta * self.n * outra.n / n
+            self.n = n
+
+        self.minimo = min(self.minimo, outra.minimo)
+        self.maximo = max(self.maximo, outra.maximo)
+        for i, contagem in enumerate(outra.histograma):
+            self.histograma[i] += contagem
+
+    @property
+    def variancia(self):
+        """Variância amostral (n - 1)"""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def desvio(self):
+        """Desvio padrão amostral"""
+        return math.sqrt(self.variancia)
+
+    def quantil(self, q):
+        """
+        Estima o quantil q (0 a 1) interpolando dentro da faixa do histograma
+
+        Returns:
+            float: Valor estimado, limitado ao mínimo e máximo observados
+        """
+        if self.n == 0:
+            return 0.0
+        alvo = q * self.n
+        acumulado = 0
+        for i, contagem in enumerate(self.histograma):
+            if contagem and acumulado + contagem >= alvo:
+                fracao = (alvo - acumulado) / contagem
+                valor = self.limite_inferior + (i + fracao) * self.largura_faixa
+                return min(max(valor, self.minimo), self.maximo)
+            acumulado += contagem
+        return self.maximo
+
+    def __str__(self):
+        return f"EstatisticaOnline(n={self.n}, media={self.media:.4f}, desvio={self.desvio:.4f})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _gama_regularizada_superior(a, x):
+    """Q(a, x) = Γ(a, x) / Γ(a), por série (x < a + 1) ou fração contínua"""
+    if x <= 0:
+        return 1.0
+    log_prefixo = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        termo = soma = 1.0 / a
+        ap = a
+        for _ in range(1000):
+            ap += 1
+            termo *= x / ap
+            soma += termo
+            if abs(termo) < abs(soma) * 1e-15:
+                break
+        return max(0.0, 1.0 - soma * math.exp(log_prefixo))
+
+    # Fração contínua de Lentz
+    minusculo = 1e-300
+    b = x + 1 - a
+    c = 1 / minusculo
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = minusculo if abs(d) < minusculo else d
+        c = b + an / c
+        c = minusculo if abs(c) < minusculo else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefixo) * h
+
+
+def qui_quadrado(observado, esperado, minimo_esperado=5.0):
+    """
+    Teste de aderência qui-quadrado de Pearson
+
+    Células com frequência esperada menor que `minimo_esperado` são agrupadas
+    com as vizinhas antes do teste.
+
+    Args:
+        observado: Contagens observadas por célula
+        esperado: Contagens esperadas por célula (mesma soma que observado)
+
+    Returns:
+        tuple: (estatística, graus de liberdade, p-valor)
+    """
+    grupos = []
+    obs_grupo = esp_grupo = 0.0
+    for obs, esp in zip(observado, esperado):
+        obs_grupo += obs
+        esp_grupo += esp
+        if esp_grupo >= minimo_esperado:
+            grupos.append((obs_grupo, esp_grupo))
+            obs_grupo = esp_grupo = 0.0
+    if esp_grupo > 0 or obs_grupo > 0:
+        if grupos:
+            obs_ultimo, esp_ultimo = grupos.pop()
+            grupos.append((obs_ultimo + obs_grupo, esp_ultimo + esp_grupo))
+        else:
+            grupos.append((obs_grupo, esp_grupo))
+
+    graus = len(grupos) - 1
+    if graus < 1:
+        return 0.0, 0, 1.0
+    estatistica = sum((obs - esp) ** 2 / esp for obs, esp in grupos if esp > 0)
+    return estatistica, graus, _gama_regularizada_superior(graus / 2, estatistica / 2)
+
+
+class AnaliseVies:
+    """
+    Contagens para detectar viés na ordem de um embaralhamento.
+
+    Acumula, sobre muitos embaralhamentos de um baralho codificado
+    (0..tipos-1 por carta):
+      * posição x tipo: quantas vezes cada tipo saiu em cada posição;
+      * adjacência: pares (tipo na posição i, tipo na posição i+1);
+      * primeiras k: quantas cartas de cada tipo vieram nas k primeiras compras.
+
+    Todas as contagens são inteiras, então a combinação entre blocos é exata.
+    """
+
+    def __init__(self, quantidades, primeiras_k=(3, 6)):
+        """
+        Args:
+            quantidades: Número de cartas de cada tipo no baralho, por código
+            primeiras_k: Tamanhos de "mão" analisados nas primeiras compras
+        """
+        self.quantidades = list(quantidades)
+        self.num_tipos = len(self.quantidades)
+        self.num_cartas = sum(self.quantidades)
+        self.n = 0
+        self.posicao = [[0] * self.num_tipos for _ in range(self.num_cartas)]
+        self.adjacencia = [[0] * self.num_tipos for _ in range(self.num_tipos)]
+        self.primeiras = {
+            k: [[0] * (k + 1) for _ in range(self.num_tipos)] for k in primeiras_k}
+
+    def adicionar_sequencia(self, codigos):
+        """Adiciona um embaralhamento (sequência de códigos de tipo)"""
+        self.n += 1
+        for posicao, codigo in enumerate(codigos):
+            self.posicao[posicao][codigo] += 1
+        for anterior, seguinte in zip(codigos, codigos[1:]):
+            self.adjacencia[anterior][seguinte] += 1
+        for k, distribuicao in self.primeiras.items():
+            contagem = [0] * self.num_tipos
+            for codigo in codigos[:k]:
+                contagem[codigo] += 1
+            for codigo in range(self.num_tipos):
+                distribuicao[codigo][contagem[codigo]] += 1
+
+    def combinar(self, outra):
+        """Incorpora as contagens de outra análise do mesmo baralho"""
+        if outra.quantidades != self.quantidades or outra.primeiras.keys() != self.primeiras.keys():
+            raise ValueError("Análises de baralhos incompatíveis")
+        self.n += outra.n
+        for linha, linha_outra in zip(self.posicao + self.adjacencia,
+                                      outra.posicao + outra.adjacencia):
+            for i, valor in enumerate(linha_outra):
+                linha[i] += valor
+        for k, distribuicao in self.primeiras.items():
+            for linha, linha_outra in zip(distribuicao, outra.primeiras[k]):
+                for i, valor in enumerate(linha_outra):
+                    linha[i] += valor
+
+    def testes_posicao(self):
+        """
+        Testa, em cada posição, se os tipos seguem as proporções do baralho
+
+        Returns:
+            list: (estatística, graus de liberdade, p-valor) por posição
+        """
+        esperado = [self.n * q / self.num_cartas for q in self.quantidades]
+        return [qui_quadrado(linha, esperado) for linha in self.posicao]
+
+    def teste_adjacencia(self):
+        """
+        Testa se os pares de cartas vizinhas seguem as probabilidades sem reposição
+
+        O teste é aproximado: os pares de um mesmo embaralhamento não são
+        independentes entre si.
+
+        Returns:
+            tuple: (estatística, graus de liberdade, p-valor)
+        """
+        pares = self.n * (self.num_cartas - 1)
+        denominador = self.num_cartas * (self.num_cartas - 1)
+        observado = []
+        esperado = []
+        for a in range(self.num_tipos):
+            for b in range(self.num_tipos):
+                favoraveis = self.quantidades[a] * (self.quantidades[b] - (a == b))
+                observado.append(self.adjacencia[a][b])
+                esperado.append(pares * favoraveis / denominador)
+        return qui_quadrado(observado, esperado)
+
+    def distribuicao_hipergeometrica(self, codigo, k):
+        """Probabilidade de j cartas do tipo nas k primeiras compras, j = 0..k"""
+        quantidade = self.quantidades[codigo]
+        total = math.comb(self.num_cartas, k)
+        return [math.comb(quantidade, j) * math.comb(self.num_cartas - quantidade, k - j) / total
+                for j in range(k + 1)]
+
+    def testes_primeiras(self):
+        """
+        Testa a distribuição de cada tipo nas k primeiras compras (hipergeométrica)
+
+        Returns:
+            dict: {k: [(estatística, graus de liberdade, p-valor) por tipo]}
+        """
+        resultados = {}
+        for k, distribuicao in self.primeiras.items():
+            resultados[k] = []
+            for codigo in range(self.num_tipos):
+                esperado = [self.n * p for p in self.distribuicao_hipergeometrica(codigo, k)]
+                resultados[k].append(qui_quadrado(distribuicao[codigo], esperado))
+        return resultados
@@ -0,0 +1,259 @@
+"""
+Histórico de compras persistente, compartilhado entre sessões e processos.
+
+O arquivo tem um cabeçalho de TAMANHO_CABECALHO bytes (magia, versão e um
+contador uint64 por tipo de carta) seguido de um código de tipo
+(regras.CODIGOS, 1 byte) por compra, só acrescentado ao fim. O cabeçalho fica
+mapeado em memória (mmap): ler os contadores não custa uma chamada ao sistema.
+
+Cada compra vai primeiro para um buffer em memória; a cada
+COMPRAS_POR_DESCARGA compras (e ao fechar), o lote é acrescentado ao arquivo
+e somado aos contadores sob uma trava exclusiva do arquivo (fcntl.flock, ou
+msvcrt.locking no Windows). Vários processos do jogo podem usar o mesmo
+arquivo: os lotes não se misturam e os contadores não perdem incrementos.
+
+Os códigos só servem ao gráfico de convergência, então o arquivo guarda no
+máximo LIMITE_CODIGOS deles (16 MiB). Depois disso, as compras só somam
+aos contadores do cabeçalho, e o arquivo para de crescer.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import sys
+from contextlib import contextmanager
+from regras import TIPOS
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # Unix
+    msvcrt = None
+
+MAGIA = b"DUELOHST"
+VERSAO = 2  # 2: códigos limitados a LIMITE_CODIGOS (contadores podem passar deles)
+VERSOES_LIDAS = (1, 2)  # A versão 1 tem o mesmo cabeçalho e é atualizada ao abrir
+
+# Magia, versão e um contador por tipo (ordem de regras.TIPOS)
+FORMATO_CABECALHO = "<8sI4x" + "Q" * len(TIPOS)
+FORMATO_CONTADORES = "<" + "Q" * len(TIPOS)
+POSICAO_CONTADORES = struct.calcsize("<8sI4x")
+TAMANHO_CABECALHO = 64
+
+# Compras acumuladas em memória antes de cada escrita no arquivo
+COMPRAS_POR_DESCARGA = 256
+
+# Máximo de códigos guardados no arquivo (um byte cada)
+LIMITE_CODIGOS = 16 * 1024 * 1024
+
+NOME_ARQUIVO = "historico_compras.bin"
+
+
+def diretorio_dados():
+    """
+    Pasta de dados do jogo para o usuário atual
+
+    %LOCALAPPDATA% no Windows, ~/Library/Application Support no macOS e
+    $XDG_DATA_HOME (ou ~/.local/share) nos demais, sempre com a subpasta
+    duelo_cartas. A pasta não é criada aqui.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, "duelo_cartas")
+
+
+def caminho_padrao():
+    """Arquivo de histórico compartilhado por todas as sessões do usuário"""
+    return os.path.join(diretorio_dados(), NOME_ARQUIVO)
+
+
+class HistoricoPersistente:
+    """Contagem de todas as compras já feitas na máquina, por tipo"""
+
+    def __init__(self, caminho, compras_por_descarga=COMPRAS_POR_DESCARGA,
+                 limite_codigos=LIMITE_CODIGOS):
+        """
+        Abre (ou cria) o arquivo de histórico e a pasta dele
+
+        Args:
+            caminho: Arquivo do histórico (ver caminho_padrao)
+            compras_por_descarga: Compras guardadas em memória antes de cada escrita
+            limite_codigos: Máximo de códigos guardados no arquivo
+
+        Raises:
+            OSError: Se o arquivo não puder ser aberto
+            ValueError: Se o arquivo existir e não for um histórico válido
+        """
+        self.caminho = caminho
+        self.compras_por_descarga = compras_por_descarga
+        self.limite_codigos = limite_codigos
+        self.pendentes = bytearray()
+        self.contagem_pendente = [0] * len(TIPOS)
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self.fd = os.open(caminho, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            with self._trava():
+                self._preparar_cabecalho()
+            self.cabecalho = mmap.mmap(self.fd, TAMANHO_CABECALHO)
+        except BaseException:
+            os.close(self.fd)
+            raise
+
+    @contextmanager
+    def _trava(self):
+        """Trava exclusiva do arquivo inteiro (entre processos)"""
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            # No Windows a trava é de um intervalo de bytes: usa o primeiro
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        else:
+            yield
+
+    def _preparar_cabecalho(self):
+        """Cria o cabeçalho de um arquivo novo ou valida (e corrige) o existente"""
+        tamanho = os.fstat(self.fd).st_size
+        if tamanho == 0:
+            cabecalho = struct.pack(FORMATO_CABECALHO, MAGIA, VERSAO, *([0] * len(TIPOS)))
+            os.write(self.fd, cabecalho.ljust(TAMANHO_CABECALHO, b"\0"))
+            return
+
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        dados = os.read(self.fd, TAMANHO_CABECALHO)
+        if len(dados) < TAMANHO_CABECALHO or dados[:len(MAGIA)] != MAGIA:
+            raise ValueError(f"{self.caminho} não é um histórico de compras")
+        magia, versao, *contadores = struct.unpack_from(FORMATO_CABECALHO, dados)
+        if versao not in VERSOES_LIDAS:
+            raise ValueError(f"Versão de histórico não suportada: {versao}")
+        if versao != VERSAO:
+            # Marca a versão nova: quem só lê a 1 recusa o arquivo em vez de
+            # "corrigir" contadores maiores que os códigos guardados
+            os.lseek(self.fd, len(MAGIA), os.SEEK_SET)
+            os.write(self.fd, struct.pack("<I", VERSAO))
+
+        # Um processo interrompido entre acrescentar o lote e somar os
+        # contadores deixa os dois diferentes: o arquivo de códigos vale.
+        # Com o limite de códigos atingido, os contadores podem ser maiores
+        guardados = tamanho - TAMANHO_CABECALHO
+        if sum(contadores) < guardados or \
+                (guardados < self.limite_codigos and sum(contadores) != guardados):
+            with mmap.mmap(self.fd, 0, access=mmap.ACCESS_READ) as mapa:
+                codigos = mapa[TAMANHO_CABECALHO:]
+            contadores = [codigos.count(bytes([codigo])) for codigo in range(len(TIPOS))]
+            os.lseek(self.fd, POSICAO_CONTADORES, os.SEEK_SET)
+            os.write(self.fd, struct.pack(FORMATO_CONTADORES, *contadores))
+            logging.warning(f"Contadores de {self.caminho} recalculados a partir das compras")
+
+        # Arquivo gravado antes do limite: os contadores já têm o total
+        if guardados > self.limite_codigos:
+            os.ftruncate(self.fd, TAMANHO_CABECALHO + self.limite_codigos)
+
+    def registrar(self, codigo):
+        """Registra uma compra (código de regras.CODIGOS)"""
+        self.pendentes.append(codigo)
+        self.contagem_pendente[codigo] += 1
+        if len(self.pendentes) >= self.compras_por_descarga:
+            self.descarregar()
+
+    def descarregar(self):
+        """Acrescenta as compras pendentes ao arquivo e soma-as aos contadores"""
+        if not self.pendentes:
+            return
+        with self._trava():
+            fim = os.lseek(self.fd, 0, os.SEEK_END)
+            espaco = self.limite_codigos - (fim - TAMANHO_CABECALHO)
+            if espaco > 0:
+                os.write(self.fd, self.pendentes[:espaco])
+            contadores = struct.unpack_from(FORMATO_CONTADORES, self.cabecalho, POSICAO_CONTADORES)
+            struct.pack_into(FORMATO_CONTADORES, self.cabecalho, POSICAO_CONTADORES,
+                             *(total + novo for total, novo in zip(contadores, self.contagem_pendente)))
+        self.pendentes.clear()
+        self.contagem_pendente = [0] * len(TIPOS)
+
+    def contagens(self):
+        """
+        Compras de cada tipo em todos os processos (gravadas) e neste (pendentes)
+
+        Returns:
+            dict: {tipo: quantidade}
+        """
+        contadores = struct.unpack_from(FORMATO_CONTADORES, self.cabecalho, POSICAO_CONTADORES)
+        return {tipo: gravadas + pendentes for tipo, gravadas, pendentes
+                in zip(TIPOS, contadores, self.contagem_pendente)}
+
+    def total(self):
+        """Total de compras registradas"""
+        return sum(self.contagens().values())
+
+    def calcular_frequencia_empirica(self):
+        """
+        Frequência de cada tipo em todas as compras registradas
+
+        Returns:
+            dict: Frequências em percentual (mesmo formato de Baralho.calcular_frequencia_empirica)
+        """
+        contagens = self.contagens()
+        total = sum(contagens.values())
+        if total == 0:
+            return {tipo: 0.0 for tipo in TIPOS}
+        return {tipo: quantidade / total * 100 for tipo, quantidade in contagens.items()}
+
+    @contextmanager
+    def mapear_codigos(self, inicio=0):
+        """
+        Visão somente leitura (memoryview de bytes) dos códigos já gravados
+
+        Pode ser lida com numpy.frombuffer(visao, dtype=numpy.uint8); só é
+        válida dentro do bloco `with`. Compras pendentes não aparecem, nem as
+        que passaram de limite_codigos (só os contadores as incluem).
+
+        O arquivo fica travado dentro do bloco (outro processo não o encurta
+        durante a leitura); os demais processos esperam para gravar.
+
+        Args:
+            inicio: Índice do primeiro código da visão
+        """
+        self.descarregar()
+        with self._trava():
+            with mmap.mmap(self.fd, 0, access=mmap.ACCESS_READ) as mapa:
+                visao = memoryview(mapa)[TAMANHO_CABECALHO + inicio:]
+                try:
+                    yield visao
+                finally:
+                    visao.release()
+
+    def fechar(self):
+        """Grava as compras pendentes e fecha o arquivo"""
+        if self.fd is None:
+            return
+        self.descarregar()
+        self.cabecalho.close()
+        os.close(self.fd)
+        self.fd = None
+
+    def __str__(self):
+        return f"HistoricoPersistente({self.caminho}, {self.total()} compras)"
+
+    def __repr__(self):
+        return self.__str__()
@@ -1,24 +1,34 @@
 from jogador import Player
 import pygame
 import sys
-import random
 import logging
-import os
+import math
+import time
 from carta import Card
 from baralho import Deck
-
-# Configuração de Logging
-logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Inicialização do Pygame
-pygame.init()
+from regras import TIPOS, CARTAS_INICIAIS, Partida, escolher_jogada_ia
+from replay import GravadorReplay, caminho_padrao as caminho_replay
+from historico_persistente import HistoricoPersistente, caminho_padrao as caminho_historico
+from aleatorio import EFEITOS, PARTIDAS, FonteAleatoria, derivar_semente
+from particulas import SistemaParticulas
+from serie_convergencia import SerieConvergencia
+from desempenho import CapturaPerfil, MedidorQuadros
+from recursos import AtlasSprites, CarregadorSprites
+import textos
 
 # Configurações da Janela (Resolução Virtual)
 LARGURA_VIRTUAL = 1200
 ALTURA_VIRTUAL = 600
 FPS = 60
 
+# Passo fixo da lógica (animações, partículas, timers), independente do FPS
+PASSOS_LOGICA_POR_SEGUNDO = 60
+PASSO_LOGICA_MS = 1000 / PASSOS_LOGICA_POR_SEGUNDO
+
+# Máximo de passos de lógica recuperados em um quadro; além disso o atraso é
+# descartado (evita a espiral de um display muito lento)
+MAX_PASSOS_POR_QUADRO = 5
+
 # Cores (RGB)
 COR_FUNDO = (20, 20, 30)
 COR_AREA_JOGO = (40, 40, 60)
@@ -26,36 +36,50 @@ COR_AREA_STATS = (30, 50, 40)
 COR_BORDA = (100, 100, 120)
 COR_TEXTO = (255, 255, 255)
 
+# Cores de cada tipo nos gráficos do painel de estatísticas
+CORES_GRAFICO = {
+    Card.ATAQUE: (220, 60, 60),
+    Card.DEFESA: (60, 130, 220),
+    Card.CURA: (60, 210, 90)
+}
+COR_FUNDO_PAINEL = (30, 35, 45, 240)  # Fundo escuro semi-transparente
+
 # Divisão da Tela (Baseada na resolução virtual)
 LARGURA_JOGO = int(LARGURA_VIRTUAL * 0.65)  # 65% para o jogo
 LARGURA_STATS = LARGURA_VIRTUAL - LARGURA_JOGO  # 35% para estatísticas
 
+# Acima disso, os retângulos sujos de um frame são unidos em um só
+LIMITE_RETANGULOS_SUJOS = 16
 
-class Particle:
-    """
-    Representa uma partícula simples para efeitos visuais.
-    """
+# Maior grade de alinhamento (pixels virtuais) aceita na renderização parcial
+GRADE_MAXIMA_PARCIAL = 40
 
-    def __init__(self, x, y, cor):
-        self.x = x
-        self.y = y
-        self.cor = cor
-        # Velocidade aleatória explosiva
-        self.vx = random.uniform(-5, 5)
-        self.vy = random.uniform(-5, 5)
-        self.vida = random.randint(20, 40)  # Frames de vida
-        self.tamanho = random.randint(3, 6)
+# Posição da primeira carta de cada mão
+# Ajustado Y para não cobrir informações (IA: 180, Jogador: 340)
+POSICAO_MAO_IA = (150, 180)
+POSICAO_MAO_JOGADOR = (150, 340)
 
-    def atualizar(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vida -= 1
-        self.tamanho = max(0, self.tamanho - 0.1)  # Diminui tamanho
+# Modo turbo (IA contra IA): redesenhos por segundo e partidas máximas por redesenho
+QUADROS_POR_SEGUNDO_TURBO = 10
+PARTIDAS_POR_QUADRO_TURBO = 1000
 
-    def desenhar(self, superficie):
-        if self.vida > 0:
-            pygame.draw.rect(superficie, self.cor, (int(self.x), int(
-                self.y), int(self.tamanho), int(self.tamanho)))
+# Replay: arquivo onde as partidas são gravadas (na pasta de dados do
+# usuário, como o histórico) e partidas turbo por bloco de resumo
+ARQUIVO_REPLAY = caminho_replay()
+PARTIDAS_POR_BLOCO_TURBO = 10_000
+
+# Histórico de compras de todas as sessões do usuário (compartilhado entre processos)
+ARQUIVO_HISTORICO = caminho_historico()
+
+# Exportação dos tempos por fase (gravada ao sair se o painel foi usado)
+ARQUIVO_DESEMPENHO = "desempenho_quadros.csv"
+
+# Tempo máximo (s) que a inicialização espera pelos sprites antes do
+# primeiro quadro; passado esse tempo, eles são aplicados quando chegarem
+ESPERA_SPRITES_S = 0.05
+
+# Quadros entre duas atualizações do painel de desempenho
+INTERVALO_PAINEL_DESEMPENHO = 15
 
 
 class FloatingText:
@@ -79,27 +103,34 @@ class FloatingText:
         self.y = y
         self.cor = cor
         self.alpha = 255
-        self.vida = 60  # Duração em frames (1 segundo a 60 FPS)
+        self.vida = 60  # Duração em passos de lógica (1 segundo)
 
     def atualizar(self):
-        """Atualiza a posição e a transparência do texto."""
-        self.y -= 1  # Sobe 1 pixel por frame
+        """Atualiza a posição e a transparência do texto (um passo de lógica)."""
+        self.y -= 1  # Sobe 1 pixel por passo
         self.vida -= 1
-        if self.vida < 20:  # Fade out nos últimos 20 frames
+        if self.vida < 20:  # Fade out nos últimos 20 passos
             self.alpha = int((self.vida / 20) * 255)
 
-    def desenhar(self, superficie, fonte):
+    def posicao(self, alfa=1.0):
+        """Posição de desenho, interpolada dentro do passo de lógica atual."""
+        return (self.x, int(self.y + (1.0 - alfa)))
+
+    def desenhar(self, superficie, fonte, alfa=1.0):
         """
         Desenha o texto na superfície fornecida.
 
         Args:
             superficie (pygame.Surface): Superfície onde desenhar.
             fonte (pygame.font.Font): Fonte a ser usada.
+            alfa (float): Fração do passo de lógica decorrida (interpolação).
         """
         if self.vida > 0:
-            texto_surf = fonte.render(self.texto, True, self.cor)
+            # A superfície vem do cache compartilhado: restaura o alpha após o uso
+            texto_surf = textos.renderizar(fonte, self.texto, self.cor)
             texto_surf.set_alpha(self.alpha)
-            superficie.blit(texto_surf, (self.x, self.y))
+            superficie.blit(texto_surf, self.posicao(alfa))
+            texto_surf.set_alpha(255)
 
 
 class JogoDuelo:
@@ -108,8 +139,24 @@ class JogoDuelo:
     Controla o loop do jogo, eventos, renderização e lógica de turnos.
     """
 
-    def __init__(self):
-        """Inicializa o jogo, configurando janela, baralho e jogadores."""
+    def __init__(self, arquivo_replay=ARQUIVO_REPLAY, aleatorio=None,
+                 arquivo_historico=ARQUIVO_HISTORICO):
+        """
+        Inicializa o jogo, configurando janela, baralho e jogadores.
+
+        Args:
+            arquivo_replay: Arquivo onde as partidas são gravadas (None desliga)
+            aleatorio: FonteAleatoria da sessão (padrão: semente aleatória);
+                       com a mesma semente, as partidas se repetem
+            arquivo_historico: Histórico de compras de todas as sessões
+                               (None desliga)
+        """
+        self.instante_inicio = time.perf_counter()
+
+        # Só os módulos usados pelo jogo (pygame.init() também abriria o áudio)
+        pygame.display.init()
+        pygame.font.init()
+
         # Configuração inicial das dimensões
         self.tela_cheia = False
 
@@ -125,68 +172,67 @@ class JogoDuelo:
         self.rodando = True
 
         # Fonte para textos
-        self.fonte_titulo = pygame.font.Font(None, 36)
-        self.fonte_texto = pygame.font.Font(None, 24)
+        self.fonte_titulo = textos.fonte(36)
+        self.fonte_texto = textos.fonte(24)
         # Fonte menor para mensagens de feedback
-        self.fonte_mensagem = pygame.font.Font(None, 22)
+        self.fonte_mensagem = textos.fonte(22)
+        # Fonte da legenda do painel de estatísticas
+        self.fonte_legenda = textos.fonte(20)
 
-        # Carregamento de Assets
+        # Sprites: decodificados em segundo plano (ver recursos.py); até
+        # chegarem, as cartas usam as faces só com texto
         self.assets = {}
-        ASSETS_DIR = "assets"
-
-        cartas_files = {
-            Card.ATAQUE: "carta_ataque.png",
-            Card.DEFESA: "carta_defesa.png",
-            Card.CURA: "carta_cura.png"
-        }
-
-        for tipo, filename in cartas_files.items():
-            path = os.path.join(ASSETS_DIR, filename)
+        self.montar_atlas()
+        self.carregador_sprites = CarregadorSprites((Card.LARGURA, Card.ALTURA))
+        self.carregador_sprites.iniciar()
+
+        # Números aleatórios: cada partida tem sua própria semente (sorteada
+        # do fluxo de partidas da sessão), que gera os fluxos de embaralhamento
+        # e da IA; os efeitos visuais usam outro fluxo e não alteram o jogo
+        self.aleatorio = aleatorio if aleatorio is not None else FonteAleatoria()
+        self.semente_partida = self.nova_semente_partida()
+        fonte = FonteAleatoria(self.semente_partida)
+
+        # Gravação das partidas (ver replay.py)
+        self.gravador = None
+        if arquivo_replay:
             try:
-                img = pygame.image.load(path).convert_alpha()
-                img = pygame.transform.scale(img, (Card.LARGURA, Card.ALTURA))
-                self.assets[tipo] = img
-                logging.info(f"Asset carregado: {filename}")
-            except Exception as e:
-                logging.warning(f"Falha ao carregar asset {filename}: {e}")
-                self.assets[tipo] = None
-
-        # Carregar Avatares
-        avatars_files = {
-            "avatar_ia": "avatar_ia.png",
-            "avatar_player": "avatar_player.png"
-        }
-
-        for nome, filename in avatars_files.items():
-            path = os.path.join(ASSETS_DIR, filename)
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                # Tamanho fixo para avatares
-                img = pygame.transform.scale(img, (100, 100))
-                self.assets[nome] = img
-                logging.info(f"Avatar carregado: {filename}")
-            except Exception as e:
-                logging.warning(f"Falha ao carregar avatar {filename}: {e}")
-                self.assets[nome] = None
+                self.gravador = GravadorReplay(arquivo_replay)
+            except OSError as e:
+                logging.warning(f"Gravação de replay desativada: {e}")
 
         # Baralho do jogo
-        self.deck = Deck()
+        self.deck = Deck(fonte)
+
+        # Histórico de todas as sessões: cada compra também vai para o arquivo
+        self.historico_global = None
+        if arquivo_historico:
+            try:
+                self.historico_global = HistoricoPersistente(arquivo_historico)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Histórico global desativado: {e}")
+        self.deck.persistente = self.historico_global
+        # Painel de estatísticas: todas as sessões (True) ou só a atual
+        self.estatisticas_globais = self.historico_global is not None
+        # Gráfico de convergência (G) em vez das barras, com uma série por origem
+        self.grafico_convergencia = False
+        self.serie_sessao = SerieConvergencia()
+        self.serie_global = SerieConvergencia()
 
         # Flag de debug: Pré-popular histórico
         DEBUG_HISTORICO = False
         if DEBUG_HISTORICO:
             for _ in range(10):
-                self.deck.historico_cartas.append(Card.ATAQUE)
+                self.deck.registrar_compra(Card.ATAQUE)
 
         # Jogadores (posições fixas na resolução virtual)
-        self.ia = Player("IA", 50, 80, avatar=self.assets.get("avatar_ia"))
-        self.jogador = Player("VOCÊ", 50, 500, avatar=self.assets.get(
+        self.ia = Player("IA", 50, 80, avatar=self.atlas.recorte("avatar_ia"), rng=fonte)
+        self.jogador = Player("VOCÊ", 50, 500, avatar=self.atlas.recorte(
             "avatar_player"))  # 500 é fixo na altura 600
 
-        # Distribuir cartas iniciais (3 para cada)
-        for _ in range(3):
-            self.jogador.comprar_carta(self.deck)
-            self.ia.comprar_carta(self.deck)
+        # Regras da partida (distribui 3 cartas iniciais para cada)
+        self.partida = Partida(self.deck, (self.jogador, self.ia), fonte,
+                               self.gravador, self.semente_partida)
 
         # Sistema de turnos
         self.turno_jogador = True  # True = vez do jogador, False = vez da IA
@@ -205,17 +251,81 @@ class JogoDuelo:
         # Estado de Game Over
         self.game_over = False
 
+        # Modo turbo: as duas cadeiras jogadas pela IA, sem atrasos nem animações
+        self.modo_turbo = False
+        self.placar_turbo = [0, 0, 0]  # Vitórias VOCÊ, vitórias IA, empates
+        # A partida k da sessão usa derivar_semente(semente_turbo, k); o replay
+        # guarda só resumos por bloco e recria qualquer partida pela semente
+        self.semente_turbo = 0
+        self.inicio_bloco_turbo = (0, [0, 0, 0], {tipo: 0 for tipo in TIPOS})
+
         # Efeitos Visuais
         self.textos_flutuantes = []
-        self.particulas = []  # Lista de partículas
+        # Partículas em vetores contíguos, com o fluxo de efeitos
+        self.particulas = SistemaParticulas(rng=self.aleatorio.fluxo_numpy(EFEITOS))
         self.cartas_animando_descarte = []  # Lista de cartas sendo jogadas na mesa
-        self.flash_dano_timer = 0
-        self.shake_timer = 0  # Timer para o efeito de screen shake
+        self.flash_dano_timer = 0  # Em passos de lógica
+        self.shake_timer = 0  # Timer para o efeito de screen shake (passos)
+
+        # Fração do passo de lógica decorrida desde o último atualizar(),
+        # usada para interpolar as posições no desenho
+        self.alfa_interpolacao = 1.0
+
+        # Cache do painel de estatísticas (refeito só quando os dados mudam)
+        self.cache_painel = None
+        self.chave_cache_painel = None
+
+        # Renderização parcial: só as regiões que mudaram vão para a janela
+        self.renderizacao_parcial = True
+        self.forcar_quadro_completo = True
+        self.elementos_anteriores = {}
+        self.efeito_tela_anterior = False
+        # Houve atualização parcial não exata desde o último quadro completo
+        self.desvio_parcial = False
+        self.quadro = 0  # Quadros apresentados (incrementado em apresentar_quadro)
+
+        # Instrumentação: tempo por fase do frame e captura de perfil
+        self.medidor = MedidorQuadros()
+        self.captura_perfil = CapturaPerfil()
+        self.mostrar_desempenho = False
+        self.exportar_desempenho = False
+        self.cache_painel_desempenho = None
+        self.versao_painel_desempenho = 0
+        self.quadro_painel_desempenho = 0
+
+        # Com o cache em disco os sprites chegam em poucos ms: espera um pouco
+        # para o primeiro quadro já sair com eles; senão entram depois
+        if self.carregador_sprites.aguardar(ESPERA_SPRITES_S):
+            self.aplicar_sprites()
+
+    def montar_atlas(self):
+        """Compõe as faces das cartas e junta-as com os avatares em um atlas"""
+        imagens = Card.preparar_faces(self.assets)
+        imagens["avatar_ia"] = self.assets.get("avatar_ia")
+        imagens["avatar_player"] = self.assets.get("avatar_player")
+        self.atlas = AtlasSprites(imagens)
+
+    def aplicar_sprites(self):
+        """Usa os sprites carregados em segundo plano (faces das cartas e avatares)"""
+        self.assets = self.carregador_sprites.superficies()
+        self.montar_atlas()
+        self.ia.avatar = self.atlas.recorte("avatar_ia")
+        self.jogador.avatar = self.atlas.recorte("avatar_player")
+        self.forcar_quadro_completo = True
+
+    def verificar_sprites(self):
+        """Aplica os sprites se o carregamento em segundo plano acabou"""
+        carregador = self.carregador_sprites
+        if not carregador.entregue and carregador.pronto():
+            self.aplicar_sprites()
+
+    def nova_semente_partida(self):
+        """Próxima semente do fluxo de partidas da sessão"""
+        return self.aleatorio.fluxo(PARTIDAS).getrandbits(63)
 
     def gerar_particulas_dano(self, x, y, cor):
         """Gera uma explosão de partículas na posição especificada"""
-        for _ in range(15):  # 15 a 20 partículas
-            self.particulas.append(Particle(x, y, cor))
+        self.particulas.emitir(x, y, cor, 15)
 
     def adicionar_texto_flutuante(self, texto, x, y, cor):
         """Adiciona um texto flutuante à lista"""
@@ -228,6 +338,91 @@ class JogoDuelo:
         scale_y = ALTURA_VIRTUAL / altura_janela
         return (int(pos[0] * scale_x), int(pos[1] * scale_y))
 
+    def grade_renderizacao_parcial(self):
+        """
+        Retorna a grade (gx, gy), em pixels virtuais, que a janela escala sem resto
+
+        Retângulos alinhados a essa grade caem em pixels inteiros da janela.
+        Quando a grade é grossa demais (ex.: 1366x768), usa (1, 1) e os
+        retângulos só são arredondados para pixels da janela.
+        """
+        largura_janela, altura_janela = self.tela.get_size()
+        grade_x = LARGURA_VIRTUAL // math.gcd(LARGURA_VIRTUAL, largura_janela)
+        grade_y = ALTURA_VIRTUAL // math.gcd(ALTURA_VIRTUAL, altura_janela)
+        if max(grade_x, grade_y) > GRADE_MAXIMA_PARCIAL:
+            return 1, 1
+        return grade_x, grade_y
+
+    def ampliacao_inteira(self):
+        """
+        Verifica se a janela amplia a resolução virtual por fatores inteiros
+
+        Nesse caso o quadro é escalado sem filtro (pygame.transform.scale):
+        cada pixel virtual vira um bloco exato de pixels da janela (ex.:
+        2400x1200, 3600x1800).
+        """
+        largura_janela, altura_janela = self.tela.get_size()
+        return ((largura_janela > LARGURA_VIRTUAL or altura_janela > ALTURA_VIRTUAL)
+                and largura_janela % LARGURA_VIRTUAL == 0
+                and altura_janela % ALTURA_VIRTUAL == 0)
+
+    def renderizacao_parcial_possivel(self):
+        """
+        Verifica se a janela admite atualizações parciais
+
+        Ao ampliar por um fator não inteiro (ex.: 1920x960, 3840x1920), o
+        smoothscale de cada recorte difere do quadro inteiro em centenas de
+        níveis por canal nas bordas, e as emendas ficariam visíveis: nesses
+        tamanhos todo frame é completo.
+        """
+        largura_janela, altura_janela = self.tela.get_size()
+        if largura_janela <= LARGURA_VIRTUAL and altura_janela <= ALTURA_VIRTUAL:
+            return True
+        return self.ampliacao_inteira()
+
+    def escala_parcial_exata(self):
+        """
+        Verifica se escalar um recorte reproduz exatamente o quadro inteiro
+
+        No tamanho virtual (1200x600) a cópia é direta, e nas ampliações
+        inteiras (ver ampliacao_inteira) cada bloco é independente: ambas são
+        sempre exatas. O smoothscale só é local ao reduzir a imagem com um
+        passo exato em ponto fixo (16 bits): 65536 * virtual divisível pela
+        janela em cada eixo (ex.: 800x400, 600x300), com a grade de
+        alinhamento disponível. Em reduções não exatas (ex.: 1000x500) a
+        diferença é de poucos níveis por canal.
+        """
+        largura_janela, altura_janela = self.tela.get_size()
+        if (largura_janela, altura_janela) == (LARGURA_VIRTUAL, ALTURA_VIRTUAL):
+            return True  # Cópia 1:1, sem escala
+        if self.ampliacao_inteira():
+            return True
+        return (largura_janela <= LARGURA_VIRTUAL and altura_janela <= ALTURA_VIRTUAL
+                and (LARGURA_VIRTUAL << 16) % largura_janela == 0
+                and (ALTURA_VIRTUAL << 16) % altura_janela == 0
+                and self.grade_renderizacao_parcial() != (1, 1))
+
+    def escalar_superficie(self, superficie, tamanho):
+        """
+        Escala (parte d)a superfície virtual para a janela
+
+        Nas ampliações inteiras usa pygame.transform.scale, para um recorte
+        sair idêntico ao mesmo trecho do quadro inteiro; nos demais tamanhos,
+        smoothscale.
+        """
+        if self.ampliacao_inteira():
+            return pygame.transform.scale(superficie, tamanho)
+        return pygame.transform.smoothscale(superficie, tamanho)
+
+    def converter_rect_tela(self, rect):
+        """Converte um retângulo da resolução virtual para a janela"""
+        largura_janela, altura_janela = self.tela.get_size()
+        esquerda = rect.left * largura_janela // LARGURA_VIRTUAL
+        topo = rect.top * altura_janela // ALTURA_VIRTUAL
+        direita = rect.right * largura_janela // LARGURA_VIRTUAL
+        base = rect.bottom * altura_janela // ALTURA_VIRTUAL
+        return pygame.Rect(esquerda, topo, direita - esquerda, base - topo)
+
     def alternar_tela_cheia(self):
         """Alterna entre modo janela e tela cheia"""
         self.tela_cheia = not self.tela_cheia
@@ -236,21 +431,51 @@ class JogoDuelo:
         else:
             self.tela = pygame.display.set_mode(
                 (LARGURA_VIRTUAL, ALTURA_VIRTUAL), pygame.RESIZABLE)
+        self.forcar_quadro_completo = True
 
-    def processar_eventos(self):
-        """Processa todos os eventos do Pygame"""
-        for evento in pygame.event.get():
+    def processar_eventos(self, eventos=None):
+        """
+        Processa os eventos do Pygame
+
+        Args:
+            eventos: Eventos já retirados da fila (padrão: pygame.event.get())
+        """
+        if eventos is None:
+            eventos = pygame.event.get()
+        for evento in eventos:
             if evento.type == pygame.QUIT:
                 self.rodando = False
             elif evento.type == pygame.VIDEORESIZE:
                 if not self.tela_cheia:
                     self.tela = pygame.display.set_mode(
                         evento.size, pygame.RESIZABLE)
+                self.forcar_quadro_completo = True
+            elif evento.type == pygame.WINDOWEXPOSED:
+                # A janela foi descoberta: o conteúdo antigo precisa ser refeito
+                self.forcar_quadro_completo = True
             elif evento.type == pygame.KEYDOWN:
                 if evento.key == pygame.K_ESCAPE:
                     self.rodando = False
                 elif evento.key == pygame.K_F11:
                     self.alternar_tela_cheia()
+                elif evento.key == pygame.K_t:
+                    self.alternar_turbo()
+                elif evento.key == pygame.K_h and self.historico_global is not None:
+                    self.estatisticas_globais = not self.estatisticas_globais
+                elif evento.key == pygame.K_g:
+                    self.grafico_convergencia = not self.grafico_convergencia
+                elif evento.key == pygame.K_F3:
+                    self.mostrar_desempenho = not self.mostrar_desempenho
+                    self.exportar_desempenho = True
+                    self.cache_painel_desempenho = None
+                elif evento.key == pygame.K_F4:
+                    self.captura_perfil.alternar()
+                    self.exportar_desempenho = True
+                elif evento.key == pygame.K_F8:
+                    self.renderizacao_parcial = not self.renderizacao_parcial
+                    self.forcar_quadro_completo = True
+                    logging.info(
+                        f"Renderização parcial: {self.renderizacao_parcial}")
                 elif self.game_over and evento.key == pygame.K_r:
                     self.reiniciar_jogo()
             elif evento.type == pygame.MOUSEBUTTONDOWN:
@@ -278,7 +503,6 @@ class JogoDuelo:
             if distancia < 5:
                 # Chegou ao destino: Aplica efeito e descarta
                 self.aplicar_efeito_carta(carta, item['origem'], item['alvo'])
-                self.deck.adicionar_ao_descarte(carta)
                 self.cartas_animando_descarte.remove(item)
 
                 # Executa callback de finalização (passar turno, etc)
@@ -286,14 +510,17 @@ class JogoDuelo:
                     item['callback']()
 
         # Verifica se alguém morreu
-        if not self.jogador.esta_vivo():
+        vencedor = self.partida.vencedor()
+        if vencedor is self.ia:
             self.mensagem = "VOCÊ PERDEU! A IA venceu!"
             self.cor_mensagem = (255, 50, 50)
             self.game_over = True
-        elif not self.ia.esta_vivo():
+        elif vencedor is self.jogador:
             self.mensagem = "VOCÊ VENCEU! Parabéns!"
             self.cor_mensagem = (50, 255, 50)
             self.game_over = True
+        if vencedor is not None:
+            self.partida.encerrar()  # Grava o fim da partida (só na primeira vez)
 
         if self.game_over:
             return
@@ -311,16 +538,15 @@ class JogoDuelo:
                 self.textos_flutuantes.remove(texto)
 
         # Atualiza partículas
-        for particula in self.particulas[:]:
-            particula.atualizar()
-            if particula.vida <= 0:
-                self.particulas.remove(particula)
+        self.particulas.atualizar()
 
         # Verifica se é hora da IA jogar
-        if self.aguardando_ia:
-            tempo_atual = pygame.time.get_ticks()
-            if tempo_atual >= self.tempo_espera_ia:
-                self.executar_passo_ia()
+        if self.prazo_ia_vencido():
+            self.executar_passo_ia()
+
+    def prazo_ia_vencido(self):
+        """Verifica se há um passo da IA agendado cujo horário já chegou"""
+        return self.aguardando_ia and pygame.time.get_ticks() >= self.tempo_espera_ia
 
     def processar_hover(self, pos):
         """Processa o movimento do mouse para destacar cartas"""
@@ -331,7 +557,7 @@ class JogoDuelo:
 
     def processar_clique(self, pos):
         """Processa cliques do mouse"""
-        if not self.turno_jogador:
+        if not self.turno_jogador or self.modo_turbo:
             return  # Não é o turno do jogador
 
         if self.fase_turno == "comprar":
@@ -346,7 +572,7 @@ class JogoDuelo:
 
     def comprar_carta_turno(self):
         """Jogador compra uma carta no início do turno"""
-        if self.jogador.comprar_carta(self.deck):
+        if self.partida.comprar(self.jogador):
             self.mensagem = "Carta comprada! Agora escolha uma carta para jogar."
             self.cor_mensagem = (100, 255, 100)
             self.fase_turno = "jogar"
@@ -356,7 +582,7 @@ class JogoDuelo:
 
     def jogar_carta_turno(self, indice):
         """Jogador joga uma carta"""
-        carta = self.jogador.jogar_carta(indice)
+        carta = self.partida.jogar(indice, self.jogador)
         if carta:
             # Define destino para o centro da mesa
             centro_x = LARGURA_JOGO // 2 - Card.LARGURA // 2
@@ -397,10 +623,11 @@ class JogoDuelo:
         self.tempo_espera_ia = pygame.time.get_ticks() + 1500
 
     def aplicar_efeito_carta(self, carta, jogador_ativo, oponente):
-        """Aplica o efeito de uma carta"""
+        """Aplica o efeito de uma carta (via regras) e dispara os efeitos visuais"""
+        valor = self.partida.resolver(carta, jogador_ativo, oponente)
+
         if carta.tipo == Card.ATAQUE:
-            dano = carta.valores[Card.ATAQUE]
-            dano_real = oponente.receber_dano(dano)
+            dano_real = valor
             self.mensagem = f"{jogador_ativo.nome} atacou! {dano_real} de dano!"
             self.cor_mensagem = (255, 100, 100)
 
@@ -419,8 +646,7 @@ class JogoDuelo:
                 self.shake_timer = 10  # Inicia o screen shake
 
         elif carta.tipo == Card.DEFESA:
-            defesa = carta.valores[Card.DEFESA]
-            jogador_ativo.adicionar_defesa(defesa)
+            defesa = valor
             self.mensagem = f"{jogador_ativo.nome} defendeu! +{defesa} de defesa!"
             self.cor_mensagem = (100, 150, 255)
 
@@ -429,8 +655,7 @@ class JogoDuelo:
                 f"+{defesa} DEF", jogador_ativo.x + 20, jogador_ativo.y - 20, (100, 150, 255))
 
         elif carta.tipo == Card.CURA:
-            cura = carta.valores[Card.CURA]
-            cura_real = jogador_ativo.curar(cura)
+            cura_real = valor
             self.mensagem = f"{jogador_ativo.nome} se curou! +{cura_real} HP!"
             self.cor_mensagem = (100, 255, 100)
 
@@ -440,13 +665,14 @@ class JogoDuelo:
 
     def passar_turno(self):
         """Passa o turno para o outro jogador"""
-        self.turno_jogador = not self.turno_jogador
+        self.partida.passar_turno()
+        self.turno_jogador = self.partida.jogador_ativo is self.jogador
         self.fase_turno = "comprar"
 
     def executar_passo_ia(self):
         """Executa um passo do turno da IA (máquina de estados)"""
         # Verifica se o jogo terminou
-        if not self.ia.esta_vivo() or not self.jogador.esta_vivo():
+        if self.partida.vencedor() is not None:
             self.aguardando_ia = False
             self.estado_ia = None
             return
@@ -454,16 +680,16 @@ class JogoDuelo:
         if self.estado_ia == "IA_COMPRAR":
 
             # IA compra uma carta
-            self.ia.comprar_carta(self.deck)
+            self.partida.comprar(self.ia)
 
             # Próximo estado: Jogar (após 1000ms = 1s)
             self.estado_ia = "IA_JOGAR"
             self.tempo_espera_ia = pygame.time.get_ticks() + 1000
 
         elif self.estado_ia == "IA_JOGAR":
-            if len(self.ia.mao) > 0:
-                indice = random.randint(0, len(self.ia.mao) - 1)
-                carta = self.ia.jogar_carta(indice)
+            indice = escolher_jogada_ia(self.ia)
+            if indice is not None:
+                carta = self.partida.jogar(indice, self.ia)
 
                 if carta:
                     # Define destino para o centro da mesa
@@ -490,22 +716,37 @@ class JogoDuelo:
             self.aguardando_ia = False
             self.estado_ia = None
 
-    def reiniciar_jogo(self):
-        """Reinicia o jogo completamente"""
-        logging.info("🔄 Reiniciando o jogo...")
+    def reiniciar_jogo(self, manter_historico=False, semente=None):
+        """
+        Reinicia o jogo completamente
+
+        Args:
+            manter_historico: Mantém o histórico de compras do baralho (o
+                              painel de estatísticas continua acumulando)
+            semente: Semente da nova partida (padrão: uma nova semente aleatória)
+        """
+        if not self.modo_turbo:
+            logging.info("🔄 Reiniciando o jogo...")
+
+        # Fecha a partida anterior no replay (interrompida, se ainda não acabou)
+        self.partida.encerrar()
 
-        # Reseta o Deck (recria e embaralha)
-        self.deck.resetar()
+        # Reseta o Deck (recria e embaralha com os fluxos da nova partida)
+        self.semente_partida = semente if semente is not None else self.nova_semente_partida()
+        fonte = FonteAleatoria(self.semente_partida)
+        self.deck.rng = fonte.embaralhar
+        self.deck.resetar(manter_historico)
 
         # Reseta os Jogadores (HP máximo, mão vazia, defesa 0)
-        self.ia = Player("IA", 50, 80, avatar=self.assets.get("avatar_ia"))
+        self.ia = Player("IA", 50, 80, avatar=self.atlas.recorte("avatar_ia"), rng=fonte)
         self.jogador = Player(
-            "VOCÊ", 50, 500, avatar=self.assets.get("avatar_player"))
+            "VOCÊ", 50, 500, avatar=self.atlas.recorte("avatar_player"))
 
-        # Distribuir cartas iniciais (3 para cada)
-        for _ in range(3):
-            self.jogador.comprar_carta(self.deck)
-            self.ia.comprar_carta(self.deck)
+        # Nova partida (distribui 3 cartas iniciais para cada); as partidas
+        # turbo não são gravadas evento a evento (ver gravar_bloco_turbo)
+        gravador = None if self.modo_turbo else self.gravador
+        self.partida = Partida(self.deck, (self.jogador, self.ia), fonte,
+                               gravador, self.semente_partida)
 
         # Reseta estado do jogo
         self.turno_jogador = True
@@ -518,6 +759,89 @@ class JogoDuelo:
         self.estado_ia = None
         self.game_over = False
 
+    def alternar_turbo(self):
+        """Liga/desliga o modo turbo (IA contra IA), começando uma nova partida"""
+        if self.modo_turbo:
+            self.gravar_bloco_turbo()
+        self.modo_turbo = not self.modo_turbo
+        logging.info(f"Modo turbo: {self.modo_turbo}")
+
+        # Descarta animações e efeitos da partida interrompida
+        for item in self.cartas_animando_descarte:
+            self.deck.adicionar_ao_descarte(item['carta'])
+        self.cartas_animando_descarte = []
+        self.textos_flutuantes = []
+        self.particulas.limpar()
+        self.flash_dano_timer = 0
+        self.shake_timer = 0
+
+        if self.modo_turbo:
+            self.partida.encerrar()  # A partida interrompida é gravada com o gravador normal
+            self.semente_turbo = self.nova_semente_partida()
+            self.placar_turbo = [0, 0, 0]
+            self.inicio_bloco_turbo = (0, [0, 0, 0], dict(self.deck.contagem_historico))
+            self.reiniciar_jogo(True, derivar_semente(self.semente_turbo, 0))
+            self.atualizar_mensagem_turbo()
+        else:
+            self.reiniciar_jogo(manter_historico=True)
+
+    def gravar_bloco_turbo(self):
+        """Grava no replay o resumo das partidas turbo desde o último bloco"""
+        primeira, placar, compras = self.inicio_bloco_turbo
+        total = sum(self.placar_turbo)
+        atuais = dict(self.deck.contagem_historico)
+        if self.partida.turnos == 0:
+            # A distribuição da próxima partida (ainda não jogada) fica para o próximo bloco
+            for jogador in self.partida.jogadores:
+                for carta in jogador.mao:
+                    atuais[carta.tipo] -= 1
+        if self.gravador is not None and total > primeira:
+            self.gravador.bloco_turbo(
+                self.semente_turbo, primeira, total - primeira,
+                [atual - anterior for atual, anterior in zip(self.placar_turbo, placar)],
+                [atuais[tipo] - compras[tipo] for tipo in TIPOS])
+        self.inicio_bloco_turbo = (total, list(self.placar_turbo), atuais)
+
+    def atualizar_mensagem_turbo(self):
+        """Mostra o placar do modo turbo na linha de mensagens"""
+        vitorias, derrotas, empates = self.placar_turbo
+        partidas = vitorias + derrotas + empates
+        self.mensagem = (f"TURBO: {partidas} partidas | VOCÊ {vitorias} x "
+                         f"{derrotas} IA | {empates} empates (T para sair)")
+        self.cor_mensagem = (255, 200, 50)
+
+    def avancar_turbo(self):
+        """
+        Joga partidas IA contra IA até o próximo redesenho do modo turbo
+
+        Para depois de PARTIDAS_POR_QUADRO_TURBO partidas ou quando o tempo
+        de um quadro turbo (1 / QUADROS_POR_SEGUNDO_TURBO) se esgota. Cada
+        partida usa a mesma política de executar_passo_ia, sem atrasos nem
+        animações, e o reinício mantém o histórico de compras. A partida k
+        da sessão usa a semente derivar_semente(semente_turbo, k).
+
+        Returns:
+            int: Partidas jogadas
+        """
+        limite = pygame.time.get_ticks() + 1000 // QUADROS_POR_SEGUNDO_TURBO
+        partidas = 0
+        while partidas < PARTIDAS_POR_QUADRO_TURBO:
+            vencedor = self.partida.simular()
+            self.placar_turbo[2 if vencedor is None else vencedor] += 1
+            partidas += 1
+            total = sum(self.placar_turbo)
+            if total - self.inicio_bloco_turbo[0] >= PARTIDAS_POR_BLOCO_TURBO:
+                self.gravar_bloco_turbo()
+            self.reiniciar_jogo(True, derivar_semente(self.semente_turbo, total))
+            if pygame.time.get_ticks() >= limite:
+                break
+
+        # Sem atualizar() no modo turbo: as mãos já vão para o lugar final
+        self.ia.posicionar_mao(*POSICAO_MAO_IA)
+        self.jogador.posicionar_mao(*POSICAO_MAO_JOGADOR)
+        self.atualizar_mensagem_turbo()
+        return partidas
+
     def desenhar_game_over(self):
         """Desenha a tela de Game Over"""
         # Overlay escuro
@@ -527,15 +851,15 @@ class JogoDuelo:
         self.superficie.blit(overlay, (0, 0))
 
         # Mensagem de Resultado
-        texto_msg = self.fonte_titulo.render(
-            self.mensagem, True, self.cor_mensagem)
+        texto_msg = textos.renderizar(
+            self.fonte_titulo, self.mensagem, self.cor_mensagem)
         rect_msg = texto_msg.get_rect(
             center=(LARGURA_VIRTUAL // 2, ALTURA_VIRTUAL // 2 - 50))
         self.superficie.blit(texto_msg, rect_msg)
 
         # Botão de Reiniciar
-        texto_restart = self.fonte_titulo.render(
-            "Pressione R para Reiniciar", True, (255, 255, 255))
+        texto_restart = textos.renderizar(
+            self.fonte_titulo, "Pressione R para Reiniciar", (255, 255, 255))
         rect_restart = texto_restart.get_rect(
             center=(LARGURA_VIRTUAL // 2, ALTURA_VIRTUAL // 2 + 50))
 
@@ -560,13 +884,13 @@ class JogoDuelo:
         pygame.draw.rect(self.superficie, COR_BORDA, area_jogo, 3)
 
         # Título da área de jogo
-        texto_jogo = self.fonte_titulo.render(
-            "CAMPO DE BATALHA", True, COR_TEXTO)
+        texto_jogo = textos.renderizar(
+            self.fonte_titulo, "CAMPO DE BATALHA", COR_TEXTO)
         self.superficie.blit(texto_jogo, (area_jogo.x + 20, area_jogo.y + 15))
 
         # Mensagem de feedback do jogo (Reposicionada para o topo e reduzida)
-        texto_msg = self.fonte_mensagem.render(
-            self.mensagem, True, self.cor_mensagem)
+        texto_msg = textos.renderizar(
+            self.fonte_mensagem, self.mensagem, self.cor_mensagem)
         msg_rect = texto_msg.get_rect(
             midtop=(area_jogo.centerx, area_jogo.y + 60))
         self.superficie.blit(texto_msg, msg_rect)
@@ -579,23 +903,297 @@ class JogoDuelo:
         # para permitir um visual mais customizado (painel arredondado)
 
         # Desenha as estatísticas do baralho
-        self.desenhar_estatisticas(area_stats)
+        with self.medidor.fase("estatisticas"):
+            self.desenhar_estatisticas(area_stats)
 
     def desenhar_estatisticas(self, area):
-        """Desenha as estatísticas do baralho no painel direito como histograma"""
+        """
+        Desenha as estatísticas do baralho no painel direito como histograma
+
+        O painel é pré-renderizado em uma superfície em cache, refeita apenas
+        quando as frequências empíricas ou o tamanho do painel mudam.
+        """
+        self.atualizar_serie_sessao()
+        if self.estatisticas_globais:
+            historico = self.historico_global
+            prob_empirica = historico.calcular_frequencia_empirica()
+            subtitulo = f"Todas as sessões: {historico.total():,} compras (H)"
+            serie = self.serie_global
+        else:
+            prob_empirica = self.deck.calcular_frequencia_empirica()
+            subtitulo = f"Esta sessão: {self.deck.total_comprado:,} compras"
+            if self.historico_global is not None:
+                subtitulo += " (H)"
+            serie = self.serie_sessao
+        subtitulo = subtitulo.replace(",", ".")
+
+        if self.grafico_convergencia:
+            if serie is self.serie_global:
+                self.atualizar_serie_global()
+            chave = (area.size, "convergencia", serie.versao, subtitulo)
+            if self.cache_painel is None or self.chave_cache_painel != chave:
+                self.cache_painel = self.renderizar_painel_convergencia(
+                    area.size, serie, subtitulo)
+                self.chave_cache_painel = chave
+            self.superficie.blit(self.cache_painel, area.topleft)
+            return
+
+        chave = (area.size, tuple(prob_empirica.values()), subtitulo)
+        if self.cache_painel is None or self.chave_cache_painel != chave:
+            self.cache_painel = self.renderizar_painel_estatisticas(
+                area.size, prob_empirica, subtitulo)
+            self.chave_cache_painel = chave
+        self.superficie.blit(self.cache_painel, area.topleft)
+
+    def atualizar_serie_sessao(self):
+        """Acrescenta à série de convergência da sessão as compras ainda não vistas"""
+        deck = self.deck
+        serie = self.serie_sessao
+        if deck.total_comprado < serie.n:  # Histórico do baralho apagado
+            serie.limpar()
+        if deck.total_comprado == serie.n:
+            return
+        inicio = serie.n - deck.compras_agregadas
+        if inicio < 0:
+            # As compras do meio já foram agregadas pelo baralho: pula até
+            # a compra individual mais antiga que ainda existe
+            serie.saltar([deck.contagem_agregada[tipo] for tipo in TIPOS])
+            inicio = 0
+        serie.adicionar_codigos(deck.historico_codigos[inicio:])
+
+    def atualizar_serie_global(self):
+        """Acrescenta à série de todas as sessões as compras gravadas no arquivo"""
+        historico = self.historico_global
+        serie = self.serie_global
+        if historico.total() == serie.n:
+            return
+        with historico.mapear_codigos(serie.n) as codigos:
+            serie.adicionar_codigos(codigos)
+        contagens = historico.contagens()
+        if sum(contagens.values()) > serie.n:
+            # Além do limite de códigos do arquivo só há os contadores
+            serie.saltar([contagens[tipo] for tipo in TIPOS])
+
+    def rect_painel_desempenho(self):
+        """Posição do painel de desempenho (canto superior direito)"""
+        return self.cache_painel_desempenho.get_rect(
+            topright=(LARGURA_VIRTUAL - 15, 15))
+
+    def desenhar_desempenho(self):
+        """Desenha o painel de desempenho, refazendo-o de tempos em tempos"""
+        quadros = self.medidor.quadros
+        if self.cache_painel_desempenho is None or \
+                quadros - self.quadro_painel_desempenho >= INTERVALO_PAINEL_DESEMPENHO:
+            self.cache_painel_desempenho = self.renderizar_painel_desempenho()
+            self.quadro_painel_desempenho = quadros
+            self.versao_painel_desempenho += 1
+        self.superficie.blit(self.cache_painel_desempenho,
+                             self.rect_painel_desempenho())
+
+    def renderizar_painel_desempenho(self):
+        """
+        Renderiza os percentis por fase e o gráfico do tempo de quadro
+
+        Os números mudam a cada atualização, então o texto é renderizado
+        direto pela fonte (sem passar pelo cache de textos).
+
+        Returns:
+            pygame.Surface: Painel semitransparente
+        """
+        fonte = textos.fonte(18)
+        resumo = self.medidor.resumo()
+        altura_linha = fonte.get_linesize()
+        altura_grafico = 70
+        largura = 355
+        margem = 10
+        superficie = pygame.Surface(
+            (largura, margem * 3 + altura_linha * (len(resumo) + 1) + altura_grafico),
+            pygame.SRCALPHA)
+        superficie.fill((0, 0, 0, 190))
+
+        # Tabela de percentis (ms)
+        y = margem
+        colunas = (margem, 175, 235, 295)
+        linhas = [("fase (ms)", "p50", "p95", "p99")]
+        linhas += [(nome, *(f"{valor:.2f}" for valor in valores))
+                   for nome, valores in resumo.items()]
+        for i, linha in enumerate(linhas):
+            cor = (255, 255, 100) if i == 0 or linha[0] == "quadro" else (220, 220, 220)
+            for x, texto in zip(colunas, linha):
+                superficie.blit(fonte.render(texto, True, cor), (x, y))
+            y += altura_linha
+
+        # Gráfico do tempo de quadro (uma coluna por quadro)
+        y += margem
+        area = pygame.Rect(margem, y, largura - 2 * margem, altura_grafico)
+        pygame.draw.rect(superficie, (40, 40, 40, 220), area)
+        orcamento = 1000 / FPS
+        tempos = self.medidor.totais.valores()[-area.width:]
+        escala = area.height / max([2 * orcamento] + tempos)
+        for x, tempo in enumerate(tempos):
+            altura = max(1, int(tempo * escala))
+            cor = (60, 210, 90) if tempo <= orcamento else (220, 60, 60)
+            pygame.draw.line(superficie, cor, (area.x + x, area.bottom - 1),
+                             (area.x + x, area.bottom - altura))
+        y_orcamento = area.bottom - int(orcamento * escala)
+        pygame.draw.line(superficie, (255, 255, 100),
+                         (area.x, y_orcamento), (area.right - 1, y_orcamento))
+        return superficie
+
+    def criar_fundo_painel(self, tamanho):
+        """Superfície opaca com o fundo arredondado e a borda do painel de estatísticas"""
+        # O painel é opaco: já inclui o fundo da tela sob o canto arredondado
+        superficie = pygame.Surface(tamanho)
+        superficie.fill(COR_FUNDO)
+        area = superficie.get_rect()
+
         # 1. Fundo do Painel (Estilo Profissional)
         painel_surf = pygame.Surface(
             (area.width, area.height), pygame.SRCALPHA)
-        cor_fundo_painel = (30, 35, 45, 240)  # Fundo escuro semi-transparente
-        pygame.draw.rect(painel_surf, cor_fundo_painel,
+        pygame.draw.rect(painel_surf, COR_FUNDO_PAINEL,
                          painel_surf.get_rect(), border_radius=15)
         pygame.draw.rect(painel_surf, (80, 90, 110),
                          painel_surf.get_rect(), 2, border_radius=15)  # Borda
-        self.superficie.blit(painel_surf, (area.x, area.y))
+        superficie.blit(painel_surf, (area.x, area.y))
+        return superficie
+
+    def desenhar_titulo_painel(self, superficie, titulo, subtitulo=None):
+        """Desenha o título (e o subtítulo, se houver) no topo do painel"""
+        area = superficie.get_rect()
+        texto_titulo = textos.renderizar(self.fonte_titulo, titulo, (220, 220, 220))
+        rect_titulo = texto_titulo.get_rect(center=(area.centerx, area.y + 30))
+        superficie.blit(texto_titulo, rect_titulo)
+        if subtitulo:
+            # O total muda a cada compra: fora do cache de textos
+            texto_subtitulo = self.fonte_legenda.render(subtitulo, True, (170, 170, 170))
+            superficie.blit(texto_subtitulo, texto_subtitulo.get_rect(
+                center=(area.centerx, rect_titulo.bottom + 10)))
+
+    def renderizar_painel_convergencia(self, tamanho, serie, subtitulo=None):
+        """
+        Renderiza a frequência acumulada de cada tipo em função do número de compras
+
+        O eixo x é logarítmico (de 1 compra até a próxima potência de 10). Em
+        volta de cada probabilidade teórica p, a faixa p ± 1/√n mostra o
+        quanto a frequência ainda pode oscilar com n compras. Cada coluna de
+        pixel mostra o mínimo e o máximo da frequência naquele trecho (faixa
+        clara) e o último valor (linha), ver SerieConvergencia.colunas_tela.
+
+        Args:
+            tamanho: (largura, altura) do painel
+            serie: SerieConvergencia a desenhar
+            subtitulo: Origem das frequências, abaixo do título (opcional)
+
+        Returns:
+            pygame.Surface: Painel pronto para ser copiado na tela
+        """
+        superficie = self.criar_fundo_painel(tamanho)
+        area = superficie.get_rect()
+        self.desenhar_titulo_painel(superficie, "Convergência", subtitulo)
+
+        # Margens: rótulos do eixo y à esquerda, das potências de 10 e legenda embaixo
+        grafico = pygame.Rect(area.x + 55, area.y + 75, area.width - 80, area.height - 75 - 80)
+        if grafico.width < 50 or grafico.height < 50:
+            return superficie
+
+        fonte = self.fonte_legenda
+        cor_eixo = (150, 150, 150)
+        n_maximo = 10 ** max(1, math.ceil(math.log10(max(serie.n, 1))))
+        escala_x = (grafico.width - 1) / math.log(n_maximo)
+
+        def y_tela(frequencia):
+            frequencia = min(1.0, max(0.0, frequencia))
+            return grafico.bottom - 1 - int(frequencia * (grafico.height - 1))
+
+        # Grade e rótulos do eixo y (porcentagem)
+        for porcentagem in range(0, 101, 25):
+            y = y_tela(porcentagem / 100)
+            pygame.draw.line(superficie, (55, 60, 75), (grafico.x, y), (grafico.right - 1, y))
+            rotulo = textos.renderizar(fonte, f"{porcentagem}%", (200, 200, 200))
+            superficie.blit(rotulo, rotulo.get_rect(midright=(grafico.x - 6, y)))
+
+        # Grade e rótulos do eixo x (potências de 10)
+        for expoente in range(0, round(math.log10(n_maximo)) + 1):
+            x = grafico.x + int(expoente * math.log(10) * escala_x)
+            pygame.draw.line(superficie, (55, 60, 75), (x, grafico.y), (x, grafico.bottom - 1))
+            nome = f"10^{expoente}" if expoente > 3 else str(10 ** expoente)
+            rotulo = textos.renderizar(fonte, nome, (200, 200, 200))
+            superficie.blit(rotulo, rotulo.get_rect(midtop=(x, grafico.bottom + 4)))
+
+        # Faixas p ± 1/√n em volta das probabilidades teóricas (translúcidas)
+        total_cartas = sum(CARTAS_INICIAIS.values())
+        faixas = pygame.Surface(grafico.size, pygame.SRCALPHA)
+        passo = 3
+        for tipo in TIPOS:
+            p = CARTAS_INICIAIS[tipo] / total_cartas
+            superior, inferior = [], []
+            for x in range(0, grafico.width + passo, passo):
+                x = min(x, grafico.width - 1)
+                margem = 1 / math.sqrt(math.exp(x / escala_x))
+                superior.append((x, y_tela(p + margem) - grafico.y))
+                inferior.append((x, y_tela(p - margem) - grafico.y))
+            pygame.draw.polygon(faixas, (*CORES_GRAFICO[tipo], 45), superior + inferior[::-1])
+        superficie.blit(faixas, grafico.topleft)
+
+        # Probabilidades teóricas (tracejadas)
+        for tipo in TIPOS:
+            y = y_tela(CARTAS_INICIAIS[tipo] / total_cartas)
+            for x in range(grafico.x, grafico.right, 12):
+                pygame.draw.line(superficie, (255, 255, 255), (x, y),
+                                 (min(x + 6, grafico.right - 1), y))
+
+        # Frequências empíricas: mínimo-máximo por coluna e o último valor
+        colunas = serie.colunas_tela(grafico.width, n_maximo)
+        for t, tipo in enumerate(TIPOS):
+            cor = CORES_GRAFICO[tipo]
+            cor_clara = tuple((c + 255) // 2 for c in cor)
+            pontos = []
+            for coluna, minimos, maximos, ultimos in colunas:
+                x = grafico.x + coluna
+                topo, base = y_tela(maximos[t]), y_tela(minimos[t])
+                if base - topo > 1:
+                    pygame.draw.line(superficie, cor_clara, (x, topo), (x, base))
+                pontos.append((x, y_tela(ultimos[t])))
+            if len(pontos) > 1:
+                pygame.draw.lines(superficie, cor, False, pontos, 2)
+
+        pygame.draw.line(superficie, cor_eixo, grafico.bottomleft, grafico.topleft, 2)
+        pygame.draw.line(superficie, cor_eixo, grafico.bottomleft,
+                         (grafico.right, grafico.bottom), 2)
+
+        # Legenda
+        x_legenda = area.x + 25
+        y_legenda = grafico.bottom + 30
+        for tipo in TIPOS:
+            pygame.draw.rect(superficie, CORES_GRAFICO[tipo],
+                             (x_legenda, y_legenda + 3, 14, 12), border_radius=2)
+            rotulo = textos.renderizar(fonte, tipo, (220, 220, 220))
+            superficie.blit(rotulo, (x_legenda + 20, y_legenda))
+            x_legenda += 20 + rotulo.get_width() + 15
+        rotulo = textos.renderizar(
+            fonte, "Faixas = Teórico ± 1/√n   |   Eixo x: compras (G: barras)",
+            (220, 220, 220))
+        superficie.blit(rotulo, (area.x + 25, y_legenda + 22))
+        return superficie
+
+    def renderizar_painel_estatisticas(self, tamanho, prob_empirica, subtitulo=None):
+        """
+        Renderiza o painel de estatísticas em uma nova superfície
+
+        Args:
+            tamanho: (largura, altura) do painel
+            prob_empirica: Frequência empírica (%) de cada tipo de carta
+            subtitulo: Origem das frequências, abaixo do título (opcional)
+
+        Returns:
+            pygame.Surface: Painel pronto para ser copiado na tela
+        """
+        superficie = self.criar_fundo_painel(tamanho)
+        area = superficie.get_rect()
 
         # Margens internas
         margin_x = 25
-        margin_top = 60
+        margin_top = 75 if subtitulo else 60
         margin_bottom = 90  # Aumentado para caber a legenda detalhada
 
         x_base = area.x + margin_x
@@ -606,16 +1204,13 @@ class JogoDuelo:
 
         # Check for minimum space requirements
         if largura_grafico < 50 or altura_grafico < 50:
-            texto_aviso = self.fonte_texto.render(
-                "Área muito pequena", True, (255, 100, 100))
-            self.superficie.blit(texto_aviso, (area.x + 10, area.y + 50))
-            return
+            texto_aviso = textos.renderizar(
+                self.fonte_texto, "Área muito pequena", (255, 100, 100))
+            superficie.blit(texto_aviso, (area.x + 10, area.y + 50))
+            return superficie
 
         # Título
-        texto_titulo = self.fonte_titulo.render(
-            "Probabilidades", True, (220, 220, 220))
-        rect_titulo = texto_titulo.get_rect(center=(area.centerx, area.y + 30))
-        self.superficie.blit(texto_titulo, rect_titulo)
+        self.desenhar_titulo_painel(superficie, "Probabilidades", subtitulo)
 
         # Eixos
         eixo_x_start = (x_base, y_base + altura_grafico)
@@ -623,32 +1218,27 @@ class JogoDuelo:
         eixo_y_start = (x_base, y_base)
         eixo_y_end = (x_base, y_base + altura_grafico)
 
-        pygame.draw.line(self.superficie, (150, 150, 150),
+        pygame.draw.line(superficie, (150, 150, 150),
                          eixo_x_start, eixo_x_end, 2)
-        pygame.draw.line(self.superficie, (150, 150, 150),
+        pygame.draw.line(superficie, (150, 150, 150),
                          eixo_y_start, eixo_y_end, 2)
 
         # Dados
         tipos = [Card.ATAQUE, Card.DEFESA, Card.CURA]
         prob_teorica = {Card.ATAQUE: 50, Card.DEFESA: 30, Card.CURA: 20}
-        prob_empirica = self.deck.calcular_frequencia_empirica()
 
-        cores_tipo = {
-            Card.ATAQUE: (220, 60, 60),
-            Card.DEFESA: (60, 130, 220),
-            Card.CURA: (60, 210, 90)
-        }
+        cores_tipo = CORES_GRAFICO
 
         num_tipos = len(tipos)
         if num_tipos == 0:
-            return
+            return superficie
 
         espaco_entre_grupos = 30
         largura_disponivel = largura_grafico - \
             (num_tipos + 1) * espaco_entre_grupos
 
         if largura_disponivel <= 0:
-            return
+            return superficie
 
         largura_grupo = largura_disponivel / num_tipos
         largura_barra = largura_grupo  # Barra ocupa largura do grupo
@@ -671,7 +1261,7 @@ class JogoDuelo:
 
             if rect_empirica.height > 0:
                 pygame.draw.rect(
-                    self.superficie, cores_tipo[tipo], rect_empirica, border_radius=4)
+                    superficie, cores_tipo[tipo], rect_empirica, border_radius=4)
 
             # --- Linha Tracejada (Teórica) ---
             altura_teorica = (prob_teorica[tipo] / max_valor) * altura_grafico
@@ -682,14 +1272,14 @@ class JogoDuelo:
             x_start = x_grupo - 5
             x_end = x_grupo + largura_barra + 5
             for x_dash in range(int(x_start), int(x_end), dash_len * 2):
-                pygame.draw.line(self.superficie, (255, 255, 255),
+                pygame.draw.line(superficie, (255, 255, 255),
                                  (x_dash, y_teorica),
                                  (min(x_dash + dash_len, x_end), y_teorica), 2)
 
             # --- Texto Empírico ---
             texto_str = f"{prob_empirica[tipo]:.1f}%"
-            texto_empirico = self.fonte_texto.render(
-                texto_str, True, (255, 255, 255))
+            texto_empirico = textos.renderizar(
+                self.fonte_texto, texto_str, (255, 255, 255))
 
             # Lógica para evitar sobreposição
             # Se a barra estiver muito alta (perto do topo), desenha o texto dentro da barra
@@ -698,119 +1288,424 @@ class JogoDuelo:
                 rect_txt_empirico = texto_empirico.get_rect(
                     midtop=(rect_empirica.centerx, rect_empirica.top + 5))
                 # Adiciona contorno preto para contraste
-                texto_outline = self.fonte_texto.render(
-                    texto_str, True, (0, 0, 0))
-                self.superficie.blit(
+                texto_outline = textos.renderizar(
+                    self.fonte_texto, texto_str, (0, 0, 0))
+                superficie.blit(
                     texto_outline, (rect_txt_empirico.x + 1, rect_txt_empirico.y + 1))
             else:
                 # Desenha acima
                 rect_txt_empirico = texto_empirico.get_rect(
                     midbottom=(rect_empirica.centerx, rect_empirica.top - 5))
 
-            self.superficie.blit(texto_empirico, rect_txt_empirico)
+            superficie.blit(texto_empirico, rect_txt_empirico)
 
             # Legenda do Eixo X (Tipo da Carta)
-            texto_tipo = self.fonte_texto.render(tipo, True, (200, 200, 200))
+            texto_tipo = textos.renderizar(self.fonte_texto, tipo, (200, 200, 200))
             rect_txt_tipo = texto_tipo.get_rect(
                 midtop=(rect_empirica.centerx, y_base + altura_grafico + 8))
-            self.superficie.blit(texto_tipo, rect_txt_tipo)
+            superficie.blit(texto_tipo, rect_txt_tipo)
 
         # --- Legenda Explicativa ---
         y_legenda_start = y_base + altura_grafico + 40
-        font_legenda = pygame.font.Font(None, 20)
+        font_legenda = self.fonte_legenda
 
         # Item 1: Linha Tracejada
-        pygame.draw.line(self.superficie, (255, 255, 255), (x_base,
+        pygame.draw.line(superficie, (255, 255, 255), (x_base,
                          y_legenda_start + 10), (x_base + 30, y_legenda_start + 10), 2)
         # Simular tracejado visualmente na legenda (apagando pedaços)
         pygame.draw.rect(
-            self.superficie, cor_fundo_painel[:3], (x_base + 10, y_legenda_start + 8, 10, 4))
+            superficie, COR_FUNDO_PAINEL[:3], (x_base + 10, y_legenda_start + 8, 10, 4))
 
-        lbl_teorica = font_legenda.render(
-            "Linha Tracejada = Probabilidade Teórica (Esperado)", True, (220, 220, 220))
-        self.superficie.blit(lbl_teorica, (x_base + 40, y_legenda_start))
+        lbl_teorica = textos.renderizar(
+            font_legenda, "Linha Tracejada = Probabilidade Teórica (Esperado)", (220, 220, 220))
+        superficie.blit(lbl_teorica, (x_base + 40, y_legenda_start))
 
         # Item 2: Barras Sólidas
         y_legenda_item2 = y_legenda_start + 20
-        pygame.draw.rect(self.superficie, (150, 150, 150),
+        pygame.draw.rect(superficie, (150, 150, 150),
                          (x_base, y_legenda_item2 + 2, 30, 12), border_radius=2)
-        lbl_empirica = font_legenda.render(
-            "Barras Sólidas = Realidade (Empírico)", True, (220, 220, 220))
-        self.superficie.blit(lbl_empirica, (x_base + 40, y_legenda_item2))
+        lbl_empirica = textos.renderizar(
+            font_legenda, "Barras Sólidas = Realidade (Empírico)", (220, 220, 220))
+        superficie.blit(lbl_empirica, (x_base + 40, y_legenda_item2))
+
+        return superficie
 
     def renderizar(self):
         """Renderiza tudo na tela"""
-        self.desenhar_interface()
+        medidor = self.medidor
+        with medidor.fase("interface"):
+            self.desenhar_interface()
 
         # Desenha os jogadores
-        self.ia.desenhar(self.superficie)
-        self.jogador.desenhar(self.superficie)
+        with medidor.fase("jogadores"):
+            self.ia.desenhar(self.superficie)
+            self.jogador.desenhar(self.superficie)
+
+        # Desenha as mãos dos jogadores: as duas em uma chamada de blits,
+        # com as faces recortadas do atlas
+        alfa = self.alfa_interpolacao
+        with medidor.fase("maos"):
+            self.superficie.blits(
+                self.ia.itens_mao(*POSICAO_MAO_IA, self.atlas, alfa=alfa)
+                + self.jogador.itens_mao(*POSICAO_MAO_JOGADOR, self.atlas, alfa=alfa),
+                doreturn=False)
+
+        with medidor.fase("efeitos"):
+            # Desenha cartas em animação (jogadas na mesa)
+            self.superficie.blits(
+                [item['carta'].item_desenho(self.atlas, alfa)
+                 for item in self.cartas_animando_descarte],
+                doreturn=False)
+
+            # Desenha textos flutuantes
+            for texto in self.textos_flutuantes:
+                texto.desenhar(self.superficie, self.fonte_titulo, alfa)
+
+            # Desenha partículas
+            self.particulas.desenhar(self.superficie, alfa)
+
+            # Flash de dano
+            if self.flash_dano_timer > 0:
+                overlay = pygame.Surface(
+                    (LARGURA_VIRTUAL, ALTURA_VIRTUAL), pygame.SRCALPHA)
+                alpha = int((self.flash_dano_timer / 10) * 100)  # Max alpha 100
+                overlay.fill((255, 0, 0, alpha))
+                self.superficie.blit(overlay, (0, 0))
+
+            if self.game_over:
+                self.desenhar_game_over()
+
+        if self.mostrar_desempenho:
+            with medidor.fase("painel_desempenho"):
+                self.desenhar_desempenho()
+
+        self.apresentar_quadro()
+
+    def registrar_elementos(self):
+        """
+        Lista os elementos da tela que podem mudar de um frame para o outro
 
-        # Desenha as mãos dos jogadores
-        # Ajustado Y para não cobrir informações (IA: 180, Jogador: 340)
-        self.ia.desenhar_mao(self.superficie, 150, 180, self.assets)
-        self.jogador.desenhar_mao(self.superficie, 150, 340, self.assets)
+        Returns:
+            dict: {chave: (Rect na resolução virtual, estado)}. Um elemento
+                  cujo estado mudou (ou que surgiu/sumiu) suja o seu retângulo.
+        """
+        elementos = {}
+        alfa = self.alfa_interpolacao
+
+        # Cartas (mãos e animações): posição, tipo e destaque
+        cartas = self.ia.mao + self.jogador.mao + \
+            [item['carta'] for item in self.cartas_animando_descarte]
+        for carta in cartas:
+            rect = carta.rect_interpolado(alfa)
+            elementos[('carta', id(carta))] = (
+                rect.copy(), (tuple(rect), carta.codigo, carta.destacada))
+
+        # Informações dos jogadores (avatar, nome, barra de vida e defesa)
+        for jogador in (self.ia, self.jogador):
+            elementos[('jogador', id(jogador))] = (
+                pygame.Rect(jogador.x, jogador.y, 250, 100),
+                (jogador.hp, jogador.defesa_ativa))
+
+        # Textos flutuantes
+        for texto in self.textos_flutuantes:
+            rect = textos.renderizar(
+                self.fonte_titulo, texto.texto, texto.cor).get_rect(
+                    topleft=texto.posicao(alfa))
+            elementos[('texto', id(texto))] = (
+                rect, (rect.topleft, texto.alpha, texto.vida > 0))
+
+        # Partículas: uma caixa envolvendo todas (mudam a cada frame)
+        rect = self.particulas.caixa_envolvente(alfa)
+        if rect is not None:
+            elementos['particulas'] = (rect, self.quadro)
+
+        # Linha da mensagem de feedback
+        area_jogo = pygame.Rect(10, 10, LARGURA_JOGO - 20, ALTURA_VIRTUAL - 20)
+        elementos['mensagem'] = (
+            pygame.Rect(area_jogo.x, area_jogo.y + 60, area_jogo.width,
+                        self.fonte_mensagem.get_linesize()),
+            (self.mensagem, self.cor_mensagem))
 
-        # Desenha cartas em animação (jogadas na mesa)
-        for item in self.cartas_animando_descarte:
-            carta = item['carta']
-            imagem = self.assets.get(carta.tipo)
-            carta.desenhar(self.superficie, imagem_sprite=imagem)
+        # Painel de estatísticas (a chave do cache muda junto com os dados)
+        area_stats = pygame.Rect(
+            LARGURA_JOGO + 10, 10, LARGURA_STATS - 20, ALTURA_VIRTUAL - 20)
+        elementos['estatisticas'] = (area_stats, self.chave_cache_painel)
 
-        # Desenha textos flutuantes
-        for texto in self.textos_flutuantes:
-            texto.desenhar(self.superficie, self.fonte_titulo)
+        # Painel de desempenho (refeito a cada INTERVALO_PAINEL_DESEMPENHO quadros)
+        if self.mostrar_desempenho and self.cache_painel_desempenho is not None:
+            elementos['desempenho'] = (
+                self.rect_painel_desempenho(), self.versao_painel_desempenho)
 
-        # Desenha partículas
-        for particula in self.particulas:
-            particula.desenhar(self.superficie)
+        # Tela de Game Over cobre tudo
+        elementos['game_over'] = (
+            self.superficie.get_rect(), (self.game_over, self.mensagem))
 
-        # Flash de dano
-        if self.flash_dano_timer > 0:
-            overlay = pygame.Surface(
-                (LARGURA_VIRTUAL, ALTURA_VIRTUAL), pygame.SRCALPHA)
-            alpha = int((self.flash_dano_timer / 10) * 100)  # Max alpha 100
-            overlay.fill((255, 0, 0, alpha))
-            self.superficie.blit(overlay, (0, 0))
+        return elementos
 
-        if self.game_over:
-            self.desenhar_game_over()
+    def apresentar_quadro(self):
+        """
+        Copia a superfície virtual para a janela
+
+        No modo parcial, só os retângulos sujos (elementos que mudaram desde o
+        frame anterior) são escalados e enviados com display.update. Shake e
+        flash mexem na tela inteira, então usam o caminho de quadro completo
+        (também usado no primeiro frame, após redimensionar a janela e nas
+        ampliações não inteiras, ver renderizacao_parcial_possivel).
+
+        Quando a escala parcial não é exata (ver escala_parcial_exata), o
+        primeiro frame sem mudanças depois de atualizações parciais é
+        completo, e o jogo só fica ocioso depois dele: a imagem parada não
+        guarda os pequenos desvios.
+        """
+        self.quadro += 1
+        elementos = self.registrar_elementos()
+        efeito_tela = self.shake_timer > 0 or self.flash_dano_timer > 0
+
+        grade = self.grade_renderizacao_parcial()
+        quadro_completo = (not self.renderizacao_parcial
+                           or self.forcar_quadro_completo
+                           or efeito_tela or self.efeito_tela_anterior
+                           or not self.renderizacao_parcial_possivel())
+
+        sujos = []
+        if not quadro_completo:
+            anteriores = self.elementos_anteriores
+            for chave in anteriores.keys() | elementos.keys():
+                antigo = anteriores.get(chave)
+                novo = elementos.get(chave)
+                if antigo is not None and novo is not None and antigo[1] == novo[1]:
+                    continue
+                for item in (antigo, novo):
+                    if item is not None:
+                        sujos.append(item[0])
+            quadro_completo = not sujos and self.desvio_parcial
+
+        self.elementos_anteriores = elementos
+        self.efeito_tela_anterior = efeito_tela
+        self.forcar_quadro_completo = False
+
+        if quadro_completo:
+            with self.medidor.fase("escala"):
+                # Escala a superfície virtual para o tamanho da janela
+                scaled_surface = self.escalar_superficie(
+                    self.superficie, self.tela.get_size())
+
+                # Aplica Screen Shake
+                offset_x = 0
+                offset_y = 0
+                if self.shake_timer > 0:
+                    offset_x = self.aleatorio.efeitos.randint(-5, 5)
+                    offset_y = self.aleatorio.efeitos.randint(-5, 5)
+
+                self.tela.blit(scaled_surface, (offset_x, offset_y))
+
+            with self.medidor.fase("apresentacao"):
+                pygame.display.flip()
+            self.desvio_parcial = False
+            return
 
-        # Escala a superfície virtual para o tamanho da janela
-        scaled_surface = pygame.transform.smoothscale(
-            self.superficie, self.tela.get_size())
+        if not sujos:
+            return  # Nada mudou: a janela já mostra este frame
 
-        # Aplica Screen Shake
-        offset_x = 0
-        offset_y = 0
-        if self.shake_timer > 0:
-            offset_x = random.randint(-5, 5)
-            offset_y = random.randint(-5, 5)
+        # Muitos retângulos pequenos custam mais que um grande
+        if len(sujos) > LIMITE_RETANGULOS_SUJOS:
+            sujos = [sujos[0].unionall(sujos[1:])]
+
+        with self.medidor.fase("escala"):
+            atualizados = self.copiar_retangulos(sujos, grade)
+        if atualizados:
+            with self.medidor.fase("apresentacao"):
+                pygame.display.update(atualizados)
+            if not self.escala_parcial_exata():
+                self.desvio_parcial = True
+
+    def copiar_retangulos(self, sujos, grade):
+        """
+        Escala os retângulos sujos da superfície virtual para a janela
+
+        Args:
+            sujos: Retângulos na resolução virtual
+            grade: (gx, gy) de grade_renderizacao_parcial
+
+        Returns:
+            list: Retângulos da janela que foram atualizados
+        """
+        area_virtual = self.superficie.get_rect()
+        grade_x, grade_y = grade
+        largura_janela, altura_janela = self.tela.get_size()
+        mesma_escala = (largura_janela, altura_janela) == area_virtual.size
+        ampliacao_inteira = self.ampliacao_inteira()
+        # Nas reduções não exatas, o filtro espalha cada pixel virtual por
+        # até um pixel da janela: o destino cresce essa folga
+        folga_x = folga_y = 0
+        if not self.escala_parcial_exata():
+            folga_x = -(-largura_janela // LARGURA_VIRTUAL)
+            folga_y = -(-altura_janela // ALTURA_VIRTUAL)
+        atualizados = []
+        for rect in sujos:
+            # Alinha à grade da escala (arredondando para fora)
+            esquerda = rect.left // grade_x * grade_x
+            topo = rect.top // grade_y * grade_y
+            direita = -(-rect.right // grade_x) * grade_x
+            base = -(-rect.bottom // grade_y) * grade_y
+            rect = pygame.Rect(esquerda, topo, direita - esquerda,
+                               base - topo).clip(area_virtual)
+            destino = self.converter_rect_tela(rect)
+            if destino.width <= 0 or destino.height <= 0:
+                continue
+
+            if mesma_escala:
+                self.tela.blit(self.superficie, destino, rect)
+            elif ampliacao_inteira:
+                # Blocos exatos: o recorte não depende dos vizinhos
+                self.tela.blit(pygame.transform.scale(
+                    self.superficie.subsurface(rect), destino.size), destino)
+            else:
+                # Escala o recorte com uma margem e usa só o miolo, para o
+                # filtro nas bordas enxergar os mesmos vizinhos do quadro inteiro
+                externo = rect.inflate(
+                    4 * grade_x, 4 * grade_y).clip(area_virtual)
+                destino_externo = self.converter_rect_tela(externo)
+                destino = destino.inflate(2 * folga_x, 2 * folga_y).clip(destino_externo)
+                escalado = pygame.transform.smoothscale(
+                    self.superficie.subsurface(externo), destino_externo.size)
+                self.tela.blit(escalado, destino,
+                               destino.move(-destino_externo.x, -destino_externo.y))
+            atualizados.append(destino)
+
+        return atualizados
+
+    def esta_ocioso(self):
+        """
+        Verifica se nada está animando (o último frame continua válido)
+
+        Returns:
+            bool: True se não há cartas em movimento, partículas, textos
+                  flutuantes, shake, flash nem passo da IA já vencido
+        """
+        if self.cartas_animando_descarte or self.modo_turbo:
+            return False
+        if self.quadro == 0:
+            return False  # Nenhum quadro apresentado: a janela ainda está vazia
+        if not self.carregador_sprites.entregue:
+            return False  # Ainda falta aplicar os sprites
+        if self.desvio_parcial:
+            return False  # Falta o quadro completo que corrige a escala parcial
+        if self.prazo_ia_vencido():
+            return False  # O passo agendado da IA precisa rodar em atualizar
+        for jogador in (self.jogador, self.ia):
+            for carta in jogador.mao:
+                visual = carta.visual
+                if visual.x != visual.target_x or visual.y != visual.target_y or \
+                        visual.anterior_x != visual.x or visual.anterior_y != visual.y:
+                    return False
+        if self.game_over:
+            return True  # Os efeitos ficam congelados na tela de Game Over
+        return not (self.particulas or self.textos_flutuantes
+                    or self.shake_timer > 0 or self.flash_dano_timer > 0)
+
+    def aguardar_eventos(self):
+        """
+        Dorme até chegar um evento ou até o próximo passo agendado da IA
 
-        self.tela.blit(scaled_surface, (offset_x, offset_y))
+        Returns:
+            list: Eventos recebidos (vazia se acordou pelo prazo da IA)
+        """
+        if self.aguardando_ia:
+            restante = self.tempo_espera_ia - pygame.time.get_ticks()
+            if restante <= 0:
+                return pygame.event.get()
+            evento = pygame.event.wait(restante)
+        else:
+            evento = pygame.event.wait()
 
-        pygame.display.flip()
+        if evento.type == pygame.NOEVENT:
+            return []
+        return [evento] + pygame.event.get()
 
     def executar(self):
         """Loop principal do jogo"""
         logging.info("🎮 Jogo iniciado! Pressione ESC para sair.")
 
+        medidor = self.medidor
+        acumulado = 0.0  # Tempo real (ms) ainda não simulado pela lógica
         while self.rodando:
-            self.processar_eventos()
-            self.atualizar()
-            self.renderizar()
-            self.relogio.tick(FPS)
+            medidor.iniciar_quadro()
+            self.verificar_sprites()
+            with medidor.fase("eventos"):
+                # Sem animações pendentes, bloqueia em vez de girar a 60 FPS
+                if self.esta_ocioso():
+                    with medidor.fase("ocioso"):
+                        eventos = self.aguardar_eventos()
+                    # O tempo bloqueado não é simulado: sem isso, o quadro
+                    # seguinte recuperaria MAX_PASSOS_POR_QUADRO passos de uma vez.
+                    # Se acordou pelo prazo da IA, um passo roda neste quadro
+                    # (o passo da IA só acontece em atualizar)
+                    self.relogio.tick()
+                    acumulado = PASSO_LOGICA_MS if self.prazo_ia_vencido() else 0.0
+                    self.processar_eventos(eventos)
+                else:
+                    self.processar_eventos()
+            # Lógica em passos fixos: um display lento pula quadros em vez de
+            # deixar o jogo mais lento, e um FPS maior não o acelera
+            if self.modo_turbo:
+                # O tempo de cada quadro é todo das partidas simuladas
+                with medidor.fase("turbo"):
+                    self.avancar_turbo()
+                with medidor.fase("renderizar"):
+                    self.renderizar()
+                self.relogio.tick()
+                acumulado = 0.0
+                medidor.finalizar_quadro()
+                continue
+
+            with medidor.fase("atualizar"):
+                passos = 0
+                while acumulado >= PASSO_LOGICA_MS and passos < MAX_PASSOS_POR_QUADRO:
+                    self.atualizar()
+                    acumulado -= PASSO_LOGICA_MS
+                    passos += 1
+                if passos == MAX_PASSOS_POR_QUADRO:
+                    acumulado = min(acumulado, PASSO_LOGICA_MS)
+                self.alfa_interpolacao = acumulado / PASSO_LOGICA_MS
+            with medidor.fase("renderizar"):
+                self.renderizar()
+            if self.quadro == 1:
+                logging.info(f"Primeiro quadro em "
+                             f"{(time.perf_counter() - self.instante_inicio) * 1000:.0f} ms")
+            with medidor.fase("espera"):
+                acumulado += self.relogio.tick(FPS)
+            medidor.finalizar_quadro()
 
         self.encerrar()
 
     def encerrar(self):
         """Encerra o jogo corretamente"""
         logging.info("👋 Encerrando o jogo...")
+        logging.info(f"Cache de textos: {textos.cache_textos}")
+        self.captura_perfil.encerrar()
+        if self.modo_turbo:
+            self.gravar_bloco_turbo()
+        self.partida.encerrar()
+        if self.gravador is not None:
+            self.gravador.fechar()
+        if self.historico_global is not None:
+            self.historico_global.fechar()
+        if self.exportar_desempenho and self.medidor.quadros:
+            quadros = self.medidor.exportar_csv(ARQUIVO_DESEMPENHO)
+            logging.info(f"Tempos de {quadros} quadros exportados para {ARQUIVO_DESEMPENHO}")
         pygame.quit()
         sys.exit()
 
 
-# Ponto de entrada do programa
-if __name__ == "__main__":
+def main():
+    """Configura o logging e executa o jogo"""
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
     jogo = JogoDuelo()
     jogo.executar()
+
+
+# Ponto de entrada do programa
+if __name__ == "__main__":
+    main()
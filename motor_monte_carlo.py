@@ -0,0 +1,140 @@
+"""
+Motor vetorizado (NumPy) para a simulação de Monte Carlo do baralho.
+
+Cada embaralhamento é uma linha de uma matriz de inteiros, onde cada carta
+é representada pelo índice do seu tipo em regras.TIPOS. Milhões de
+embaralhamentos são gerados e analisados de uma vez, em lotes de tamanho
+limitado para manter o uso de memória sob controle: porcentagem de cada tipo
+e contagens por posição, por par de vizinhas e nas primeiras compras.
+"""
+
+import numpy as np
+from estatisticas import AnaliseVies, EstatisticaOnline
+from regras import TIPOS, CARTAS_INICIAIS
+
+# Embaralhamentos por lote (1 milhão x 20 cartas int8 = 20 MB)
+TAMANHO_LOTE = 1_000_000
+
+
+def baralho_codificado(cartas_iniciais=None):
+    """
+    Cria o baralho como vetor de códigos de tipo (0=Ataque, 1=Defesa, 2=Cura)
+
+    Returns:
+        np.ndarray: Vetor int8 com uma posição por carta, na ordem de regras.TIPOS
+    """
+    cartas_iniciais = cartas_iniciais or CARTAS_INICIAIS
+    quantidades = [cartas_iniciais[tipo] for tipo in TIPOS]
+    return np.repeat(np.arange(len(TIPOS), dtype=np.int8), quantidades)
+
+
+def gerar_embaralhamentos(num_embaralhamentos, rng, baralho=None):
+    """
+    Gera vários embaralhamentos independentes do baralho
+
+    Args:
+        num_embaralhamentos: Quantidade de linhas da matriz
+        rng: np.random.Generator usado para as permutações
+        baralho: Vetor de códigos (padrão: baralho_codificado())
+
+    Returns:
+        np.ndarray: Matriz (num_embaralhamentos, cartas) com um embaralhamento por linha
+    """
+    baralho = baralho_codificado() if baralho is None else baralho
+    matriz = np.broadcast_to(baralho, (num_embaralhamentos, baralho.size))
+    return rng.permuted(matriz, axis=1)
+
+
+def contar_por_tipo(matriz, num_compras=None):
+    """
+    Conta as cartas de cada tipo nas primeiras `num_compras` posições de cada linha
+
+    Returns:
+        np.ndarray: Matriz (linhas, tipos) com as contagens
+    """
+    if num_compras is not None:
+        matriz = matriz[:, :num_compras]
+    return np.stack([(matriz == codigo).sum(axis=1)
+                     for codigo in range(len(TIPOS))], axis=1)
+
+
+def adicionar_lote(estimador, valores):
+    """
+    Incorpora um vetor de observações a um EstatisticaOnline de uma só vez
+
+    Args:
+        estimador: EstatisticaOnline que recebe as observações
+        valores: np.ndarray unidimensional de observações
+    """
+    if valores.size == 0:
+        return
+    lote = EstatisticaOnline(estimador.limite_inferior, estimador.limite_superior,
+                             len(estimador.histograma))
+    lote.n = int(valores.size)
+    lote.media = float(valores.mean())
+    lote.m2 = float(((valores - lote.media) ** 2).sum())
+    lote.minimo = float(valores.min())
+    lote.maximo = float(valores.max())
+
+    faixas = ((valores - lote.limite_inferior) / lote.largura_faixa).astype(np.int64)
+    faixas = np.clip(faixas, 0, len(lote.histograma) - 1)
+    lote.histograma = np.bincount(faixas, minlength=len(lote.histograma)).tolist()
+
+    estimador.combinar(lote)
+
+
+def adicionar_lote_vies(analise, matriz):
+    """
+    Incorpora uma matriz de embaralhamentos a um AnaliseVies de uma só vez
+
+    Args:
+        analise: AnaliseVies do mesmo baralho
+        matriz: Matriz (linhas, cartas) de códigos de tipo
+    """
+    num_tipos = analise.num_tipos
+    lote = AnaliseVies(analise.quantidades, tuple(analise.primeiras))
+    lote.n = matriz.shape[0]
+
+    # Posição x tipo
+    por_posicao = np.stack([(matriz == codigo).sum(axis=0)
+                            for codigo in range(num_tipos)], axis=1)
+    lote.posicao = por_posicao.tolist()
+
+    # Pares de cartas vizinhas, codificados como anterior * tipos + seguinte
+    pares = matriz[:, :-1].astype(np.int64) * num_tipos + matriz[:, 1:]
+    lote.adjacencia = np.bincount(pares.ravel(), minlength=num_tipos ** 2) \
+        .reshape(num_tipos, num_tipos).tolist()
+
+    # Distribuição de cada tipo nas k primeiras compras
+    for k in lote.primeiras:
+        contagens = contar_por_tipo(matriz, k)
+        lote.primeiras[k] = [np.bincount(contagens[:, codigo], minlength=k + 1).tolist()
+                             for codigo in range(num_tipos)]
+
+    analise.combinar(lote)
+
+
+def analisar_embaralhamentos(num_simulacoes, rng=None, tamanho_lote=TAMANHO_LOTE):
+    """
+    Gera embaralhamentos lote a lote e acumula as estatísticas de cada um
+
+    Returns:
+        tuple: (estimadores, analise) com um EstatisticaOnline da porcentagem de
+               cada tipo (ordem de regras.TIPOS) e o AnaliseVies das posições
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    baralho = baralho_codificado()
+    estimadores = [EstatisticaOnline() for _ in TIPOS]
+    analise = AnaliseVies([CARTAS_INICIAIS[tipo] for tipo in TIPOS])
+
+    restantes = num_simulacoes
+    while restantes > 0:
+        lote = min(restantes, tamanho_lote)
+        matriz = gerar_embaralhamentos(lote, rng, baralho)
+        porcentagens = contar_por_tipo(matriz) * (100.0 / matriz.shape[1])
+        for i, estimador in enumerate(estimadores):
+            adicionar_lote(estimador, porcentagens[:, i])
+        adicionar_lote_vies(analise, matriz)
+        restantes -= lote
+
+    return estimadores, analise
@@ -0,0 +1,218 @@
+"""
+Sistema de partículas em estrutura de vetores (struct of arrays).
+
+Posição, velocidade, vida, tamanho e cor de todas as partículas ficam em
+vetores contíguos do NumPy: cada passo atualiza tudo em uma operação
+vetorizada, remove as partículas mortas de uma vez (compactando os vetores)
+e desenha tudo em uma única chamada Surface.blits. Sem NumPy, os mesmos
+vetores são listas do Python e o comportamento é idêntico, só mais lento.
+"""
+
+import random
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # NumPy não instalado: usa listas do Python
+    np = None
+
+# Capacidade inicial dos vetores (dobra quando enche)
+CAPACIDADE_INICIAL = 256
+
+# Campos guardados para cada partícula
+CAMPOS = ("x", "y", "vx", "vy", "vida", "tamanho", "cor")
+
+
+class SistemaParticulas:
+    """
+    Conjunto de partículas de efeito (explosões de dano)
+
+    Cada partícula se move em linha reta, vive de 20 a 40 passos de lógica
+    e encolhe 0.1 pixel por passo, desenhada como um quadrado da sua cor.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_INICIAL, rng=None):
+        """
+        Args:
+            capacidade: Quantidade inicial de partículas sem realocar
+            rng: Gerador aleatório (np.random.Generator, ou random.Random
+                 quando o NumPy não está instalado)
+        """
+        self.n = 0
+        self.cores = []  # Paleta: o vetor "cor" guarda índices aqui
+        self._indices_cor = {}
+        self._quadrados = {}  # (índice da cor, lado) -> Surface
+        if np is not None:
+            self.rng = rng if rng is not None else np.random.default_rng()
+            self._alocar(capacidade)
+        else:
+            self.rng = rng if rng is not None else random.Random()
+            for campo in CAMPOS:
+                setattr(self, campo, [])
+
+    def _alocar(self, capacidade):
+        """Cria (ou aumenta) os vetores NumPy, preservando as partículas vivas"""
+        tipos = {"vida": np.int16, "cor": np.int16}
+        for campo in CAMPOS:
+            novo = np.zeros(capacidade, dtype=tipos.get(campo, np.float32))
+            antigo = getattr(self, campo, None)
+            if antigo is not None:
+                novo[:self.n] = antigo[:self.n]
+            setattr(self, campo, novo)
+        self.capacidade = capacidade
+
+    def __len__(self):
+        return self.n
+
+    def indice_cor(self, cor):
+        """Retorna o índice da cor na paleta, acrescentando-a se for nova"""
+        cor = tuple(cor)
+        indice = self._indices_cor.get(cor)
+        if indice is None:
+            indice = len(self.cores)
+            self.cores.append(cor)
+            self._indices_cor[cor] = indice
+        return indice
+
+    def emitir(self, x, y, cor, quantidade=15):
+        """
+        Cria uma explosão de partículas saindo de (x, y)
+
+        Args:
+            x: Posição X de origem
+            y: Posição Y de origem
+            cor: Cor RGB das partículas
+            quantidade: Número de partículas
+        """
+        cor = self.indice_cor(cor)
+        if np is None:
+            rng = self.rng
+            for _ in range(quantidade):
+                self.x.append(float(x))
+                self.y.append(float(y))
+                self.vx.append(rng.uniform(-5, 5))
+                self.vy.append(rng.uniform(-5, 5))
+                self.vida.append(rng.randint(20, 40))
+                self.tamanho.append(float(rng.randint(3, 6)))
+                self.cor.append(cor)
+            self.n += quantidade
+            return
+
+        inicio, fim = self.n, self.n + quantidade
+        if fim > self.capacidade:
+            self._alocar(max(fim, 2 * self.capacidade))
+        rng = self.rng
+        self.x[inicio:fim] = x
+        self.y[inicio:fim] = y
+        self.vx[inicio:fim] = rng.uniform(-5, 5, quantidade)
+        self.vy[inicio:fim] = rng.uniform(-5, 5, quantidade)
+        self.vida[inicio:fim] = rng.integers(20, 41, quantidade)
+        self.tamanho[inicio:fim] = rng.integers(3, 7, quantidade)
+        self.cor[inicio:fim] = cor
+        self.n = fim
+
+    def atualizar(self):
+        """Move, envelhece e encolhe todas as partículas; remove as mortas"""
+        n = self.n
+        if n == 0:
+            return
+
+        if np is None:
+            self.x = [x + vx for x, vx in zip(self.x, self.vx)]
+            self.y = [y + vy for y, vy in zip(self.y, self.vy)]
+            self.vida = [vida - 1 for vida in self.vida]
+            self.tamanho = [max(0, tamanho - 0.1) for tamanho in self.tamanho]
+            if min(self.vida) <= 0:
+                vivas = [i for i, vida in enumerate(self.vida) if vida > 0]
+                for campo in CAMPOS:
+                    valores = getattr(self, campo)
+                    setattr(self, campo, [valores[i] for i in vivas])
+                self.n = len(vivas)
+            return
+
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vida[:n] -= 1
+        tamanho = self.tamanho[:n]
+        np.maximum(tamanho - np.float32(0.1), 0, out=tamanho)
+
+        # Compactação em bloco: as vivas vão para o início dos vetores
+        vivas = self.vida[:n] > 0
+        if not vivas.all():
+            restantes = int(np.count_nonzero(vivas))
+            for campo in CAMPOS:
+                vetor = getattr(self, campo)
+                vetor[:restantes] = vetor[:n][vivas]
+            self.n = restantes
+
+    def limpar(self):
+        """Remove todas as partículas"""
+        if np is None:
+            for campo in CAMPOS:
+                setattr(self, campo, [])
+        self.n = 0
+
+    def _quadrado(self, cor, lado):
+        """Superfície de um quadrado sólido (uma por cor e tamanho)"""
+        chave = (cor, lado)
+        quadrado = self._quadrados.get(chave)
+        if quadrado is None:
+            quadrado = pygame.Surface((lado, lado))
+            quadrado.fill(self.cores[cor])
+            self._quadrados[chave] = quadrado
+        return quadrado
+
+    def _coordenadas(self, alfa=1.0):
+        """
+        Listas (x, y, lado, cor) inteiras das partículas vivas, para desenho
+
+        Args:
+            alfa: Fração do passo de lógica decorrida; a posição é recuada
+                  (1 - alfa) passos ao longo da velocidade
+        """
+        n = self.n
+        recuo = 1.0 - alfa
+        if np is None:
+            return ([int(x - vx * recuo) for x, vx in zip(self.x, self.vx)],
+                    [int(y - vy * recuo) for y, vy in zip(self.y, self.vy)],
+                    [int(t) for t in self.tamanho], self.cor)
+        xs, ys = self.x[:n], self.y[:n]
+        if recuo:
+            xs = xs - self.vx[:n] * np.float32(recuo)
+            ys = ys - self.vy[:n] * np.float32(recuo)
+        return (xs.astype(np.int32).tolist(),
+                ys.astype(np.int32).tolist(),
+                self.tamanho[:n].astype(np.int32).tolist(),
+                self.cor[:n].tolist())
+
+    def desenhar(self, superficie, alfa=1.0):
+        """Desenha todas as partículas com uma única chamada a blits"""
+        if self.n == 0:
+            return
+        quadrado = self._quadrado
+        superficie.blits(
+            [(quadrado(cor, lado), (x, y))
+             for x, y, lado, cor in zip(*self._coordenadas(alfa)) if lado > 0],
+            doreturn=False)
+
+    def caixa_envolvente(self, alfa=1.0):
+        """
+        Retorna o retângulo que contém todas as partículas
+
+        Returns:
+            pygame.Rect ou None se não houver partículas
+        """
+        if self.n == 0:
+            return None
+        xs, ys, lados, _ = self._coordenadas(alfa)
+        esquerda, topo = min(xs), min(ys)
+        lado = max(lados) + 1
+        return pygame.Rect(esquerda, topo, max(xs) - esquerda + lado,
+                           max(ys) - topo + lado)
+
+    def __str__(self):
+        motor = "numpy" if np is not None else "python"
+        return f"SistemaParticulas({self.n} partículas, {motor})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,237 @@
+"""
+Carregamento dos sprites em segundo plano, com cache em disco já redimensionado.
+
+Decodificar os PNGs e redimensioná-los é a parte mais cara do carregamento.
+A primeira vez que um sprite é carregado, seus pixels já no tamanho final
+(RGBA) são gravados em DIRETORIO_CACHE, com nome formado pela data de
+modificação e pelo tamanho do arquivo de origem e pelo tamanho final.
+Nas execuções seguintes basta ler esses bytes, sem decodificar nem
+redimensionar. Trocar o PNG ou o tamanho gera uma nova entrada
+automaticamente, e as entradas antigas do mesmo sprite são apagadas.
+
+A leitura e a decodificação rodam em uma thread; só a conversão para o
+formato da tela (convert_alpha), que exige a janela, fica na thread principal.
+
+AtlasSprites junta as imagens desenhadas a cada quadro (faces das cartas e
+avatares) em uma única superfície. Cada imagem vira um recorte (superfície
+do atlas + área), e uma camada inteira vai para a tela em uma chamada de
+Surface.blits, em vez de um blit por carta.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+import pygame
+from regras import ATAQUE, DEFESA, CURA
+
+DIRETORIO_ASSETS = "assets"
+DIRETORIO_CACHE = os.path.join(DIRETORIO_ASSETS, ".cache")
+
+# Sprite -> (arquivo em DIRETORIO_ASSETS, tamanho final); o tamanho None é
+# o das cartas (Card.LARGURA x Card.ALTURA), passado a CarregadorSprites
+SPRITES = {
+    ATAQUE: ("carta_ataque.png", None),
+    DEFESA: ("carta_defesa.png", None),
+    CURA: ("carta_cura.png", None),
+    "avatar_ia": ("avatar_ia.png", (100, 100)),
+    "avatar_player": ("avatar_player.png", (100, 100)),
+}
+
+# Largura máxima do atlas; as imagens são arrumadas em prateleiras
+LARGURA_ATLAS = 1024
+
+# Imagem dentro de um atlas: a superfície do atlas e a área (Rect) da imagem
+RecorteAtlas = namedtuple("RecorteAtlas", ["superficie", "area"])
+
+
+def nome_cache(caminho, tamanho):
+    """
+    Nome do arquivo de cache de um sprite
+
+    Muda quando o arquivo de origem (data de modificação ou tamanho) ou o
+    tamanho final mudam.
+    """
+    estado = os.stat(caminho)
+    base = os.path.splitext(os.path.basename(caminho))[0]
+    return f"{base}_{estado.st_mtime_ns}_{estado.st_size}_{tamanho[0]}x{tamanho[1]}.rgba"
+
+
+def carregar_pixels(caminho, tamanho, diretorio_cache=DIRETORIO_CACHE):
+    """
+    Pixels RGBA de um sprite já redimensionado (do cache ou do PNG)
+
+    Não depende da janela, então pode rodar fora da thread principal.
+
+    Returns:
+        tuple: (bytes RGBA, True se veio do cache)
+    """
+    nome = nome_cache(caminho, tamanho)
+    arquivo_cache = os.path.join(diretorio_cache, nome)
+    try:
+        with open(arquivo_cache, "rb") as arquivo:
+            pixels = arquivo.read()
+        if len(pixels) == tamanho[0] * tamanho[1] * 4:
+            return pixels, True
+    except OSError:
+        pass
+
+    imagem = pygame.transform.scale(pygame.image.load(caminho), tamanho)
+    pixels = pygame.image.tobytes(imagem, "RGBA")
+    try:
+        os.makedirs(diretorio_cache, exist_ok=True)
+        # Remove versões antigas do mesmo sprite
+        prefixo = os.path.splitext(os.path.basename(caminho))[0] + "_"
+        for antigo in os.listdir(diretorio_cache):
+            if antigo.startswith(prefixo) and antigo != nome:
+                os.remove(os.path.join(diretorio_cache, antigo))
+        # Grava em um temporário e renomeia: outro processo nunca lê pela metade
+        temporario = f"{arquivo_cache}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(pixels)
+        os.replace(temporario, arquivo_cache)
+    except OSError as e:
+        logging.warning(f"Cache de sprites indisponível: {e}")
+    return pixels, False
+
+
+class CarregadorSprites:
+    """Carrega os sprites de SPRITES em uma thread"""
+
+    def __init__(self, tamanho_carta, diretorio=DIRETORIO_ASSETS, diretorio_cache=DIRETORIO_CACHE):
+        """
+        Args:
+            tamanho_carta: Tamanho final dos sprites de carta (largura, altura)
+            diretorio: Pasta dos PNGs
+            diretorio_cache: Pasta do cache de pixels redimensionados
+        """
+        self.tamanho_carta = tamanho_carta
+        self.diretorio = diretorio
+        self.diretorio_cache = diretorio_cache
+        self.pixels = {}  # nome -> (bytes, tamanho) ou None se falhou
+        self.acertos_cache = 0
+        self.duracao = None  # Segundos gastos pela thread
+        self.entregue = False
+        self._thread = None
+
+    def iniciar(self):
+        """Começa o carregamento em segundo plano"""
+        self._thread = threading.Thread(target=self._carregar, name="carregador-sprites",
+                                        daemon=True)
+        self._thread.start()
+
+    def _carregar(self):
+        inicio = time.perf_counter()
+        for nome, (arquivo, tamanho) in SPRITES.items():
+            tamanho = tamanho or self.tamanho_carta
+            caminho = os.path.join(self.diretorio, arquivo)
+            try:
+                pixels, do_cache = carregar_pixels(caminho, tamanho, self.diretorio_cache)
+                self.pixels[nome] = (pixels, tamanho)
+                self.acertos_cache += do_cache
+            except Exception as e:
+                logging.warning(f"Falha ao carregar sprite {arquivo}: {e}")
+                self.pixels[nome] = None
+        self.duracao = time.perf_counter() - inicio
+
+    def pronto(self):
+        return self._thread is not None and not self._thread.is_alive()
+
+    def aguardar(self, tempo_limite=None):
+        """
+        Espera o fim do carregamento
+
+        Args:
+            tempo_limite: Segundos máximos de espera (None: sem limite)
+
+        Returns:
+            bool: True se terminou
+        """
+        if self._thread is not None:
+            self._thread.join(tempo_limite)
+        return self.pronto()
+
+    def superficies(self):
+        """
+        Converte os pixels carregados em superfícies da tela (thread principal)
+
+        Returns:
+            dict: {nome: Surface ou None}, com os nomes de SPRITES
+        """
+        self.entregue = True
+        sprites = {}
+        for nome in SPRITES:
+            item = self.pixels.get(nome)
+            if item is None:
+                sprites[nome] = None
+                continue
+            pixels, tamanho = item
+            sprites[nome] = pygame.image.frombytes(pixels, tamanho, "RGBA").convert_alpha()
+        logging.info(f"Sprites carregados em {self.duracao * 1000:.1f} ms "
+                     f"({self.acertos_cache}/{len(SPRITES)} do cache)")
+        return sprites
+
+
+def item_blit(imagem, destino):
+    """
+    Tupla para Surface.blits
+
+    Args:
+        imagem: Surface ou RecorteAtlas
+        destino: Posição ou Rect na tela
+    """
+    if isinstance(imagem, RecorteAtlas):
+        return imagem.superficie, destino, imagem.area
+    return imagem, destino
+
+
+class AtlasSprites:
+    """Várias imagens em uma única superfície, acessadas por recortes"""
+
+    def __init__(self, imagens, largura_maxima=LARGURA_ATLAS):
+        """
+        Monta o atlas (as imagens são copiadas; as originais não são usadas depois)
+
+        Args:
+            imagens: Dicionário {chave: Surface}; valores None são ignorados
+            largura_maxima: Largura máxima do atlas em pixels
+        """
+        imagens = {chave: imagem for chave, imagem in imagens.items() if imagem is not None}
+
+        # Prateleiras: as imagens mais altas primeiro, da esquerda para a
+        # direita, começando uma nova linha quando a largura acaba
+        self.areas = {}
+        x = y = altura_linha = largura = 0
+        for chave, imagem in sorted(imagens.items(), key=lambda item: -item[1].get_height()):
+            w, h = imagem.get_size()
+            if x > 0 and x + w > largura_maxima:
+                x, y, altura_linha = 0, y + altura_linha, 0
+            self.areas[chave] = pygame.Rect(x, y, w, h)
+            x += w
+            altura_linha = max(altura_linha, h)
+            largura = max(largura, x)
+
+        superficie = pygame.Surface((max(largura, 1), max(y + altura_linha, 1)), pygame.SRCALPHA)
+        for chave, area in self.areas.items():
+            # O fundo é transparente (0, 0, 0, 0): com BLEND_RGBA_MAX a cópia
+            # é exata, sem misturar a transparência da imagem com o fundo
+            superficie.blit(imagens[chave], area, special_flags=pygame.BLEND_RGBA_MAX)
+        if pygame.display.get_surface() is not None:
+            superficie = superficie.convert_alpha()
+        self.superficie = superficie
+
+    def __contains__(self, chave):
+        return chave in self.areas
+
+    def recorte(self, chave):
+        """RecorteAtlas da imagem `chave`, ou None se ela não estiver no atlas"""
+        area = self.areas.get(chave)
+        return RecorteAtlas(self.superficie, area) if area is not None else None
+
+    def __str__(self):
+        largura, altura = self.superficie.get_size()
+        return f"AtlasSprites({len(self.areas)} imagens, {largura}x{altura})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,654 @@
+"""
+Núcleo de regras do jogo, independente do Pygame.
+
+Contém o estado da partida (baralho, jogadores, turnos), a compra, a jogada,
+a resolução de efeitos e a verificação de vitória. A interface gráfica
+(main.py, Player, Deck, Card) é construída por cima deste módulo, e as
+simulações podem usá-lo diretamente sem inicializar o SDL.
+"""
+
+import logging
+import random
+from array import array
+from aleatorio import EMBARALHAR, IA, obter_fluxo
+
+# Tipos de carta
+ATAQUE = "Ataque"
+DEFESA = "Defesa"
+CURA = "Cura"
+
+TIPOS = (ATAQUE, DEFESA, CURA)
+
+# Código inteiro de cada tipo (índice em TIPOS)
+CODIGOS = {tipo: codigo for codigo, tipo in enumerate(TIPOS)}
+
+# Valor do efeito de cada tipo de carta
+VALORES = {
+    ATAQUE: 5,
+    DEFESA: 5,
+    CURA: 3
+}
+
+# Composição do baralho (20 cartas)
+CARTAS_INICIAIS = {
+    ATAQUE: 10,
+    DEFESA: 6,
+    CURA: 4
+}
+
+# Regras dos jogadores
+HP_MAXIMO = 20
+TAMANHO_MAO = 4
+MAX_DEFESA = 10
+CARTAS_MAO_INICIAL = 3
+
+# Máximo de compras guardadas individualmente no histórico (1 byte cada).
+# Acima disso as mais antigas são agregadas nos contadores por tipo.
+LIMITE_HISTORICO = 1_000_000
+
+
+class Baralho:
+    """
+    Monte de compra, descarte e histórico de compras, sem dependência gráfica.
+
+    Por padrão as cartas são representadas pelo próprio tipo (str).
+    Subclasses podem sobrescrever `_criar_carta` e `_tipo_da_carta` para
+    usar objetos de carta (ver baralho.Deck).
+
+    A quantidade de cartas de cada tipo no monte, no descarte e no histórico
+    é mantida incrementalmente, então as consultas de contagem, probabilidade
+    e frequência são O(1). Por isso `cartas` e `descarte` só devem ser
+    alterados pelos métodos da classe.
+    """
+
+    def __init__(self, rng=None, limite_historico=LIMITE_HISTORICO):
+        """
+        Inicializa o baralho com 20 cartas
+
+        Args:
+            rng: Gerador aleatório com o método shuffle, ou FonteAleatoria
+                 (usa o fluxo de embaralhamento); padrão: módulo random
+            limite_historico: Máximo de compras guardadas individualmente
+                              (None = sem limite)
+        """
+        self.rng = obter_fluxo(rng, EMBARALHAR) if rng is not None else random
+        self.limite_historico = limite_historico
+        self.gravador = None  # Gravador de replay (ver replay.GravadorReplay)
+        # Histórico entre sessões (ver historico_persistente.HistoricoPersistente)
+        self.persistente = None
+        self.cartas = []
+        self.cartas_iniciais = dict(CARTAS_INICIAIS)
+        self.criar_baralho()
+
+    def _criar_carta(self, tipo):
+        """Cria a representação de uma carta do tipo dado"""
+        return tipo
+
+    def _tipo_da_carta(self, carta):
+        """Retorna o tipo de uma carta criada por `_criar_carta`"""
+        return carta
+
+    def criar_baralho(self, manter_historico=False):
+        """
+        Cria o baralho completo com todas as cartas
+
+        O topo do monte de compra é o fim da lista `cartas`, para que comprar
+        (list.pop()) seja O(1) mesmo em baralhos com milhões de cartas.
+
+        Args:
+            manter_historico: Preserva o histórico de compras (e as
+                              frequências empíricas) de partidas anteriores
+        """
+        self.cartas = []
+        self.descarte = []
+
+        if not manter_historico:
+            # Histórico compacto: um código de tipo (regras.CODIGOS) por compra
+            self.historico_codigos = array("b")
+            self.total_comprado = 0
+            self.compras_agregadas = 0  # Compras antigas que só restam nos contadores
+            self.contagem_agregada = {tipo: 0 for tipo in TIPOS}
+            self.contagem_historico = {tipo: 0 for tipo in TIPOS}
+
+        # Contagens por tipo mantidas a cada compra, descarte e reciclagem
+        self.contagem_monte = {tipo: 0 for tipo in TIPOS}
+        self.contagem_descarte = {tipo: 0 for tipo in TIPOS}
+
+        for tipo in TIPOS:
+            for _ in range(self.cartas_iniciais[tipo]):
+                self.cartas.append(self._criar_carta(tipo))
+            self.contagem_monte[tipo] += self.cartas_iniciais[tipo]
+
+        # Embaralha o baralho
+        self.embaralhar()
+
+    def embaralhar(self):
+        """Embaralha as cartas do baralho"""
+        self.rng.shuffle(self.cartas)
+
+    def comprar_carta(self):
+        """
+        Remove e retorna a carta do topo do baralho (fim da lista), em O(1).
+        Se o baralho estiver vazio, recicla o descarte.
+
+        Returns:
+            A carta comprada, ou None se o baralho e descarte estiverem vazios
+        """
+        if len(self.cartas) == 0:
+            if len(self.descarte) > 0:
+                # debug: no modo turbo isso acontece centenas de vezes por segundo
+                logging.debug(
+                    f"Baralho vazio! Embaralhando descarte com {len(self.descarte)} cartas...")
+                # Troca as listas em vez de copiar: o monte vazio vira o novo descarte
+                self.cartas, self.descarte = self.descarte, self.cartas
+                self.contagem_monte, self.contagem_descarte = \
+                    self.contagem_descarte, self.contagem_monte
+                self.embaralhar()
+                if self.gravador is not None:
+                    self.gravador.reembaralhamento(self)
+            else:
+                return None
+
+        if len(self.cartas) > 0:
+            carta = self.cartas.pop()
+            tipo = self._tipo_da_carta(carta)
+            self.contagem_monte[tipo] -= 1
+            self.registrar_compra(tipo)
+            return carta
+        return None
+
+    def restaurar(self, monte, descarte=()):
+        """
+        Substitui o monte e o descarte por cartas novas dos tipos dados
+
+        Usado pelo replay para reconstruir um estado gravado. O histórico de
+        compras não é alterado.
+
+        Args:
+            monte: Tipos das cartas do monte, do fundo ao topo
+            descarte: Tipos das cartas do descarte
+        """
+        self.cartas = [self._criar_carta(tipo) for tipo in monte]
+        self.descarte = [self._criar_carta(tipo) for tipo in descarte]
+        self.contagem_monte = {tipo: 0 for tipo in TIPOS}
+        self.contagem_descarte = {tipo: 0 for tipo in TIPOS}
+        for tipo in monte:
+            self.contagem_monte[tipo] += 1
+        for tipo in descarte:
+            self.contagem_descarte[tipo] += 1
+
+    def codigos(self, cartas):
+        """Códigos de tipo (regras.CODIGOS) de uma lista de cartas deste baralho"""
+        return [CODIGOS[self._tipo_da_carta(carta)] for carta in cartas]
+
+    def registrar_compra(self, tipo):
+        """Registra a compra de uma carta do tipo dado no histórico"""
+        codigo = CODIGOS[tipo]
+        self.historico_codigos.append(codigo)
+        if self.persistente is not None:
+            self.persistente.registrar(codigo)
+        self.contagem_historico[tipo] += 1
+        self.total_comprado += 1
+
+        if self.limite_historico is not None and \
+                len(self.historico_codigos) > self.limite_historico:
+            self.agregar_historico(len(self.historico_codigos) - self.limite_historico // 2)
+
+    def agregar_historico(self, quantidade):
+        """
+        Remove as `quantidade` compras mais antigas do histórico individual.
+
+        Elas continuam contadas em contagem_historico (e em contagem_agregada),
+        então as frequências empíricas não mudam. Remover metade do limite de
+        uma vez mantém o custo amortizado de cada compra em O(1).
+        """
+        antigas = self.historico_codigos[:quantidade]
+        for tipo in TIPOS:
+            self.contagem_agregada[tipo] += antigas.count(CODIGOS[tipo])
+        del self.historico_codigos[:quantidade]
+        self.compras_agregadas += len(antigas)
+
+    @property
+    def historico_cartas(self):
+        """Tipos das compras ainda guardadas individualmente, da mais antiga à mais recente"""
+        return [TIPOS[codigo] for codigo in self.historico_codigos]
+
+    def visao_historico(self):
+        """
+        Visão sem cópia (memoryview de int8) dos códigos do histórico individual.
+
+        Pode ser lida com numpy.frombuffer(visao, dtype=numpy.int8). Enquanto a
+        visão existir o histórico não pode crescer, então ela deve ser liberada
+        (visao.release() ou bloco `with`) antes da próxima compra.
+        """
+        return memoryview(self.historico_codigos)
+
+    def adicionar_ao_descarte(self, carta):
+        """Adiciona uma carta usada ao monte de descarte"""
+        if carta:
+            self.descarte.append(carta)
+            self.contagem_descarte[self._tipo_da_carta(carta)] += 1
+
+    def cartas_restantes(self):
+        """
+        Retorna a quantidade de cartas restantes no baralho
+
+        Returns:
+            int: Número de cartas no baralho
+        """
+        return len(self.cartas)
+
+    def contar_por_tipo(self):
+        """
+        Conta quantas cartas de cada tipo ainda restam no baralho
+
+        Returns:
+            dict: Dicionário com a contagem de cada tipo
+                  Ex: {'Ataque': 5, 'Defesa': 3, 'Cura': 2}
+        """
+        return dict(self.contagem_monte)
+
+    def calcular_probabilidades(self):
+        """
+        Calcula a probabilidade de comprar cada tipo de carta
+
+        Returns:
+            dict: Dicionário com as probabilidades em percentual
+                  Ex: {'Ataque': 50.0, 'Defesa': 30.0, 'Cura': 20.0}
+        """
+        total = self.cartas_restantes()
+
+        if total == 0:
+            return {tipo: 0.0 for tipo in TIPOS}
+
+        probabilidades = {}
+
+        for tipo, quantidade in self.contagem_monte.items():
+            # Calcula a probabilidade como percentual
+            probabilidades[tipo] = (quantidade / total) * 100
+
+        return probabilidades
+
+    def calcular_frequencia_empirica(self):
+        """
+        Calcula a frequência empírica de cada tipo de carta baseada no histórico
+
+        Returns:
+            dict: Dicionário com as frequências em percentual
+        """
+        total_comprado = self.total_comprado
+
+        if total_comprado == 0:
+            return {tipo: 0.0 for tipo in TIPOS}
+
+        frequencias = {}
+        for tipo, quantidade in self.contagem_historico.items():
+            frequencias[tipo] = (quantidade / total_comprado) * 100
+
+        return frequencias
+
+    def esta_vazio(self):
+        """
+        Verifica se o baralho está vazio
+
+        Returns:
+            bool: True se vazio, False caso contrário
+        """
+        return len(self.cartas) == 0
+
+    def resetar(self, manter_historico=False):
+        """
+        Recria e embaralha o baralho do zero
+
+        Args:
+            manter_historico: Preserva o histórico de compras (ver criar_baralho)
+        """
+        self.criar_baralho(manter_historico)
+
+    def __str__(self):
+        """Representação em string do baralho"""
+        contagem = self.contar_por_tipo()
+        return f"Deck({self.cartas_restantes()} cartas: {contagem})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class EstadoJogador:
+    """Estado de um jogador (vida, mão e defesa), sem dependência gráfica"""
+
+    HP_MAXIMO = HP_MAXIMO
+    TAMANHO_MAO = TAMANHO_MAO
+    MAX_DEFESA = MAX_DEFESA
+
+    def __init__(self, nome, rng=None):
+        """
+        Inicializa o estado do jogador
+
+        Args:
+            nome: Nome do jogador (ex: "Jogador", "IA")
+            rng: Gerador da política da IA para este jogador, ou
+                 FonteAleatoria (usa o fluxo da IA); ver escolher_jogada_ia
+        """
+        self.nome = nome
+        self.rng = obter_fluxo(rng, IA)
+        self.hp = self.HP_MAXIMO
+        self.mao = []  # Lista de cartas na mão
+        self.defesa_ativa = 0  # Pontos de defesa acumulados
+
+    def adicionar_carta(self, carta):
+        """
+        Adiciona uma carta à mão do jogador
+
+        Args:
+            carta: Carta a ser adicionada
+
+        Returns:
+            bool: True se conseguiu adicionar, False se a mão está cheia
+        """
+        if len(self.mao) < self.TAMANHO_MAO:
+            self.mao.append(carta)
+            return True
+        return False
+
+    def comprar_carta(self, deck):
+        """
+        Compra uma carta do baralho e adiciona à mão
+
+        Args:
+            deck: Baralho de onde comprar a carta
+
+        Returns:
+            bool: True se conseguiu comprar, False se a mão está cheia ou deck vazio
+        """
+        if len(self.mao) >= self.TAMANHO_MAO:
+            return False
+
+        carta = deck.comprar_carta()
+        if carta is not None:
+            self.mao.append(carta)
+            return True
+        return False
+
+    def jogar_carta(self, indice):
+        """
+        Joga (remove) uma carta da mão pelo índice (0 a 3)
+
+        Args:
+            indice: Índice da carta na mão (0 a 3)
+
+        Returns:
+            A carta jogada, ou None se índice inválido
+        """
+        if 0 <= indice < len(self.mao):
+            return self.mao.pop(indice)
+        return None
+
+    def receber_dano(self, dano):
+        """
+        Recebe dano, considerando a defesa ativa
+
+        Args:
+            dano: Quantidade de dano a receber
+
+        Returns:
+            int: Dano real recebido (após defesa)
+        """
+        if self.defesa_ativa > 0:
+            # A defesa bloqueia o dano
+            dano_bloqueado = min(dano, self.defesa_ativa)
+            self.defesa_ativa -= dano_bloqueado
+            dano -= dano_bloqueado
+
+        # Aplica o dano restante
+        self.hp -= dano
+        if self.hp < 0:
+            self.hp = 0
+
+        return dano
+
+    def curar(self, quantidade):
+        """
+        Cura o jogador
+
+        Args:
+            quantidade: Quantidade de HP a recuperar
+
+        Returns:
+            int: HP real curado (limitado ao máximo)
+        """
+        hp_antes = self.hp
+        self.hp += quantidade
+        if self.hp > self.HP_MAXIMO:
+            self.hp = self.HP_MAXIMO
+
+        return self.hp - hp_antes
+
+    def adicionar_defesa(self, quantidade):
+        """
+        Adiciona pontos de defesa
+
+        Args:
+            quantidade: Quantidade de defesa a adicionar
+        """
+        self.defesa_ativa += quantidade
+        if self.defesa_ativa > self.MAX_DEFESA:
+            self.defesa_ativa = self.MAX_DEFESA
+
+    def resetar_defesa(self):
+        """Remove toda a defesa ativa (usado no início do turno)"""
+        self.defesa_ativa = 0
+
+    def esta_vivo(self):
+        """
+        Verifica se o jogador ainda está vivo
+
+        Returns:
+            bool: True se HP > 0, False caso contrário
+        """
+        return self.hp > 0
+
+    def __str__(self):
+        """Representação em string do jogador"""
+        return f"Player({self.nome}, HP:{self.hp}, Cartas:{len(self.mao)})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def resolver_efeito(tipo, jogador_ativo, oponente):
+    """
+    Aplica o efeito de uma carta e retorna o valor efetivo
+
+    Args:
+        tipo: Tipo da carta jogada
+        jogador_ativo: Jogador que jogou a carta
+        oponente: Jogador adversário
+
+    Returns:
+        int: Dano real (ATAQUE), defesa adicionada (DEFESA) ou HP curado (CURA)
+    """
+    if tipo == ATAQUE:
+        return oponente.receber_dano(VALORES[ATAQUE])
+    elif tipo == DEFESA:
+        jogador_ativo.adicionar_defesa(VALORES[DEFESA])
+        return VALORES[DEFESA]
+    elif tipo == CURA:
+        return jogador_ativo.curar(VALORES[CURA])
+    return 0
+
+
+def escolher_jogada_ia(jogador, rng=None):
+    """
+    Política da IA: escolhe uma carta aleatória da mão
+
+    Args:
+        jogador: Jogador que vai jogar
+        rng: Gerador a usar (padrão: o do jogador ou, se ele não tiver, o módulo random)
+
+    Returns:
+        int ou None: Índice da carta escolhida, ou None se a mão está vazia
+    """
+    if len(jogador.mao) == 0:
+        return None
+    if rng is None:
+        rng = jogador.rng if jogador.rng is not None else random
+    return rng.randint(0, len(jogador.mao) - 1)
+
+
+class Partida:
+    """
+    Estado completo de um duelo: baralho, dois jogadores e turno atual.
+
+    A interface gráfica usa os passos individuais (comprar, jogar, resolver);
+    `simular` executa uma partida inteira IA contra IA sem animações.
+
+    Com um gravador (replay.GravadorReplay), a ordem inicial do baralho e
+    cada compra, jogada, reembaralhamento e troca de turno são gravados.
+    """
+
+    def __init__(self, baralho=None, jogadores=None, rng=None, gravador=None, semente=None):
+        """
+        Inicializa a partida e distribui as cartas iniciais
+
+        Args:
+            baralho: Baralho a usar (padrão: novo Baralho com o mesmo rng)
+            jogadores: Par (primeiro, segundo); padrão: dois EstadoJogador
+            rng: Gerador aleatório usado pela política da IA, ou
+                 FonteAleatoria (fluxo da IA; o baralho padrão usa o fluxo
+                 de embaralhamento). Padrão: o gerador de cada jogador
+            gravador: Gravador de replay (opcional)
+            semente: Semente que gerou `rng`, guardada no replay
+        """
+        self.rng = obter_fluxo(rng, IA)
+        self.baralho = baralho if baralho is not None else Baralho(rng)
+        if jogadores is None:
+            jogadores = (EstadoJogador("VOCÊ"), EstadoJogador("IA"))
+        self.jogadores = list(jogadores)
+        self.indice_turno = 0
+        self.turnos = 0
+        self.gravador = gravador
+        self.baralho.gravador = gravador
+        if gravador is not None:
+            gravador.iniciar_partida(self, semente)
+        self.distribuir_cartas_iniciais()
+
+    def distribuir_cartas_iniciais(self):
+        """Distribui as cartas iniciais, alternando entre os jogadores"""
+        for _ in range(CARTAS_MAO_INICIAL):
+            for jogador in self.jogadores:
+                jogador.comprar_carta(self.baralho)
+
+    @property
+    def jogador_ativo(self):
+        return self.jogadores[self.indice_turno]
+
+    @property
+    def oponente(self):
+        return self.jogadores[1 - self.indice_turno]
+
+    def comprar(self, jogador=None):
+        """Compra uma carta para o jogador (padrão: jogador ativo)"""
+        jogador = jogador if jogador is not None else self.jogador_ativo
+        comprou = jogador.comprar_carta(self.baralho)
+        if comprou and self.gravador is not None:
+            self.gravador.compra(self, jogador, jogador.mao[-1])
+        return comprou
+
+    def jogar(self, indice, jogador=None):
+        """Remove da mão a carta no índice dado e a retorna"""
+        jogador = jogador if jogador is not None else self.jogador_ativo
+        carta = jogador.jogar_carta(indice)
+        if carta is not None and self.gravador is not None:
+            self.gravador.jogada(self, jogador, indice, carta)
+        return carta
+
+    def resolver(self, carta, jogador_ativo, oponente):
+        """
+        Aplica o efeito de uma carta jogada e a envia ao descarte
+
+        Returns:
+            int: Valor efetivo do efeito (ver resolver_efeito)
+        """
+        tipo = self.baralho._tipo_da_carta(carta)
+        valor = resolver_efeito(tipo, jogador_ativo, oponente)
+        self.baralho.adicionar_ao_descarte(carta)
+        return valor
+
+    def passar_turno(self):
+        """Passa o turno para o outro jogador"""
+        self.indice_turno = 1 - self.indice_turno
+        self.turnos += 1
+        if self.gravador is not None:
+            self.gravador.passar_turno(self)
+
+    def encerrar(self):
+        """Registra o fim da partida no gravador (se houver) e o desliga"""
+        if self.gravador is not None:
+            self.gravador.fim_partida(self)
+            self.gravador = None
+            self.baralho.gravador = None
+
+    def vencedor(self):
+        """
+        Verifica se a partida terminou
+
+        Returns:
+            Jogador vencedor, ou None se ambos ainda estão vivos
+        """
+        primeiro, segundo = self.jogadores
+        if not primeiro.esta_vivo():
+            return segundo
+        if not segundo.esta_vivo():
+            return primeiro
+        return None
+
+    def executar_turno_ia(self):
+        """Executa um turno completo do jogador ativo usando a política da IA"""
+        ativo = self.jogador_ativo
+        oponente = self.oponente
+        self.comprar(ativo)
+        indice = escolher_jogada_ia(ativo, self.rng)
+        if indice is not None:
+            carta = self.jogar(indice, ativo)
+            self.resolver(carta, ativo, oponente)
+        self.passar_turno()
+
+    def simular(self, max_turnos=10000):
+        """
+        Joga a partida até o fim com os dois lados controlados pela IA
+
+        Args:
+            max_turnos: Limite de segurança de turnos
+
+        Returns:
+            int ou None: Índice do vencedor (0 ou 1), ou None se o limite foi atingido
+        """
+        resultado = None
+        while self.turnos < max_turnos:
+            self.executar_turno_ia()
+            vencedor = self.vencedor()
+            if vencedor is not None:
+                resultado = self.jogadores.index(vencedor)
+                break
+        self.encerrar()
+        return resultado
+
+
+def simular_partidas(num_partidas, rng=None):
+    """
+    Simula várias partidas IA contra IA sem interface gráfica
+
+    Args:
+        num_partidas: Quantidade de partidas
+        rng: Gerador aleatório ou FonteAleatoria (padrão: módulo random)
+
+    Returns:
+        list: Vitórias de cada jogador [primeiro, segundo, empates]
+    """
+    rng = rng if rng is not None else random
+    resultados = [0, 0, 0]
+    for _ in range(num_partidas):
+        vencedor = Partida(rng=rng).simular()
+        resultados[vencedor if vencedor is not None else 2] += 1
+    return resultados
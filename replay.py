@@ -0,0 +1,705 @@
+"""
+Replay determinístico e compacto das partidas.
+
+Cada partida é gravada como uma sequência de registros binários: a semente,
+a ordem inicial do baralho, cada compra, cada jogada, cada reembaralhamento
+do descarte (com a nova ordem) e cada troca de turno. A cada
+TURNOS_ENTRE_ESTADOS turnos é gravado também o estado completo, para que o
+reprodutor salte para o turno N sem refazer a partida desde o início.
+
+As partidas do modo turbo são determinadas pela semente da sessão e pelo
+índice da partida (derivar_semente), então são gravadas apenas em blocos de
+resumo (placar e compras por tipo) e recriadas sob demanda.
+
+As partidas vão para NOME_ARQUIVO na pasta de dados do usuário (a mesma do
+histórico de compras). Quando o arquivo passa de LIMITE_BYTES, ele é
+renomeado para <arquivo>.1 (substituindo o anterior) no início da próxima
+partida, e a gravação continua em um arquivo novo.
+
+Formato: cabeçalho MAGIA + versão, seguido dos registros. O primeiro byte
+de cada registro traz a operação nos 3 bits altos; compras e jogadas cabem
+inteiras nesse byte (jogador, índice na mão e código do tipo). Inteiros
+maiores usam varint (LEB128) e listas de cartas usam 2 bits por carta.
+
+Uso (sem o arquivo, usa o da pasta de dados do usuário):
+    python replay.py                                     # resumo do arquivo
+    python replay.py partidas.replay --verificar         # refaz tudo sem janela
+    python replay.py partidas.replay --partida 0 --turno 20
+    python replay.py partidas.replay --partida 0 --visual
+    python replay.py partidas.replay --turbo 12345 --visual
+"""
+
+import argparse
+import io
+import logging
+import os
+import time
+from collections import namedtuple
+from aleatorio import FonteAleatoria, derivar_semente
+from historico_persistente import diretorio_dados
+from regras import TIPOS, CODIGOS, HP_MAXIMO, Baralho, EstadoJogador, Partida
+
+MAGIA = b"DUELOREP"
+VERSAO = 2
+
+# Operações (3 bits altos do primeiro byte de cada registro)
+OP_COMPRA = 0
+OP_JOGADA = 1
+OP_TURNO = 2
+OP_REEMBARALHAR = 3
+OP_PARTIDA = 4
+OP_FIM = 5
+OP_ESTADO = 6
+OP_TURBO = 7
+
+# Turnos entre dois estados completos gravados (pontos de salto)
+TURNOS_ENTRE_ESTADOS = 10
+
+NOME_ARQUIVO = "partidas.replay"
+
+# Tamanho a partir do qual o arquivo é renomeado para <arquivo>.1
+LIMITE_BYTES = 32 * 1024 * 1024
+
+# Código de fim de partida sem vencedor (interrompida ou limite de turnos)
+SEM_VENCEDOR = 2
+
+# Resumo de um bloco de partidas do modo turbo
+BlocoTurbo = namedtuple("BlocoTurbo", ["semente", "primeira", "quantidade", "placar", "compras"])
+
+# Estado completo gravado a cada TURNOS_ENTRE_ESTADOS turnos
+EstadoGravado = namedtuple("EstadoGravado", [
+    "turnos", "indice_evento", "indice_turno", "jogadores", "monte", "descarte"])
+
+
+class ErroReplay(ValueError):
+    """Arquivo de replay inválido ou reprodução divergente da gravação"""
+
+
+def caminho_padrao():
+    """Arquivo de replay do usuário (na pasta de historico_persistente.diretorio_dados)"""
+    return os.path.join(diretorio_dados(), NOME_ARQUIVO)
+
+
+def escrever_varint(buffer, valor):
+    """Acrescenta um inteiro não negativo em LEB128 (7 bits por byte)"""
+    while valor >= 0x80:
+        buffer.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    buffer.append(valor)
+
+
+def ler_varint(dados, pos):
+    """
+    Lê um inteiro LEB128
+
+    Returns:
+        tuple: (valor, posição após o inteiro)
+    """
+    valor = deslocamento = 0
+    while True:
+        if pos >= len(dados):
+            raise ErroReplay("Registro truncado")
+        byte = dados[pos]
+        pos += 1
+        valor |= (byte & 0x7F) << deslocamento
+        if byte < 0x80:
+            return valor, pos
+        deslocamento += 7
+
+
+def empacotar_codigos(buffer, codigos):
+    """Acrescenta uma lista de códigos de tipo (2 bits cada, 4 por byte)"""
+    escrever_varint(buffer, len(codigos))
+    for inicio in range(0, len(codigos), 4):
+        byte = 0
+        for i, codigo in enumerate(codigos[inicio:inicio + 4]):
+            byte |= codigo << (2 * i)
+        buffer.append(byte)
+
+
+def desempacotar_codigos(dados, pos):
+    """
+    Lê uma lista gravada por empacotar_codigos
+
+    Returns:
+        tuple: (lista de códigos, posição após a lista)
+    """
+    quantidade, pos = ler_varint(dados, pos)
+    num_bytes = (quantidade + 3) // 4
+    if pos + num_bytes > len(dados):
+        raise ErroReplay("Registro truncado")
+    codigos = [(dados[pos + i // 4] >> (2 * (i % 4))) & 0b11 for i in range(quantidade)]
+    return codigos, pos + num_bytes
+
+
+class GravadorReplay:
+    """
+    Grava partidas no formato de replay
+
+    Os registros são acumulados em memória e escritos no fim de cada partida
+    (ou em descarregar()), então uma queda perde no máximo a partida atual.
+    """
+
+    def __init__(self, arquivo, turnos_entre_estados=TURNOS_ENTRE_ESTADOS,
+                 limite_bytes=LIMITE_BYTES):
+        """
+        Args:
+            arquivo: Caminho (os registros são acrescentados ao fim; a pasta
+                     é criada se preciso) ou objeto binário com write(). Um
+                     arquivo existente com cabeçalho de outra versão (ou que
+                     não é replay) é renomeado, e a gravação começa em um
+                     arquivo novo
+            turnos_entre_estados: Turnos entre dois estados completos
+            limite_bytes: Tamanho a partir do qual um caminho é renomeado
+                          para <arquivo>.1 (ver _abrir)
+
+        Raises:
+            OSError: Se o arquivo não puder ser criado ou aberto
+        """
+        self.turnos_entre_estados = turnos_entre_estados
+        self.limite_bytes = limite_bytes
+        self.buffer = bytearray()
+        if isinstance(arquivo, (str, os.PathLike)):
+            self.caminho = arquivo
+            pasta = os.path.dirname(arquivo)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            if os.path.exists(arquivo) and os.path.getsize(arquivo) > 0 \
+                    and not self._cabecalho_compativel(arquivo):
+                self._renomear_incompativel(arquivo)
+            self.proprio = True
+            self._abrir()
+        else:
+            self.caminho = None
+            self.arquivo = arquivo
+            self.proprio = False
+            self.escritos = arquivo.tell()
+            if self.escritos == 0:
+                self.buffer += MAGIA + bytes([VERSAO])
+
+    def _abrir(self):
+        """
+        Abre self.caminho para acrescentar registros
+
+        Um arquivo com limite_bytes ou mais vai para <caminho>.1 (substituindo
+        o anterior), e a gravação começa em um arquivo novo.
+        """
+        tamanho = os.path.getsize(self.caminho) if os.path.exists(self.caminho) else 0
+        if tamanho >= self.limite_bytes:
+            os.replace(self.caminho, f"{self.caminho}.1")
+            logging.info(f"{self.caminho} passou de {self.limite_bytes} bytes; "
+                         f"movido para {self.caminho}.1")
+            tamanho = 0
+        self.arquivo = open(self.caminho, "ab")
+        self.escritos = tamanho
+        if tamanho == 0:
+            self.buffer += MAGIA + bytes([VERSAO])
+
+    @staticmethod
+    def _cabecalho_compativel(caminho):
+        """Verifica se o arquivo começa com MAGIA e a VERSAO atual"""
+        with open(caminho, "rb") as arquivo:
+            cabecalho = arquivo.read(len(MAGIA) + 1)
+        return cabecalho == MAGIA + bytes([VERSAO])
+
+    @staticmethod
+    def _renomear_incompativel(caminho):
+        """Move um arquivo incompatível para <caminho>.v<versão> (ou .invalido)"""
+        with open(caminho, "rb") as arquivo:
+            cabecalho = arquivo.read(len(MAGIA) + 1)
+        if cabecalho[:len(MAGIA)] == MAGIA and len(cabecalho) > len(MAGIA):
+            sufixo = f"v{cabecalho[len(MAGIA)]}"
+        else:
+            sufixo = "invalido"
+        destino = f"{caminho}.{sufixo}"
+        numero = 1
+        while os.path.exists(destino):
+            numero += 1
+            destino = f"{caminho}.{sufixo}.{numero}"
+        os.replace(caminho, destino)
+        logging.warning(f"{caminho} tem um formato de replay incompatível; "
+                        f"movido para {destino}")
+
+    def _registro(self, operacao, dados=0):
+        self.buffer.append(operacao << 5 | dados)
+
+    def _indice(self, partida, jogador):
+        return 0 if partida.jogadores[0] is jogador else 1
+
+    def iniciar_partida(self, partida, semente=None):
+        """Grava a semente e a ordem do monte e do descarte no início da partida"""
+        # Troca de arquivo só entre partidas: cada arquivo tem partidas inteiras
+        if self.proprio and self.escritos + len(self.buffer) >= self.limite_bytes:
+            self.descarregar()
+            self.arquivo.close()
+            self._abrir()
+        baralho = partida.baralho
+        self._registro(OP_PARTIDA, 1 if semente is not None else 0)
+        escrever_varint(self.buffer, semente or 0)
+        empacotar_codigos(self.buffer, baralho.codigos(baralho.cartas))
+        empacotar_codigos(self.buffer, baralho.codigos(baralho.descarte))
+
+    def compra(self, partida, jogador, carta):
+        """Grava a compra de uma carta (1 byte)"""
+        codigo = CODIGOS[partida.baralho._tipo_da_carta(carta)]
+        self._registro(OP_COMPRA, self._indice(partida, jogador) << 4 | codigo)
+
+    def jogada(self, partida, jogador, indice, carta):
+        """Grava a jogada da carta `indice` da mão (1 byte)"""
+        codigo = CODIGOS[partida.baralho._tipo_da_carta(carta)]
+        self._registro(OP_JOGADA,
+                       self._indice(partida, jogador) << 4 | indice << 2 | codigo)
+
+    def reembaralhamento(self, baralho):
+        """Grava a nova ordem do monte após reciclar o descarte"""
+        self._registro(OP_REEMBARALHAR)
+        empacotar_codigos(self.buffer, baralho.codigos(baralho.cartas))
+
+    def passar_turno(self, partida):
+        """Grava a troca de turno (e, periodicamente, o estado completo)"""
+        self._registro(OP_TURNO)
+        if partida.turnos % self.turnos_entre_estados == 0:
+            self.estado(partida)
+
+    def estado(self, partida):
+        """Grava o estado completo da partida (ponto de salto do reprodutor)"""
+        baralho = partida.baralho
+        self._registro(OP_ESTADO, partida.indice_turno)
+        escrever_varint(self.buffer, partida.turnos)
+        for jogador in partida.jogadores:
+            escrever_varint(self.buffer, jogador.hp)
+            escrever_varint(self.buffer, jogador.defesa_ativa)
+            empacotar_codigos(self.buffer, baralho.codigos(jogador.mao))
+        empacotar_codigos(self.buffer, baralho.codigos(baralho.cartas))
+        empacotar_codigos(self.buffer, baralho.codigos(baralho.descarte))
+
+    def fim_partida(self, partida):
+        """Grava o vencedor e o total de turnos, e descarrega no arquivo"""
+        vencedor = partida.vencedor()
+        indice = SEM_VENCEDOR if vencedor is None else self._indice(partida, vencedor)
+        self._registro(OP_FIM, indice)
+        escrever_varint(self.buffer, partida.turnos)
+        self.descarregar()
+
+    def bloco_turbo(self, semente, primeira, quantidade, placar, compras):
+        """
+        Grava o resumo de um bloco de partidas do modo turbo
+
+        Args:
+            semente: Semente da sessão turbo (ver derivar_semente)
+            primeira: Índice da primeira partida do bloco na sessão
+            quantidade: Partidas no bloco
+            placar: Vitórias do primeiro jogador, do segundo e empates no bloco
+            compras: Compras de cada tipo (ordem de regras.TIPOS) no bloco
+        """
+        self._registro(OP_TURBO)
+        for valor in (semente, primeira, quantidade, *placar, *compras):
+            escrever_varint(self.buffer, valor)
+        self.descarregar()
+
+    def descarregar(self):
+        """Escreve os registros pendentes no arquivo"""
+        if self.buffer:
+            self.arquivo.write(self.buffer)
+            self.arquivo.flush()
+            self.escritos += len(self.buffer)
+            self.buffer.clear()
+
+    def fechar(self):
+        """Descarrega e fecha o arquivo (se foi aberto pelo gravador)"""
+        self.descarregar()
+        if self.proprio:
+            self.arquivo.close()
+
+
+class PartidaGravada:
+    """Uma partida lida de um arquivo de replay"""
+
+    def __init__(self, semente, monte, descarte):
+        self.semente = semente
+        self.monte = monte  # Códigos do monte inicial (do fundo ao topo)
+        self.descarte = descarte
+        self.eventos = []  # (operação, jogador, índice, código) ou (OP_REEMBARALHAR, códigos)
+        self.estados = []  # EstadoGravado, em ordem de turno
+        self.vencedor = None  # 0, 1, SEM_VENCEDOR, ou None se o arquivo acabou antes
+        self.turnos = 0
+
+    def __str__(self):
+        resultado = {None: "incompleta", SEM_VENCEDOR: "sem vencedor"}.get(
+            self.vencedor, f"vitória do jogador {self.vencedor}")
+        return (f"PartidaGravada(semente={self.semente}, {self.turnos} turnos, "
+                f"{len(self.eventos)} eventos, {resultado})")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def ler_replay(origem):
+    """
+    Lê um arquivo de replay
+
+    Args:
+        origem: Caminho do arquivo ou bytes
+
+    Returns:
+        tuple: (lista de PartidaGravada, lista de BlocoTurbo)
+    """
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        dados = bytes(origem)
+    else:
+        with open(origem, "rb") as arquivo:
+            dados = arquivo.read()
+    if dados[:len(MAGIA)] != MAGIA:
+        raise ErroReplay("Arquivo não é um replay do Duelo de Cartas")
+    if dados[len(MAGIA)] != VERSAO:
+        raise ErroReplay(f"Versão de replay não suportada: {dados[len(MAGIA)]}")
+
+    partidas = []
+    blocos = []
+    atual = None
+    pos = len(MAGIA) + 1
+    while pos < len(dados):
+        byte = dados[pos]
+        pos += 1
+        operacao, baixo = byte >> 5, byte & 0x1F
+
+        if operacao == OP_PARTIDA:
+            semente, pos = ler_varint(dados, pos)
+            monte, pos = desempacotar_codigos(dados, pos)
+            descarte, pos = desempacotar_codigos(dados, pos)
+            atual = PartidaGravada(semente if baixo & 1 else None, monte, descarte)
+            partidas.append(atual)
+        elif operacao == OP_TURBO:
+            valores = []
+            for _ in range(9):
+                valor, pos = ler_varint(dados, pos)
+                valores.append(valor)
+            blocos.append(BlocoTurbo(*valores[:3], tuple(valores[3:6]), tuple(valores[6:])))
+        elif atual is None:
+            raise ErroReplay(f"Evento fora de uma partida na posição {pos - 1}")
+        elif operacao in (OP_COMPRA, OP_JOGADA):
+            atual.eventos.append((operacao, baixo >> 4, (baixo >> 2) & 0b11, baixo & 0b11))
+        elif operacao == OP_TURNO:
+            atual.eventos.append((OP_TURNO,))
+            atual.turnos += 1
+        elif operacao == OP_REEMBARALHAR:
+            codigos, pos = desempacotar_codigos(dados, pos)
+            atual.eventos.append((OP_REEMBARALHAR, codigos))
+        elif operacao == OP_ESTADO:
+            turnos, pos = ler_varint(dados, pos)
+            jogadores = []
+            for _ in range(2):
+                hp, pos = ler_varint(dados, pos)
+                defesa, pos = ler_varint(dados, pos)
+                mao, pos = desempacotar_codigos(dados, pos)
+                jogadores.append((hp, defesa, mao))
+            monte, pos = desempacotar_codigos(dados, pos)
+            descarte, pos = desempacotar_codigos(dados, pos)
+            atual.estados.append(EstadoGravado(
+                turnos, len(atual.eventos), baixo & 1, jogadores, monte, descarte))
+        elif operacao == OP_FIM:
+            atual.vencedor = baixo
+            atual.turnos, pos = ler_varint(dados, pos)
+            atual = None
+    return partidas, blocos
+
+
+def partida_turbo(semente, indice):
+    """
+    Recria (e grava em memória) a partida `indice` de uma sessão turbo
+
+    A partida é jogada com os mesmos fluxos que o modo turbo do jogo usa
+    (FonteAleatoria(derivar_semente(semente, indice))), sem precisar das
+    partidas anteriores.
+
+    Returns:
+        PartidaGravada
+    """
+    semente_partida = derivar_semente(semente, indice)
+    fonte = FonteAleatoria(semente_partida)
+    buffer = io.BytesIO()
+    gravador = GravadorReplay(buffer)
+    Partida(Baralho(fonte), rng=fonte, gravador=gravador, semente=semente_partida).simular()
+    gravador.descarregar()
+    partidas, _ = ler_replay(buffer.getvalue())
+    return partidas[0]
+
+
+def localizar_partida_turbo(blocos, indice):
+    """
+    Encontra a `indice`-ésima partida turbo do arquivo (contando todos os blocos)
+
+    Returns:
+        tuple: (semente da sessão, índice da partida na sessão)
+    """
+    for bloco in blocos:
+        if indice < bloco.quantidade:
+            return bloco.semente, bloco.primeira + indice
+        indice -= bloco.quantidade
+    raise ErroReplay("Índice de partida turbo além do fim do arquivo")
+
+
+class OrdemGravada:
+    """
+    Substituto do gerador aleatório do baralho durante o replay
+
+    Em vez de sortear, shuffle() coloca as cartas na ordem gravada no
+    último registro de reembaralhamento.
+    """
+
+    def __init__(self, baralho):
+        self.baralho = baralho
+        self.pendente = None
+
+    def shuffle(self, cartas):
+        if self.pendente is None or len(self.pendente) != len(cartas):
+            raise ErroReplay("Reembaralhamento diferente do gravado")
+        por_codigo = {}
+        for carta in cartas:
+            por_codigo.setdefault(CODIGOS[self.baralho._tipo_da_carta(carta)], []).append(carta)
+        try:
+            cartas[:] = [por_codigo[codigo].pop() for codigo in self.pendente]
+        except (KeyError, IndexError):
+            raise ErroReplay("Reembaralhamento com cartas diferentes das gravadas") from None
+        self.pendente = None
+
+
+class ReprodutorReplay:
+    """
+    Refaz uma PartidaGravada passo a passo, conferindo cada evento
+
+    Funciona com as classes do núcleo de regras (sem Pygame) ou com as da
+    interface (Deck e Player), passadas em `baralho` e `jogadores`.
+    """
+
+    def __init__(self, gravada, baralho=None, jogadores=None):
+        """
+        Args:
+            gravada: PartidaGravada a reproduzir
+            baralho: Baralho usado na reprodução (padrão: regras.Baralho)
+            jogadores: Par de jogadores (padrão: dois EstadoJogador)
+        """
+        self.gravada = gravada
+        self.baralho = baralho if baralho is not None else Baralho()
+        if jogadores is None:
+            jogadores = (EstadoJogador("VOCÊ"), EstadoJogador("IA"))
+        self.jogadores = tuple(jogadores)
+        self.ordem = OrdemGravada(self.baralho)
+        self.partida = None
+        self.proximo = 0
+        self.reiniciar()
+
+    def _montar(self, monte, descarte):
+        self.baralho.restaurar([TIPOS[c] for c in monte], [TIPOS[c] for c in descarte])
+        self.baralho.rng = self.ordem
+        self.ordem.pendente = None
+        for jogador in self.jogadores:
+            jogador.hp = HP_MAXIMO
+            jogador.mao = []
+            jogador.defesa_ativa = 0
+
+    def reiniciar(self):
+        """Volta ao início da partida (após a distribuição inicial)"""
+        gravada = self.gravada
+        self._montar(gravada.monte, gravada.descarte)
+        self.partida = Partida(self.baralho, self.jogadores)
+        self.proximo = 0
+
+    def restaurar_estado(self, estado):
+        """Coloca a partida em um EstadoGravado"""
+        self._montar(estado.monte, estado.descarte)
+        for jogador, (hp, defesa, mao) in zip(self.jogadores, estado.jogadores):
+            jogador.hp = hp
+            jogador.defesa_ativa = defesa
+            jogador.mao = [self.baralho._criar_carta(TIPOS[c]) for c in mao]
+        self.partida.turnos = estado.turnos
+        self.partida.indice_turno = estado.indice_turno
+        self.proximo = estado.indice_evento
+
+    @property
+    def terminou(self):
+        return self.proximo >= len(self.gravada.eventos)
+
+    def passo(self):
+        """
+        Aplica o próximo evento gravado
+
+        Returns:
+            tuple ou None: O evento aplicado (None se a partida acabou)
+        """
+        if self.terminou:
+            return None
+        evento = self.gravada.eventos[self.proximo]
+        self.proximo += 1
+        operacao = evento[0]
+        partida = self.partida
+
+        if operacao == OP_COMPRA:
+            jogador = self.jogadores[evento[1]]
+            if not partida.comprar(jogador) or \
+                    CODIGOS[self.baralho._tipo_da_carta(jogador.mao[-1])] != evento[3]:
+                raise ErroReplay(f"Compra divergente no evento {self.proximo - 1}")
+        elif operacao == OP_JOGADA:
+            jogador = self.jogadores[evento[1]]
+            carta = partida.jogar(evento[2], jogador)
+            if carta is None or CODIGOS[self.baralho._tipo_da_carta(carta)] != evento[3]:
+                raise ErroReplay(f"Jogada divergente no evento {self.proximo - 1}")
+            partida.resolver(carta, jogador, self.jogadores[1 - evento[1]])
+        elif operacao == OP_REEMBARALHAR:
+            self.ordem.pendente = evento[1]
+        elif operacao == OP_TURNO:
+            partida.passar_turno()
+        return evento
+
+    def ir_para_turno(self, turno):
+        """
+        Salta para o início do turno `turno` (ou para o fim, se a partida acabou antes)
+
+        Usa o último estado gravado antes do turno e só refaz os eventos
+        a partir dele.
+        """
+        estado = None
+        for candidato in self.gravada.estados:
+            if candidato.turnos > turno:
+                break
+            estado = candidato
+
+        if self.partida.turnos > turno:
+            self.reiniciar()
+        if estado is not None and estado.turnos > self.partida.turnos:
+            self.restaurar_estado(estado)
+        while self.partida.turnos < turno and self.passo() is not None:
+            pass
+
+    def executar(self):
+        """
+        Refaz a partida até o fim e confere o vencedor gravado
+
+        Returns:
+            int: Vencedor (0, 1 ou SEM_VENCEDOR)
+        """
+        while self.passo() is not None:
+            pass
+        vencedor = self.partida.vencedor()
+        indice = SEM_VENCEDOR if vencedor is None else self.jogadores.index(vencedor)
+        # Partidas interrompidas (SEM_VENCEDOR) podem ter uma jogada ainda não resolvida
+        if self.gravada.vencedor not in (None, SEM_VENCEDOR, indice):
+            raise ErroReplay(f"Vencedor divergente: gravado {self.gravada.vencedor}, obtido {indice}")
+        return indice
+
+
+def descrever_estado(reprodutor):
+    """Texto com o turno, a vida, a defesa e a mão de cada jogador"""
+    partida = reprodutor.partida
+    linhas = [f"Turno {partida.turnos} (vez de {partida.jogador_ativo.nome}), "
+              f"monte: {len(partida.baralho.cartas)}, descarte: {len(partida.baralho.descarte)}"]
+    for jogador in reprodutor.jogadores:
+        mao = ", ".join(partida.baralho._tipo_da_carta(carta) for carta in jogador.mao)
+        linhas.append(f"  {jogador.nome}: HP {jogador.hp}, DEF {jogador.defesa_ativa}, mão [{mao}]")
+    return "\n".join(linhas)
+
+
+def reproduzir_visual(gravada, turno_inicial=0, eventos_por_segundo=4):
+    """
+    Mostra a partida gravada na janela do jogo
+
+    Espaço pausa/continua, seta para a direita avança um evento e ESC sai.
+    """
+    import pygame
+    import main
+
+    jogo = main.JogoDuelo(arquivo_replay=None, arquivo_historico=None)
+    reprodutor = ReprodutorReplay(gravada, jogo.deck, (jogo.jogador, jogo.ia))
+    reprodutor.ir_para_turno(turno_inicial)
+    jogo.partida = reprodutor.partida
+    jogo.turno_jogador = False  # Cliques não alteram o replay
+
+    pausado = False
+    intervalo = 1000 / eventos_por_segundo
+    proximo_evento = pygame.time.get_ticks() + intervalo
+    while True:
+        avancar = False
+        for evento in pygame.event.get():
+            if evento.type == pygame.QUIT or \
+                    (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE):
+                pygame.quit()
+                return
+            if evento.type == pygame.KEYDOWN and evento.key == pygame.K_SPACE:
+                pausado = not pausado
+            elif evento.type == pygame.KEYDOWN and evento.key == pygame.K_RIGHT:
+                avancar = True
+        if not pausado and pygame.time.get_ticks() >= proximo_evento:
+            avancar = True
+            proximo_evento = pygame.time.get_ticks() + intervalo
+        if avancar:
+            reprodutor.passo()
+
+        jogo.ia.posicionar_mao(*main.POSICAO_MAO_IA)
+        jogo.jogador.posicionar_mao(*main.POSICAO_MAO_JOGADOR)
+        estado = "fim" if reprodutor.terminou else ("pausado" if pausado else "tocando")
+        jogo.mensagem = (f"REPLAY turno {reprodutor.partida.turnos} ({estado}) | "
+                         "Espaço: pausa, →: passo, ESC: sair")
+        jogo.cor_mensagem = (255, 200, 50)
+        jogo.verificar_sprites()
+        jogo.renderizar()
+        jogo.relogio.tick(main.FPS)
+
+
+def main():
+    """Lê as opções de linha de comando e resume, confere ou reproduz um replay"""
+    parser = argparse.ArgumentParser(description="Reprodutor de replays do Duelo de Cartas.")
+    parser.add_argument("arquivo", nargs="?", default=caminho_padrao(),
+                        help="arquivo de replay (padrão: %(default)s)")
+    parser.add_argument("--verificar", action="store_true",
+                        help="refaz todas as partidas sem janela, conferindo cada evento")
+    parser.add_argument("--partida", type=int, default=None,
+                        help="índice da partida gravada a reproduzir")
+    parser.add_argument("--turbo", type=int, default=None,
+                        help="índice da partida do modo turbo a recriar e reproduzir")
+    parser.add_argument("--turno", type=int, default=None,
+                        help="salta para este turno (usando os estados gravados)")
+    parser.add_argument("--visual", action="store_true",
+                        help="mostra a partida na janela do jogo")
+    args = parser.parse_args()
+
+    partidas, blocos = ler_replay(args.arquivo)
+    print(f"{len(partidas)} partidas gravadas, "
+          f"{sum(b.quantidade for b in blocos)} partidas turbo em {len(blocos)} blocos "
+          f"({os.path.getsize(args.arquivo)} bytes)")
+
+    if args.verificar:
+        inicio = time.perf_counter()
+        for i, gravada in enumerate(partidas):
+            try:
+                ReprodutorReplay(gravada).executar()
+            except ErroReplay as e:
+                print(f"Partida {i}: {e}")
+                raise SystemExit(1)
+        duracao = time.perf_counter() - inicio
+        print(f"Todas as partidas conferem ({len(partidas) / max(duracao, 1e-9):.0f} partidas/s)")
+
+    if args.partida is None and args.turbo is None:
+        if not args.verificar:
+            for i, gravada in enumerate(partidas[-20:], start=max(0, len(partidas) - 20)):
+                print(f"  [{i}] {gravada}")
+        return
+
+    if args.turbo is not None:
+        gravada = partida_turbo(*localizar_partida_turbo(blocos, args.turbo))
+    else:
+        gravada = partidas[args.partida]
+    print(gravada)
+
+    if args.visual:
+        reproduzir_visual(gravada, args.turno or 0)
+        return
+    reprodutor = ReprodutorReplay(gravada)
+    if args.turno is not None:
+        reprodutor.ir_para_turno(args.turno)
+    else:
+        reprodutor.executar()
+    print(descrever_estado(reprodutor))
+
+
+if __name__ == "__main__":
+    main()
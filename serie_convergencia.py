@@ -0,0 +1,187 @@
+"""
+Série da frequência acumulada de cada tipo de carta ao longo das compras.
+
+Com milhões de compras, a série não guarda um ponto por compra. As compras
+são agrupadas em faixas de largura geométrica: uma compra por faixa até
+COMPRAS_FAIXA_UNITARIA, e depois cada faixa RAZAO_FAIXAS vezes mais longa
+que a anterior. Cada faixa guarda o mínimo, o máximo e o último valor da
+frequência de cada tipo (dizimação mín./máx.), então picos dentro da faixa
+não somem do gráfico. No eixo x logarítmico, todas as faixas têm quase a
+mesma largura na tela, e 10^9 compras cabem em cerca de mil faixas.
+
+Na hora de desenhar, colunas_tela() junta as faixas por coluna de pixel.
+O custo de cada redesenho depende só da largura do gráfico, não do número
+de compras.
+"""
+
+import math
+from regras import TIPOS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy não instalado: acumula compra a compra
+    np = None
+
+# Compras com uma faixa cada (o começo da série, onde a frequência mais varia)
+COMPRAS_FAIXA_UNITARIA = 64
+
+# Razão entre as larguras de faixas consecutivas depois do começo
+RAZAO_FAIXAS = 1.02
+_LOG_RAZAO = math.log(RAZAO_FAIXAS)
+
+# Compras processadas por vez no caminho NumPy (limita a memória temporária)
+TAMANHO_LOTE = 1_000_000
+
+
+def faixa_da_compra(n):
+    """Índice da faixa que contém a n-ésima compra (n >= 1)"""
+    if n <= COMPRAS_FAIXA_UNITARIA:
+        return n - 1
+    return COMPRAS_FAIXA_UNITARIA + int(math.log(n / COMPRAS_FAIXA_UNITARIA) / _LOG_RAZAO)
+
+
+class SerieConvergencia:
+    """Frequência acumulada (0 a 1) de cada tipo em função do número de compras"""
+
+    def __init__(self):
+        self.limpar()
+
+    def limpar(self):
+        """Apaga a série"""
+        self.n = 0
+        self.contagens = [0] * len(TIPOS)
+        self.faixas = []  # Índice de cada faixa guardada
+        self.fins = []  # Número de compras no fim de cada faixa
+        self.minimos = [[] for _ in TIPOS]
+        self.maximos = [[] for _ in TIPOS]
+        self.ultimos = [[] for _ in TIPOS]
+        self.versao = 0  # Muda a cada alteração (chave de cache do gráfico)
+
+    def __len__(self):
+        return self.n
+
+    def saltar(self, contagens):
+        """
+        Avança a série para as contagens dadas sem registrar as compras do meio
+
+        Usado quando as compras individuais não existem mais (por exemplo,
+        agregadas pelo Baralho); o gráfico fica com um intervalo sem pontos.
+
+        Args:
+            contagens: Compras de cada tipo (ordem de regras.TIPOS) desde o início
+        """
+        self.contagens = list(contagens)
+        self.n = sum(contagens)
+        self.versao += 1
+
+    def _acrescentar(self, faixa, fim, minimos, maximos, ultimos):
+        """Acrescenta uma faixa, ou a junta com a última se for a mesma faixa"""
+        if self.faixas and self.faixas[-1] == faixa:
+            self.fins[-1] = fim
+            for t in range(len(TIPOS)):
+                self.minimos[t][-1] = min(self.minimos[t][-1], minimos[t])
+                self.maximos[t][-1] = max(self.maximos[t][-1], maximos[t])
+                self.ultimos[t][-1] = ultimos[t]
+            return
+        self.faixas.append(faixa)
+        self.fins.append(fim)
+        for t in range(len(TIPOS)):
+            self.minimos[t].append(minimos[t])
+            self.maximos[t].append(maximos[t])
+            self.ultimos[t].append(ultimos[t])
+
+    def adicionar_codigos(self, codigos):
+        """
+        Acrescenta compras à série
+
+        Args:
+            codigos: Códigos de tipo (regras.CODIGOS) das novas compras, em
+                     ordem; lista, array("b"), bytes ou memoryview
+        """
+        if len(codigos) == 0:
+            return
+        if np is None:
+            self._adicionar_python(codigos)
+        else:
+            for inicio in range(0, len(codigos), TAMANHO_LOTE):
+                self._adicionar_numpy(codigos[inicio:inicio + TAMANHO_LOTE])
+        self.versao += 1
+
+    def _adicionar_python(self, codigos):
+        contagens = self.contagens
+        n = self.n
+        for codigo in codigos:
+            n += 1
+            contagens[codigo] += 1
+            frequencias = [contagem / n for contagem in contagens]
+            self._acrescentar(faixa_da_compra(n), n, frequencias, frequencias, frequencias)
+        self.n = n
+
+    def _adicionar_numpy(self, codigos):
+        try:
+            codigos = np.frombuffer(codigos, dtype=np.uint8)
+        except TypeError:  # Lista do Python
+            codigos = np.asarray(codigos, dtype=np.uint8)
+        quantidade = len(codigos)
+        ns = np.arange(self.n + 1, self.n + quantidade + 1, dtype=np.float64)
+
+        # Mesma conta de faixa_da_compra, vetorizada
+        faixas = np.where(
+            ns <= COMPRAS_FAIXA_UNITARIA, ns - 1,
+            COMPRAS_FAIXA_UNITARIA + np.floor(
+                np.log(np.maximum(ns, COMPRAS_FAIXA_UNITARIA) / COMPRAS_FAIXA_UNITARIA)
+                / _LOG_RAZAO)).astype(np.int64)
+        inicios = np.flatnonzero(np.r_[True, faixas[1:] != faixas[:-1]])
+        finais = np.r_[inicios[1:] - 1, quantidade - 1]
+
+        minimos, maximos, ultimos = [], [], []
+        for t in range(len(TIPOS)):
+            acumulado = np.cumsum(codigos == t) + self.contagens[t]
+            frequencia = acumulado / ns
+            minimos.append(np.minimum.reduceat(frequencia, inicios).tolist())
+            maximos.append(np.maximum.reduceat(frequencia, inicios).tolist())
+            ultimos.append(frequencia[finais].tolist())
+            self.contagens[t] = int(acumulado[-1])
+
+        fins = (ns[finais]).astype(np.int64).tolist()
+        for i, faixa in enumerate(faixas[inicios].tolist()):
+            self._acrescentar(faixa, fins[i], [m[i] for m in minimos],
+                              [m[i] for m in maximos], [u[i] for u in ultimos])
+        self.n += quantidade
+
+    def colunas_tela(self, largura, n_maximo):
+        """
+        Junta as faixas por coluna de pixel, com o eixo x logarítmico de 1 a n_maximo
+
+        Args:
+            largura: Colunas do gráfico
+            n_maximo: Número de compras na borda direita
+
+        Returns:
+            list: Tuplas (coluna, mínimos, máximos, últimos), cada uma com um
+                  valor por tipo, da esquerda para a direita
+        """
+        if not self.fins or largura < 2:
+            return []
+        escala = (largura - 1) / math.log(max(n_maximo, 2))
+        colunas = []
+        for i, fim in enumerate(self.fins):
+            coluna = min(largura - 1, int(math.log(fim) * escala))
+            minimos = [m[i] for m in self.minimos]
+            maximos = [m[i] for m in self.maximos]
+            ultimos = [u[i] for u in self.ultimos]
+            if colunas and colunas[-1][0] == coluna:
+                _, minimos_coluna, maximos_coluna, _ = colunas[-1]
+                colunas[-1] = (coluna,
+                               [min(a, b) for a, b in zip(minimos_coluna, minimos)],
+                               [max(a, b) for a, b in zip(maximos_coluna, maximos)],
+                               ultimos)
+            else:
+                colunas.append((coluna, minimos, maximos, ultimos))
+        return colunas
+
+    def __str__(self):
+        return f"SerieConvergencia({self.n} compras, {len(self.fins)} faixas)"
+
+    def __repr__(self):
+        return self.__str__()
@@ -1,69 +1,173 @@
-import statistics
-import pygame
-from baralho import Deck
-from carta import Card
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from aleatorio import FonteAleatoria
+from estatisticas import AnaliseVies, EstatisticaOnline
+from regras import ATAQUE, DEFESA, CURA, TIPOS, CODIGOS, CARTAS_INICIAIS, Baralho
 
+try:
+    import numpy as np
+    import motor_monte_carlo
+except ImportError:  # NumPy não instalado: usa apenas o motor em Python puro
+    np = None
+    motor_monte_carlo = None
 
-def run_simulation():
-    """
-    Executa uma simulação de Monte Carlo para validar as probabilidades do baralho.
+NUM_SIMULACOES = 10000
 
-    Realiza múltiplas simulações de compra de cartas para verificar se a distribuição
-    empírica converge para as probabilidades teóricas esperadas.
+# Nível de significância global dos testes de viés (corrigido por Bonferroni)
+ALFA = 0.01
+
+# Simulações por bloco. Cada bloco tem sua própria semente derivada da semente
+# mestre, então o resultado não depende de quantos workers dividem os blocos.
+TAMANHO_BLOCO = 250_000
+
+
+def simular_python(num_simulacoes, rng):
     """
-    pygame.init()
-    NUM_SIMULACOES = 10000
+    Simula embaralhamentos um a um com regras.Baralho (sem NumPy)
 
-    print(f"Iniciando {NUM_SIMULACOES} simulações de Monte Carlo...")
-    print("Objetivo: Validar integridade do baralho e probabilidades.")
+    Como usa o mesmo embaralhar() do jogo, este motor testa diretamente o
+    embaralhamento de Deck.
 
-    # Armazena a porcentagem de cada tipo em cada simulação
-    historico_porcentagens = {
-        Card.ATAQUE: [],
-        Card.DEFESA: [],
-        Card.CURA: []
-    }
+    Returns:
+        tuple: (estimadores, analise) com um EstatisticaOnline das porcentagens
+               por tipo (ordem de regras.TIPOS) e o AnaliseVies das posições
+    """
+    estimadores = [EstatisticaOnline() for _ in TIPOS]
+    analise = nova_analise_vies()
 
-    for i in range(NUM_SIMULACOES):
-        deck = Deck()
+    for i in range(num_simulacoes):
+        deck = Baralho(rng)
         cartas_compradas = []
 
-        # Esvazia o baralho
+        # Esvazia o baralho (cartas do núcleo de regras são o próprio tipo)
         while not deck.esta_vazio():
             carta = deck.comprar_carta()
             if carta:
-                cartas_compradas.append(carta.tipo)
+                cartas_compradas.append(carta)
 
         total_cartas = len(cartas_compradas)
         if total_cartas == 0:
             continue
 
-        contagem = {
-            Card.ATAQUE: cartas_compradas.count(Card.ATAQUE),
-            Card.DEFESA: cartas_compradas.count(Card.DEFESA),
-            Card.CURA: cartas_compradas.count(Card.CURA)
-        }
+        for estimador, tipo in zip(estimadores, TIPOS):
+            pct = (cartas_compradas.count(tipo) / total_cartas) * 100
+            estimador.adicionar(pct)
+        analise.adicionar_sequencia([CODIGOS[tipo] for tipo in cartas_compradas])
+
+    return estimadores, analise
+
+
+def nova_analise_vies():
+    """Cria um AnaliseVies vazio para o baralho padrão"""
+    return AnaliseVies([CARTAS_INICIAIS[tipo] for tipo in TIPOS])
+
+
+def simular_bloco(tarefa):
+    """
+    Simula um bloco com o gerador derivado de (semente, índice do bloco)
+
+    Args:
+        tarefa: Tupla (vetorizado, semente, indice_bloco, num_simulacoes)
 
-        for tipo in historico_porcentagens:
-            pct = (contagem[tipo] / total_cartas) * 100
-            historico_porcentagens[tipo].append(pct)
+    Returns:
+        tuple: (estimadores, analise) parciais do bloco
+    """
+    vetorizado, semente, indice_bloco, num_simulacoes = tarefa
+    if vetorizado:
+        sequencia = np.random.SeedSequence(semente, spawn_key=(indice_bloco,))
+        rng = np.random.default_rng(sequencia)
+        return motor_monte_carlo.analisar_embaralhamentos(num_simulacoes, rng)
+    fonte = FonteAleatoria(semente).derivar(indice_bloco)
+    return simular_python(num_simulacoes, fonte)
+
+
+def combinar_parciais(parciais):
+    """
+    Combina os resultados parciais dos blocos, sempre na ordem dos blocos
+
+    Returns:
+        tuple: ({tipo: EstatisticaOnline}, AnaliseVies) com todas as simulações
+    """
+    resultados = {tipo: EstatisticaOnline() for tipo in TIPOS}
+    analise = nova_analise_vies()
+    for estimadores_bloco, analise_bloco in parciais:
+        for tipo, estimador in zip(TIPOS, estimadores_bloco):
+            resultados[tipo].combinar(estimador)
+        analise.combinar(analise_bloco)
+    return resultados, analise
+
+
+def imprimir_analise_vies(analise, alfa=ALFA):
+    """
+    Imprime a matriz posição x tipo e os testes qui-quadrado de viés
 
+    Returns:
+        bool: True se algum teste rejeitou a hipótese de embaralhamento uniforme
+    """
+    testes_posicao = analise.testes_posicao()
+    teste_adjacencia = analise.teste_adjacencia()
+    testes_primeiras = analise.testes_primeiras()
+
+    num_testes = len(testes_posicao) + 1 + sum(len(t) for t in testes_primeiras.values())
+    limite = alfa / num_testes  # Correção de Bonferroni
+    vies = False
+
+    print("\nFrequência por posição de compra (esperado: "
+          + " / ".join(f"{q / analise.num_cartas * 100:.0f}%" for q in analise.quantidades) + ")")
+    print("-" * 65)
+    print(f"{'POS.':<5} | " + " | ".join(f"{tipo:<8}" for tipo in TIPOS)
+          + f" | {'QUI²':<8} | {'P-VALOR':<8}")
+    print("-" * 65)
+    for posicao, (linha, (estatistica, _, p_valor)) in enumerate(zip(analise.posicao, testes_posicao)):
+        marca = ""
+        if p_valor < limite:
+            marca = " <-- VIÉS"
+            vies = True
+        pcts = " | ".join(f"{contagem / analise.n * 100:>7.3f}%" if analise.n else f"{0:>7.3f}%"
+                          for contagem in linha)
+        print(f"{posicao + 1:<5} | {pcts} | {estatistica:>8.2f} | {p_valor:>8.4f}{marca}")
+    print("-" * 65)
+
+    estatistica, graus, p_valor = teste_adjacencia
+    vies = vies or p_valor < limite
+    print(f"Pares vizinhos: qui² = {estatistica:.2f} (gl={graus}), p = {p_valor:.4f}")
+
+    for k, testes in testes_primeiras.items():
+        for tipo, (estatistica, graus, p_valor) in zip(TIPOS, testes):
+            vies = vies or p_valor < limite
+            print(f"{tipo:<7} nas {k} primeiras: qui² = {estatistica:.2f} (gl={graus}), p = {p_valor:.4f}")
+
+    print(f"(Nível global {alfa}, {num_testes} testes: rejeita se p < {limite:.2e})")
+    print("-" * 65)
+    return vies
+
+
+def imprimir_relatorio(resultados, analise=None, vetorizado=False):
+    """
+    Imprime a tabela comparando as porcentagens teóricas e observadas
+
+    Args:
+        resultados: {tipo: EstatisticaOnline}
+        analise: AnaliseVies das posições (opcional)
+        vetorizado: True se os resultados vieram do motor NumPy; o veredito
+                    vale só para o embaralhamento que de fato foi testado
+    """
     print("-" * 65)
     print(f"{'TIPO':<10} | {'TEÓRICA':<10} | {'MÉDIA OBS.':<12} | {'DESVIO PAD.':<12} | {'ERRO':<10}")
     print("-" * 65)
 
     prob_teorica = {
-        Card.ATAQUE: 50.0,
-        Card.DEFESA: 30.0,
-        Card.CURA: 20.0
+        ATAQUE: 50.0,
+        DEFESA: 30.0,
+        CURA: 20.0
     }
 
     erro_maximo_detectado = 0.0
 
-    for tipo in [Card.ATAQUE, Card.DEFESA, Card.CURA]:
-        dados = historico_porcentagens[tipo]
-        media = statistics.mean(dados)
-        desvio = statistics.stdev(dados) if len(dados) > 1 else 0.0
+    for tipo in [ATAQUE, DEFESA, CURA]:
+        estimador = resultados[tipo]
+        media, desvio = estimador.media, estimador.desvio
         teorica = prob_teorica[tipo]
         erro = abs(media - teorica)
 
@@ -75,13 +179,110 @@ def run_simulation():
 
     print("-" * 65)
 
+    # Dispersão observada (esboço de quantis do histograma)
+    print(f"{'TIPO':<10} | {'MÍN.':<8} | {'P5':<8} | {'MEDIANA':<8} | {'P95':<8} | {'MÁX.':<8}")
+    for tipo in [ATAQUE, DEFESA, CURA]:
+        estimador = resultados[tipo]
+        if estimador.n == 0:
+            continue
+        print(f"{tipo:<10} | {estimador.minimo:>7.2f}% | {estimador.quantil(0.05):>7.2f}% | "
+              f"{estimador.quantil(0.5):>7.2f}% | {estimador.quantil(0.95):>7.2f}% | "
+              f"{estimador.maximo:>7.2f}%")
+    print("-" * 65)
+
+    # O baralho inteiro sempre tem 50/30/20%; o viés aparece na ordem das compras
+    vies_ordem = False
+    if analise is not None and analise.n > 0:
+        vies_ordem = imprimir_analise_vies(analise)
+
+    if vetorizado:
+        testado = ("o motor NumPy (Generator.permuted em "
+                   "motor_monte_carlo.gerar_embaralhamentos)")
+        dica = "O embaralhamento do jogo não foi usado; para testá-lo, rode com --motor python."
+    else:
+        testado = "o embaralhamento do jogo (regras.Baralho.embaralhar, usado por Deck)"
+        dica = None
+
     if erro_maximo_detectado > 1.0:
         print("\n[ALERTA] ⚠️  Viés detectado! O erro é maior que 1%.")
-        print("Verifique a lógica de criação do baralho ou o random.shuffle.")
+        print(f"Verifique a lógica de criação do baralho ou {testado}.")
+    elif vies_ordem:
+        print("\n[ALERTA] ⚠️  Viés detectado na ordem das cartas!")
+        print("Algum tipo aparece com frequência anormal em certas posições.")
+        print(f"Verifique {testado}.")
     else:
         print("\n[SUCESSO] ✅ A simulação confirmou as probabilidades teóricas.")
-        print("O desvio é mínimo ou inexistente, indicando consistência no baralho.")
+        print(f"O desvio é mínimo ou inexistente para {testado}.")
+    if dica:
+        print(dica)
+
+
+def run_simulation(num_simulacoes=NUM_SIMULACOES, vetorizado=None, workers=1, semente=None,
+                   aleatorio=None):
+    """
+    Executa uma simulação de Monte Carlo para validar as probabilidades do baralho.
+
+    Realiza múltiplas simulações de compra de cartas para verificar se a distribuição
+    empírica converge para as probabilidades teóricas esperadas.
+
+    Args:
+        num_simulacoes: Quantidade de embaralhamentos simulados
+        vetorizado: True para o motor NumPy, False para Python puro
+                    (padrão: NumPy se estiver instalado)
+        workers: Número de processos que dividem os blocos de simulação
+        semente: Semente mestre (padrão: aleatória, exibida no início)
+        aleatorio: FonteAleatoria cuja semente é usada como semente mestre
+                   (alternativa a `semente`)
+
+    Returns:
+        tuple: ({tipo: EstatisticaOnline}, AnaliseVies) com todas as simulações
+    """
+    if vetorizado is None:
+        vetorizado = motor_monte_carlo is not None
+    if semente is None:
+        semente = aleatorio.semente if aleatorio is not None else FonteAleatoria().semente
+
+    print(f"Iniciando {num_simulacoes} simulações de Monte Carlo...")
+    print("Objetivo: Validar integridade do baralho e probabilidades.")
+    print(f"Semente: {semente} | Workers: {workers} | "
+          f"Motor: {'numpy' if vetorizado else 'python (Baralho.embaralhar do jogo)'}")
+
+    tarefas = []
+    for indice_bloco, inicio in enumerate(range(0, num_simulacoes, TAMANHO_BLOCO)):
+        tamanho = min(TAMANHO_BLOCO, num_simulacoes - inicio)
+        tarefas.append((vetorizado, semente, indice_bloco, tamanho))
+
+    if workers > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parciais = list(executor.map(simular_bloco, tarefas))
+    else:
+        parciais = [simular_bloco(tarefa) for tarefa in tarefas]
+
+    resultados, analise = combinar_parciais(parciais)
+    imprimir_relatorio(resultados, analise, vetorizado)
+    return resultados, analise
+
+
+def main():
+    """Lê as opções de linha de comando e executa a simulação"""
+    parser = argparse.ArgumentParser(
+        description="Validação de Monte Carlo das probabilidades do baralho.")
+    parser.add_argument("-n", "--simulacoes", type=int, default=NUM_SIMULACOES,
+                        help=f"número de embaralhamentos (padrão: {NUM_SIMULACOES})")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="número de processos (padrão: núcleos disponíveis)")
+    parser.add_argument("-s", "--semente", type=int, default=None,
+                        help="semente mestre para resultados reprodutíveis")
+    parser.add_argument("--motor", choices=["numpy", "python"], default=None,
+                        help="motor de simulação (padrão: numpy se instalado)")
+    args = parser.parse_args()
+
+    vetorizado = None if args.motor is None else args.motor == "numpy"
+    if vetorizado and motor_monte_carlo is None:
+        parser.error("o motor numpy requer o pacote numpy instalado")
+
+    run_simulation(args.simulacoes, vetorizado, max(1, args.workers), args.semente)
 
 
 if __name__ == "__main__":
-    run_simulation()
+    main()
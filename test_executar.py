@@ -0,0 +1,42 @@
+"""
+Teste do loop principal (JogoDuelo.executar) com o driver de vídeo "dummy".
+
+    python -m unittest test_executar
+"""
+
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from main import JogoDuelo
+
+# Tempo máximo do turno da IA: 500 + 1000 ms de espera, a animação da carta
+# e mais 1500 ms até devolver o turno, com folga
+DURACAO_TURNO_IA_MS = 6000
+
+
+class TestLoopPrincipal(unittest.TestCase):
+
+    def test_turno_da_ia_volta_para_o_jogador(self):
+        """O turno da IA termina mesmo com o loop bloqueado em aguardar_eventos"""
+        jogo = JogoDuelo(arquivo_replay=None, arquivo_historico=None)
+        jogo.carregador_sprites.aguardar()
+        jogo.finalizar_turno_jogador()
+        self.assertFalse(jogo.turno_jogador)
+
+        # Nenhum outro evento chega: só o prazo da IA acorda o loop ocioso
+        pygame.event.clear()
+        pygame.time.set_timer(pygame.QUIT, DURACAO_TURNO_IA_MS, loops=1)
+        with self.assertRaises(SystemExit):
+            jogo.executar()
+
+        self.assertTrue(jogo.turno_jogador)
+        self.assertFalse(jogo.aguardando_ia)
+        self.assertIsNone(jogo.estado_ia)
+
+
+if __name__ == "__main__":
+    unittest.main()
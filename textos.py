@@ -0,0 +1,96 @@
+"""
+Registro central de fontes e cache LRU de textos renderizados.
+
+Renderizar texto é uma das operações mais caras do Pygame, e a maior parte
+dos textos do jogo (rótulos, HP, mensagens) não muda de um frame para o
+outro. Todos os caminhos de desenho pedem fontes e superfícies de texto
+daqui, para que cada combinação seja criada uma única vez.
+"""
+
+from collections import OrderedDict
+import pygame
+
+# Quantidade máxima de superfícies de texto mantidas no cache
+CAPACIDADE_PADRAO = 512
+
+
+class CacheTextos:
+    """Fontes compartilhadas e cache LRU de superfícies de texto"""
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO):
+        """
+        Args:
+            capacidade: Máximo de superfícies de texto guardadas
+        """
+        self.capacidade = capacidade
+        self.fontes = {}
+        self.superficies = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def fonte(self, tamanho, nome=None):
+        """
+        Retorna a fonte (nome, tamanho), criando-a apenas na primeira vez
+
+        Args:
+            tamanho: Tamanho da fonte em pontos
+            nome: Arquivo da fonte (None = fonte padrão do Pygame)
+        """
+        chave = (nome, tamanho)
+        fonte = self.fontes.get(chave)
+        if fonte is None:
+            fonte = pygame.font.Font(nome, tamanho)
+            self.fontes[chave] = fonte
+        return fonte
+
+    def renderizar(self, fonte, texto, cor, antialias=True):
+        """
+        Equivalente a fonte.render(texto, antialias, cor), com cache
+
+        A superfície retornada é compartilhada: quem alterar o alpha dela
+        (set_alpha) deve restaurá-lo depois de desenhar.
+        """
+        chave = (fonte, texto, tuple(cor), antialias)
+        superficie = self.superficies.get(chave)
+        if superficie is not None:
+            self.acertos += 1
+            self.superficies.move_to_end(chave)
+            return superficie
+
+        self.falhas += 1
+        superficie = fonte.render(texto, antialias, cor)
+        self.superficies[chave] = superficie
+        if len(self.superficies) > self.capacidade:
+            self.superficies.popitem(last=False)
+        return superficie
+
+    def limpar(self):
+        """Esvazia o cache de textos (as fontes são mantidas)"""
+        self.superficies.clear()
+
+    def taxa_acerto(self):
+        """Fração das renderizações atendidas pelo cache (0 a 1)"""
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def __str__(self):
+        return (f"CacheTextos({len(self.superficies)}/{self.capacidade} textos, "
+                f"{self.acertos} acertos, {self.falhas} falhas, "
+                f"taxa {self.taxa_acerto() * 100:.1f}%)")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+# Instância compartilhada por todo o jogo
+cache_textos = CacheTextos()
+
+
+def fonte(tamanho, nome=None):
+    """Atalho para cache_textos.fonte"""
+    return cache_textos.fonte(tamanho, nome)
+
+
+def renderizar(fonte, texto, cor, antialias=True):
+    """Atalho para cache_textos.renderizar"""
+    return cache_textos.renderizar(fonte, texto, cor, antialias)